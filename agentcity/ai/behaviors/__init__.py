@@ -1,21 +1,41 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
+if TYPE_CHECKING:
+    from ...entities.objects import WorldObject
 
-@dataclass
+
+@dataclass(slots=True)
 class BehaviorState:
-    """State of a behavior, including whether it's active and for how long"""
+    """Per-agent state of its active behavior, reset in place between behaviors"""
 
     active: bool = False
     ticks_active: int = 0
     target_position: tuple[float, float] | None = None
+    using_object: "WorldObject | None" = None  # Claimed by need behaviors
+
+    def reset(self) -> None:
+        self.active = False
+        self.ticks_active = 0
+        self.target_position = None
+        self.using_object = None
+
+    def export(self) -> dict[str, Any]:
+        """Plain fields for snapshots and shard hand-offs (objects are saved by id)"""
+        return {
+            "active": self.active,
+            "ticks_active": self.ticks_active,
+            "target_position": self.target_position,
+        }
 
 
 class Behavior(ABC):
-    """Base class for all behaviors"""
+    """Base class for all behaviors
 
-    def __init__(self):
-        self.state = BehaviorState()
+    Behaviors are stateless definitions shared by every agent in a city;
+    whatever changes while one runs lives in the agent's `behavior_state`.
+    """
 
     @abstractmethod
     def should_activate(self, agent) -> bool:
@@ -24,12 +44,32 @@ class Behavior(ABC):
 
     @abstractmethod
     def update(self, agent) -> None:
-        """Update the behavior's state and affect the agent"""
+        """Update the agent's behavior state and affect the agent"""
         pass
 
-    def deactivate(self) -> None:
-        """Reset the behavior's state"""
-        self.state = BehaviorState()
+    def quiet_ticks(self, agent) -> int:
+        """Number of upcoming updates known to do nothing but count ticks
+
+        The agent may be parked for that many ticks instead of being polled.
+        Predictions must never overshoot, so they should err on the early side.
+        """
+        return 0
+
+    def ticks_until_activation(self, agent) -> int | None:
+        """Number of upcoming ticks `should_activate` is known to be false for
+
+        None if it stays false for as long as the agent is idle. Like
+        `quiet_ticks`, predictions should err on the early side.
+        """
+        return 0
+
+    def skip_ticks(self, agent, ticks: int) -> None:
+        """Account for updates skipped while the agent was parked"""
+        agent.behavior_state.ticks_active += ticks
+
+    def deactivate(self, agent) -> None:
+        """Reset the agent's behavior state"""
+        agent.behavior_state.reset()
 
     @abstractmethod
     def get_priority(self, agent) -> float:
@@ -1,5 +1,10 @@
+import math
+
+from ..needs import TOLERANCE, ticks_until
 from . import Behavior
 
+SATISFIED = 95.0  # Need level at which an agent stops using an object
+
 
 class NeedBehavior(Behavior):
     """Base class for need-driven behaviors"""
@@ -11,69 +16,232 @@ class NeedBehavior(Behavior):
         threshold: float = 50.0,
         critical_threshold: float = 20.0,
     ):
-        super().__init__()
         self.need_name = need_name
         self.required_capability = required_capability
         self.threshold = threshold
         self.critical_threshold = critical_threshold
-        self.using_object = None
 
     def should_activate(self, agent) -> bool:
         """Activate when need drops below threshold"""
         need = agent.needs.needs.get(self.need_name)
         if not need:
             return False
-        return need.current <= self.threshold
+        return need.current <= self.threshold + TOLERANCE
+
+    def ticks_until_activation(self, agent) -> int | None:
+        """While idle the need decays linearly until it reaches the threshold"""
+        need = agent.needs.needs.get(self.need_name)
+        if not need:
+            return None
+        ticks = ticks_until(
+            need.current, self.threshold, -need.decay_rate / agent.city.ticks_per_hour
+        )
+        if ticks is None:
+            return None
+        # Less one tick of margin for floating point drift
+        return max(0, math.ceil(ticks) - 2)
 
     def get_priority(self, agent) -> float:
         """Calculate priority based on need level"""
         need = agent.needs.needs[self.need_name]
         priority = 100.0 - need.current
-        if need.current <= self.critical_threshold:
+        if need.current <= self.critical_threshold + TOLERANCE:
             priority += 50.0
         return priority
 
     def update(self, agent) -> None:
         """Find and use an object that provides the required capability"""
-        if not self.state.active:
+        state = agent.behavior_state
+        if not state.active:
             # Start seeking
-            self.state.active = True
-            self.state.ticks_active = 0
-
-            # Find a building with the required capability
-            for building in agent.city.buildings:
-                if self.required_capability in building.get_available_capabilities():
-                    obj = building.find_object_with_capability(
-                        self.required_capability, agent.name
-                    )
-                    if obj:
-                        self.state.target_position = obj.position
-                        agent.set_destination(building.entrance)
-                        agent.state.current_action = f"seeking_{self.need_name}"
-                        self.using_object = obj
-                        obj.start_using(agent.name)
-                        break
-
-            if not self.using_object:
-                self.deactivate()
+            state.active = True
+            state.ticks_active = 0
+
+            # Find the nearest free object that satisfies faster than the need decays
+            min_rate = agent.needs.needs[self.need_name].decay_rate
+            found = agent.city.find_free_object(
+                self.required_capability, agent.state.position, min_rate=min_rate
+            )
+            if found:
+                building, obj = found
+                state.target_position = obj.position
+                agent.set_destination(building.entrance)
+                agent.state.current_action = f"seeking_{self.need_name}"
+                state.using_object = obj
+                obj.reserve(agent.name, self.required_capability)
+            else:
+                # Everything is taken: wait in line at the nearest object
+                # rather than searching again every tick
+                found = agent.city.find_queue(
+                    self.required_capability, agent.state.position, min_rate=min_rate
+                )
+                if found:
+                    building, obj = found
+                    state.target_position = obj.position
+                    agent.set_destination(building.entrance)
+                    agent.state.current_action = f"queuing_{self.need_name}"
+                    state.using_object = obj
+                    obj.enqueue(agent.name, self.required_capability, agent.wake)
+
+            if not state.using_object:
+                self.deactivate(agent)
         else:
-            self.state.ticks_active += 1
+            state.ticks_active += 1
+
+            if agent.state.current_action == f"queuing_{self.need_name}":
+                if agent.name in state.using_object.occupants:
+                    # Granted a slot: go on as if it had been free all along
+                    agent.state.current_action = f"seeking_{self.need_name}"
+                elif (other := self._outranked(agent)) is not None:
+                    # Stop waiting once another need is as pressing, and go
+                    # straight for it: left to selection, a tie would send
+                    # the agent back into this line
+                    state.using_object.release(agent.name)
+                    self.deactivate(agent)
+                    agent.state.current_action = "idle"
+                    agent.active_behavior = other
+                    return
 
             # If we've reached the entrance, move to the object
-            if not agent.state.destination and self.using_object:
+            if not agent.state.destination and state.using_object:
                 if agent.state.current_action == f"seeking_{self.need_name}":
-                    agent.set_destination(self.using_object.position)
+                    agent.set_destination(state.using_object.position)
                     agent.state.current_action = f"using_{self.need_name}"
 
             # Check if need is satisfied
             need = agent.needs.needs[self.need_name]
-            if need.current >= 95.0:
-                if self.using_object:
-                    self.using_object.stop_using(agent.name)
-                    self.using_object = None
-                self.deactivate()
+            if need.current >= SATISFIED - TOLERANCE:
+                if state.using_object:
+                    state.using_object.release(agent.name)
+                self.deactivate(agent)
                 agent.state.current_action = "idle"
 
+    def satisfaction_rate(self, agent) -> float:
+        """Per-hour rate at which the object in use satisfies the need"""
+        using_object = agent.behavior_state.using_object
+        if using_object is None:
+            return 0.0
+        return next(
+            (
+                cap.satisfaction_rate
+                for cap in using_object.capabilities
+                if cap.name == self.required_capability
+            ),
+            0.0,
+        )
+
+    def is_using(self, agent) -> bool:
+        """Whether the agent is at the object, having the need satisfied each tick"""
+        return (
+            agent.behavior_state.using_object is not None
+            and not agent.state.destination
+            and agent.state.current_action == f"using_{self.need_name}"
+            and agent.city.get_building_at_position(agent.state.position) is not None
+        )
+
+    def is_queuing(self, agent) -> bool:
+        """Whether the agent is waiting in line for a slot at its object"""
+        using_object = agent.behavior_state.using_object
+        return (
+            using_object is not None
+            and agent.state.current_action == f"queuing_{self.need_name}"
+            and agent.name not in using_object.occupants
+        )
+
+    def _outranked(self, agent) -> "NeedBehavior | None":
+        """Another need to see to instead of waiting in line for this one
+
+        A more pressing need always takes over. One just as pressing only
+        does if it can be met right away, so that a need at zero can't wait
+        forever behind another one at zero, without the agent going back and
+        forth between two lines.
+        """
+        priority = self.get_priority(agent)
+        outranking = None
+        best = -math.inf
+        for behavior in agent.behaviors:
+            if (
+                not isinstance(behavior, NeedBehavior)
+                or behavior is self
+                or not behavior.should_activate(agent)
+            ):
+                continue
+            other = behavior.get_priority(agent)
+            if other <= best + TOLERANCE or other < priority - TOLERANCE:
+                continue
+            if other > priority + TOLERANCE or behavior.can_start(agent):
+                outranking, best = behavior, other
+        return outranking
+
+    def can_start(self, agent) -> bool:
+        """Whether an object is free to satisfy the need right away"""
+        min_rate = agent.needs.needs[self.need_name].decay_rate
+        found = agent.city.find_free_object(
+            self.required_capability, agent.state.position, min_rate=min_rate
+        )
+        return found is not None
+
+    def rejoin_queue(self, agent) -> None:
+        """Line up again at the object waited on, e.g. after moving to another city"""
+        if self.is_queuing(agent):
+            agent.behavior_state.using_object.enqueue(
+                agent.name, self.required_capability, agent.wake
+            )
+
+    def quiet_ticks(self, agent) -> int:
+        """While using an object, the need rises linearly until it is satisfied"""
+        if self.is_queuing(agent):
+            # The object wakes the agent when it is granted a slot. Otherwise
+            # check back before another need could outrank this one, or once
+            # a game day
+            ticks_per_hour = agent.city.ticks_per_hour
+            quiet = ticks_per_hour * 24
+            # This need only grows more pressing while waiting, so another
+            # one has to overtake at least its current priority
+            priority = self.get_priority(agent)
+            for behavior in agent.behaviors:
+                if not isinstance(behavior, NeedBehavior) or behavior is self:
+                    continue
+                need = agent.needs.needs.get(behavior.need_name)
+                if need is None:
+                    continue
+                # Level below which the need is active and its priority,
+                # 100 - level (+50 once critical), is above ours
+                target = min(
+                    behavior.threshold,
+                    max(
+                        100.0 - priority,
+                        min(behavior.critical_threshold, 150.0 - priority),
+                    ),
+                )
+                if need.current <= target:
+                    return 0
+                ticks = ticks_until(
+                    need.current, target, -need.decay_rate / ticks_per_hour
+                )
+                if ticks is not None:
+                    quiet = min(quiet, max(0, math.ceil(ticks) - 2))
+            return quiet
+        if not self.is_using(agent):
+            return 0
+
+        need = agent.needs.needs[self.need_name]
+        ticks_per_hour = agent.city.ticks_per_hour
+        current = need.current
+        # Decay clamped at zero would make the need rise faster than predicted
+        if current < need.decay_rate / ticks_per_hour:
+            return 0
+        satisfaction = self.satisfaction_rate(agent)
+        if agent.needs.lazy:
+            # Lazy needs already decayed this tick but aren't yet satisfied
+            current += satisfaction / ticks_per_hour
+        rise = (satisfaction - need.decay_rate) / ticks_per_hour
+        if rise <= 0:
+            return 0
+        # Updates before the one that sees the need satisfied, less one tick
+        # of margin for floating point drift
+        return math.ceil((SATISFIED - current) / rise) - 2
+
 
 class RestBehavior(NeedBehavior):
     """Behavior for satisfying energy needs"""
@@ -1,20 +1,25 @@
-from random import random
+import math
 
+from ..needs import TOLERANCE
 from . import Behavior
 
+CALM = 50.0  # Agents only wander while every need is at least this high
+# Walking agents are pushed apart by up to half a step per tick (see
+# City._keep_apart), so they may cover this many steps' distance in one
+MAX_STRIDE = 1.5
+
 
 class WanderingBehavior(Behavior):
     """A behavior where agents wander aimlessly when idle"""
 
     def __init__(self):
-        super().__init__()
         self.min_wander_ticks = 120  # 2 seconds at 60 ticks/sec
         self.chance_to_wander = 0.1  # 10% chance to start wandering when idle
         self.base_priority = 10.0  # Low priority, only when nothing else to do
 
     def get_priority(self, agent) -> float:
-        """Return base priority if should activate"""
-        return self.base_priority if self.should_activate(agent) else 0.0
+        """Return base priority; only asked once `should_activate` rolled a hit"""
+        return self.base_priority
 
     def should_activate(self, agent) -> bool:
         """
@@ -28,28 +33,53 @@ class WanderingBehavior(Behavior):
 
         # Check if any needs are urgent
         for need in agent.needs.needs.values():
-            if need.current < 50:
+            if need.current < CALM - TOLERANCE:
                 return False
 
         # Random chance to start wandering
-        return random() < self.chance_to_wander
+        return agent.rng.random() < self.chance_to_wander
+
+    def ticks_until_activation(self, agent) -> int | None:
+        """An idle agent rolls the dice every tick until a need drops below `CALM`"""
+        if agent.state.current_action != "idle":
+            return None
+        if all(need.current >= CALM - TOLERANCE for need in agent.needs.needs.values()):
+            return 0
+        # Needs only decay while idle, so none will climb back above `CALM` by
+        # itself; the city wakes agents whose needs rise in a chat
+        return None
 
     def update(self, agent) -> None:
         """Update wandering behavior"""
-        if not self.state.active:
+        state = agent.behavior_state
+        if not state.active:
             # Start wandering
-            self.state.active = True
-            self.state.ticks_active = 0
-            self.state.target_position = agent.city.get_random_position()
-            agent.set_destination(self.state.target_position)
+            state.active = True
+            state.ticks_active = 0
+            state.target_position = agent.city.get_random_position(agent.rng)
+            agent.set_destination(state.target_position)
             agent.state.current_action = "wandering"
         else:
-            self.state.ticks_active += 1
+            state.ticks_active += 1
 
             # If we've reached destination or been wandering too long, stop
             if (
                 not agent.state.destination
-                or self.state.ticks_active > self.min_wander_ticks
+                or state.ticks_active > self.min_wander_ticks
             ):
-                self.deactivate()
+                self.deactivate(agent)
                 agent.state.current_action = "idle"
+
+    def quiet_ticks(self, agent) -> int:
+        """Wandering only ends on arrival or after `min_wander_ticks`"""
+        destination = agent.state.destination
+        state = agent.behavior_state
+        if not state.active or not destination:
+            return 0
+        position = agent.state.position
+        distance = math.hypot(
+            destination[0] - position[0], destination[1] - position[1]
+        )
+        # Whole ticks of travel left, less one tick of margin for rounding
+        travel = int(distance / (agent.state.speed * MAX_STRIDE)) - 1
+        return min(travel, self.min_wander_ticks - state.ticks_active - 1)
@@ -1,7 +1,12 @@
 from dataclasses import dataclass
+from typing import Protocol
 
+# Needs integrated in closed form can end up a rounding error away from the
+# value stepping them tick by tick reaches, so thresholds allow for this much
+TOLERANCE = 1e-9
 
-@dataclass
+
+@dataclass(slots=True)
 class Need:
     current: float  # Current value (0-100)
     decay_rate: float  # How fast it decreases per hour
@@ -18,7 +23,86 @@ class Need:
         return self.current <= self.critical_threshold
 
 
+class Clock(Protocol):
+    tick: int
+
+
+class LazyNeed:
+    """A need changing at a constant rate, evaluated only when read
+
+    Stored as (value at `start_tick`, rate per tick) and integrated in closed
+    form, so it can be skipped by the per-tick need update and any number of
+    ticks costs the same. A monotone line clamped once gives the same value as
+    clamping on every tick, and the tick a threshold is crossed can be
+    predicted exactly.
+    """
+
+    __slots__ = (
+        "start_value",
+        "start_tick",
+        "rate",
+        "clock",
+        "decay_rate",
+        "critical_threshold",
+    )
+
+    def __init__(
+        self, need: Need, rate: float, clock: Clock, start_tick: int | None = None
+    ):
+        self.start_value = need.current
+        self.start_tick = clock.tick if start_tick is None else start_tick
+        self.rate = rate  # Change per tick
+        self.clock = clock
+        self.decay_rate = need.decay_rate
+        self.critical_threshold = need.critical_threshold
+
+    @property
+    def current(self) -> float:
+        value = self.start_value + self.rate * (self.clock.tick - self.start_tick)
+        return max(0.0, min(100.0, value))
+
+    @current.setter
+    def current(self, value: float):
+        self.start_value = value
+        self.start_tick = self.clock.tick
+
+    def update(self, delta_time: float):
+        """Lazy needs advance with the clock rather than being stepped"""
+
+    def set_rate(self, rate: float):
+        """Change the rate from the current tick on"""
+        self.current = self.current
+        self.rate = rate
+
+    def ticks_until(self, target: float) -> float | None:
+        """Ticks from now until the need reaches `target`, if it ever will"""
+        return ticks_until(self.current, target, self.rate)
+
+    @property
+    def is_critical(self) -> bool:
+        return self.current <= self.critical_threshold
+
+    def materialize(self) -> Need:
+        """Get a plain need holding the current value"""
+        return Need(self.current, self.decay_rate, self.critical_threshold)
+
+
+def ticks_until(value: float, target: float, rate: float) -> float | None:
+    """Ticks for a value changing by `rate` per tick to reach `target`
+
+    None if it is moving away from the target (or not moving at all).
+    """
+    gap = target - value
+    if gap == 0:
+        return 0.0
+    if rate == 0 or (gap > 0) != (rate > 0):
+        return None
+    return gap / rate
+
+
 class NeedsSystem:
+    __slots__ = ("needs", "lazy")
+
     def __init__(self):
         """Initialize needs system with per-hour decay rates
 
@@ -32,14 +116,61 @@ class NeedsSystem:
         - Restaurant: +80%/h hunger
         - Park: +30%/h social
         """
-        self.needs: dict[str, Need] = {
+        self.needs: dict[str, Need | LazyNeed] = {
             "energy": Need(current=100.0, decay_rate=5.0),
             "hunger": Need(current=100.0, decay_rate=10.0),
             "social": Need(current=100.0, decay_rate=3.0),
         }
+        self.lazy = False
+
+    def make_lazy(self, clock: Clock, ticks_per_hour: int):
+        """Evaluate needs in closed form from the clock instead of stepping them"""
+        self.integrate(
+            clock,
+            {
+                name: -need.decay_rate / ticks_per_hour
+                for name, need in self.needs.items()
+            },
+        )
+        self.lazy = True
+
+    def make_eager(self):
+        """Go back to needs stepped by `update`, keeping their current values"""
+        self.materialize()
+        self.lazy = False
+
+    def integrate(
+        self, clock: Clock, rates: dict[str, float], start_tick: int | None = None
+    ):
+        """Change each need at a constant rate per tick, evaluated in closed form
+
+        Plain needs are replaced by lazy ones starting at `start_tick`
+        (default: now); lazy needs change rate from the current tick on.
+        """
+        for name, need in self.needs.items():
+            rate = rates[name]
+            if not isinstance(need, LazyNeed):
+                self.needs[name] = LazyNeed(need, rate, clock, start_tick)
+            elif need.rate != rate:
+                need.set_rate(rate)
+
+    def materialize(self):
+        """Replace lazy needs by plain ones holding their current values"""
+        for name, need in self.needs.items():
+            if isinstance(need, LazyNeed):
+                self.needs[name] = need.materialize()
+
+    def resume_decay(self, clock: Clock, ticks_per_hour: int):
+        """Return to plain decay after `integrate`, lazily if the needs are lazy"""
+        if self.lazy:
+            self.make_lazy(clock, ticks_per_hour)
+        else:
+            self.materialize()
 
     def update(self, delta_time: float):
         """Update all needs based on time passed"""
+        if self.lazy:
+            return
         for _need_name, need in self.needs.items():
             need.update(delta_time)
 
@@ -0,0 +1,129 @@
+import math
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None  # type: ignore[assignment]
+
+from .behaviors import Behavior
+from .behaviors.needs import NeedBehavior
+from .behaviors.wandering import CALM, WanderingBehavior
+from .needs import TOLERANCE
+
+if TYPE_CHECKING:
+    from ..entities.agent import Agent
+    from ..world.agent_store import AgentStore
+
+
+class BatchBehaviorSelector:
+    """Selects behaviors for all idle agents at once from an agent store
+
+    Activation masks and priorities of every behavior are computed as array
+    operations on the store's need columns, following the same rules (and
+    the same floating point operations) as `Agent.update_behavior`. Only the
+    wandering dice roll stays per agent, since each agent draws from its own
+    random stream.
+
+    `behaviors` are the city's behaviors in priority order. Only need and
+    wandering behaviors can be batched; see `supports`.
+    """
+
+    @staticmethod
+    def supports(behaviors: Sequence[Behavior]) -> bool:
+        return all(
+            isinstance(behavior, NeedBehavior | WanderingBehavior)
+            for behavior in behaviors
+        )
+
+    def __init__(self, behaviors: Sequence[Behavior], need_columns: dict[str, int]):
+        if np is None:
+            raise ImportError(
+                "BatchBehaviorSelector requires numpy (pip install numpy)"
+            )
+
+        # (behavior index, need column, threshold, critical threshold)
+        self.need_behaviors: list[tuple[int, int, float, float]] = []
+        self.wandering: tuple[int, WanderingBehavior] | None = None
+        for index, behavior in enumerate(behaviors):
+            if isinstance(behavior, NeedBehavior):
+                self.need_behaviors.append(
+                    (
+                        index,
+                        need_columns[behavior.need_name],
+                        behavior.threshold,
+                        behavior.critical_threshold,
+                    )
+                )
+            elif isinstance(behavior, WanderingBehavior):
+                self.wandering = (index, behavior)
+            else:
+                raise TypeError(f"Can't batch select {type(behavior).__name__}")
+        self.behaviors = list(behaviors)
+        self.behavior_count = len(behaviors)
+
+    def select(self, agents: list["Agent"], store: "AgentStore", ticks_per_hour: int):
+        """Give each idle agent its highest priority behavior, or park it
+
+        Agents with nothing to do are parked until the first behavior is
+        predicted to activate, like in `Agent.update_behavior`.
+        """
+        n = len(agents)
+        if not n:
+            return
+        rows = store.rows_of(agents)
+        needs = store.needs[rows]
+        decay_rates = store.decay_rates[rows]
+
+        # -1 marks behaviors that don't activate, so priority 0 still wins
+        priorities = np.full((n, self.behavior_count), -1.0)
+        for index, col, threshold, critical_threshold in self.need_behaviors:
+            current = needs[:, col]
+            priority = 100.0 - current
+            priority = np.where(
+                current <= critical_threshold + TOLERANCE, priority + 50.0, priority
+            )
+            priorities[:, index] = np.where(
+                current <= threshold + TOLERANCE, priority, -1.0
+            )
+
+        # Idle agents with no urgent needs roll the dice to wander
+        calm = needs.min(axis=1) >= CALM - TOLERANCE
+        if self.wandering is not None:
+            index, wandering = self.wandering
+            idle = np.fromiter(
+                (agent.state.current_action == "idle" for agent in agents), bool, n
+            )
+            calm &= idle
+            chance = wandering.chance_to_wander
+            for row in np.flatnonzero(calm):
+                if agents[row].rng.random() < chance:  # type: ignore[union-attr]
+                    priorities[row, index] = wandering.base_priority
+
+        # The first of (nearly) equal priorities wins, like in the scalar loop
+        best = priorities.max(axis=1, keepdims=True)
+        selected = (priorities >= best - TOLERANCE).argmax(axis=1)
+        chosen = priorities[np.arange(n), selected] > -1.0
+        for row in np.flatnonzero(chosen):
+            agents[row].active_behavior = self.behaviors[selected[row]]
+
+        # Wandering may activate on any tick while an idle agent is calm
+        waiting = ~chosen
+        if self.wandering is not None:
+            waiting &= ~calm
+        if not waiting.any():
+            return
+        quiet = np.full(n, math.inf)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for _index, col, threshold, _critical in self.need_behaviors:
+                rate = -decay_rates[:, col] / ticks_per_hour
+                # Needs only decay towards thresholds they are still above
+                ticks = np.where(
+                    rate < 0, np.ceil((threshold - needs[:, col]) / rate), math.inf
+                )
+                # Less one tick of margin for floating point drift
+                quiet = np.minimum(quiet, np.maximum(0, ticks - 2))
+        city = agents[0].city
+        for row in np.flatnonzero(waiting & (quiet > 0) & np.isfinite(quiet)):
+            city.park_agent(agents[row], int(quiet[row]))  # type: ignore[union-attr]
@@ -0,0 +1,116 @@
+import heapq
+import itertools
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+
+@dataclass(eq=False, slots=True, init=False)
+class ScheduledEvent:
+    """A callback due at an absolute tick, doubling as its cancellation handle
+
+    As with the hourly scheduler this replaced, an event may be given an
+    `hour` of the day instead, daily unless `recurring` is False;
+    `TimeSystem.schedule_event` works out its tick.
+    """
+
+    tick: int
+    callback: Callable[[], object]
+    interval: int | None  # Ticks between recurrences, None for one-shot
+    description: str
+    cancelled: bool = field(repr=False)
+    # Hour of the day, until scheduled, for events given one instead of a tick
+    hour: int | None = field(repr=False)
+    daily: bool = field(repr=False)
+
+    def __init__(
+        self,
+        tick: int | None = None,
+        callback: Callable[[], object] | None = None,
+        interval: int | None = None,
+        description: str = "",
+        *,
+        hour: int | None = None,
+        recurring: bool | None = None,
+    ):
+        if callback is None:
+            raise TypeError("ScheduledEvent needs a callback")
+        if (tick is None) == (hour is None):
+            raise TypeError("ScheduledEvent needs either a tick or an hour")
+        if recurring is not None and hour is None:
+            raise TypeError("recurring is for events given an hour; use interval")
+        self.tick = -1 if tick is None else tick
+        self.callback = callback
+        self.interval = interval
+        self.description = description
+        self.cancelled = False
+        self.hour = hour
+        self.daily = recurring is not False
+
+    @property
+    def recurring(self) -> bool:
+        if self.hour is not None:
+            return self.daily
+        return self.interval is not None
+
+    def cancel(self):
+        """Stop the event from firing again"""
+        self.cancelled = True
+
+
+class EventQueue:
+    """Priority queue of scheduled events keyed on absolute tick
+
+    Events due on the same tick fire in the order they were scheduled.
+    Cancelled events stay in the heap until they reach the front, so
+    cancelling is O(1).
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[int, int, ScheduledEvent]] = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, event: ScheduledEvent) -> ScheduledEvent:
+        if event.hour is not None:
+            raise ValueError("events given an hour are scheduled by a TimeSystem")
+        heapq.heappush(self._heap, (event.tick, next(self._counter), event))
+        return event
+
+    def schedule(
+        self,
+        tick: int,
+        callback: Callable[[], object],
+        interval: int | None = None,
+        description: str = "",
+    ) -> ScheduledEvent:
+        """Schedule a callback at an absolute tick, returning its handle"""
+        if interval is not None and interval <= 0:
+            raise ValueError(f"Recurring interval must be positive, got {interval}")
+        return self.push(ScheduledEvent(tick, callback, interval, description))
+
+    @property
+    def next_tick(self) -> int | None:
+        """Tick of the earliest pending event, if any"""
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def run_due(self, tick: int) -> int:
+        """Fire every event due at or before `tick`, returning how many fired"""
+        fired = 0
+        heap = self._heap
+        while heap and heap[0][0] <= tick:
+            _, _, event = heapq.heappop(heap)
+            if event.cancelled:
+                continue
+            if event.interval is not None:
+                event.tick += event.interval
+                self.push(event)
+            event.callback()
+            fired += 1
+        return fired
+
+    def clear(self):
+        self._heap.clear()
@@ -0,0 +1,100 @@
+import time
+
+from ..world.city import City
+from .game import GameConfig
+from .scheduler import FixedStepScheduler
+from .sharding import ShardedSimulation
+from .time_system import TimeSystem
+
+
+class HeadlessSimulation:
+    """Runs the time system and city without a display, fonts or frame cap
+
+    Every step advances game time by exactly one tick and updates the city once,
+    so a run of N ticks is independent of wall-clock time and FPS.
+    """
+
+    def __init__(
+        self,
+        config: GameConfig | None = None,
+        use_agent_store: bool = False,
+        shards: int = 1,
+        ticks_per_barrier: int = 1,
+        city: City | None = None,
+        time_system: TimeSystem | None = None,
+        seed: int | None = None,
+        lazy_needs: bool = False,
+        navigation: bool = False,
+    ):
+        self.config = config or GameConfig()
+        self.time_system = time_system or TimeSystem()
+        self.city = city or City(
+            self.config.width,
+            self.config.height,
+            use_agent_store=use_agent_store,
+            seed=seed,
+            lazy_needs=lazy_needs,
+            navigation=navigation,
+        )
+        self.scheduler = FixedStepScheduler(self.time_system, self.city)
+        self.ticks_run = 0
+
+        # Spread the city over worker processes when more than one shard is asked for
+        self.sharded = (
+            ShardedSimulation(
+                self.city,
+                self.time_system,
+                shards=shards,
+                ticks_per_barrier=ticks_per_barrier,
+                use_agent_store=use_agent_store,
+                lazy_needs=lazy_needs,
+            )
+            if shards > 1
+            else None
+        )
+
+    def step(self):
+        """Advance the simulation by a single tick (or barrier interval when sharded)
+
+        The first sharded step starts the worker processes, taking the city's
+        agents along; `run` brings them back and stops the workers when done.
+        """
+        if self.sharded is not None:
+            # Shard workers run in other processes; time each barrier as a whole
+            with self.city.profiler.section("shards.step", len(self.city.agents)):
+                self.sharded.step()
+            self.city.profiler.end_tick()
+            self.ticks_run += self.sharded.ticks_per_barrier
+        else:
+            self.scheduler.step()
+            self.ticks_run += 1
+
+    def run(self, ticks: int) -> float:
+        """Run the given number of ticks as fast as possible, returning elapsed seconds"""
+        print(
+            f"Running {ticks} ticks headless with {len(self.city.agents)} agents "
+            f"(seed {self.city.rng.seed})..."
+        )
+        if self.sharded is not None:
+            print(f"Sharding across {self.sharded.shards} worker processes")
+            self.sharded.start()
+
+        target = self.ticks_run + ticks
+        start = time.perf_counter()
+        try:
+            while self.ticks_run < target:
+                self.step()
+            if self.sharded is not None:
+                self.sharded.collect_agents()
+        finally:
+            if self.sharded is not None:
+                self.sharded.close()
+        elapsed = time.perf_counter() - start
+
+        rate = ticks / elapsed if elapsed > 0 else float("inf")
+        game_time = self.time_system.time
+        print(
+            f"Finished at day {game_time.day} - {game_time.hour:02d}:00 "
+            f"after {elapsed:.2f}s ({rate:.0f} ticks/sec)"
+        )
+        return elapsed
@@ -0,0 +1,140 @@
+import json
+from collections import deque
+from contextlib import nullcontext
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any
+
+import pygame
+
+from ..ui.text import text_cache
+
+# Per-section totals for one tick: name -> [nanoseconds, calls, agents]
+TickSummary = dict[str, list[int]]
+
+_DISABLED = nullcontext()
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "agents", "start")
+
+    def __init__(self, profiler: "TickProfiler", name: str, agents: int):
+        self.profiler = profiler
+        self.name = name
+        self.agents = agents
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(
+            self.name, self.start, perf_counter_ns() - self.start, self.agents
+        )
+
+
+class TickProfiler:
+    """Records wall time, call counts and agent counts per simulation subsystem
+
+    Timed spans go into a bounded ring buffer (for trace export), and are also
+    totalled per tick into a second ring buffer (for the in-game overlay). When
+    disabled, `section` returns a shared no-op context manager.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        span_capacity: int = 100_000,
+        tick_window: int = 120,
+    ):
+        self.enabled = enabled
+        self.tick = 0
+        # (tick, name, start_ns, duration_ns, agents)
+        self.spans: deque[tuple[int, str, int, int, int]] = deque(maxlen=span_capacity)
+        self.ticks: deque[TickSummary] = deque(maxlen=tick_window)
+        self._current: TickSummary = {}
+
+    def section(self, name: str, agents: int = 0):
+        """Context manager timing a block of code under the given name"""
+        if not self.enabled:
+            return _DISABLED
+        return _Section(self, name, agents)
+
+    def record(self, name: str, start_ns: int, duration_ns: int, agents: int = 0):
+        """Record a timed span directly"""
+        self.spans.append((self.tick, name, start_ns, duration_ns, agents))
+        totals = self._current.get(name)
+        if totals is None:
+            self._current[name] = [duration_ns, 1, agents]
+        else:
+            totals[0] += duration_ns
+            totals[1] += 1
+            totals[2] = agents
+
+    def end_tick(self):
+        """Close the current tick's totals and start a new tick"""
+        if not self.enabled:
+            return
+        self.ticks.append(self._current)
+        self._current = {}
+        self.tick += 1
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Per-section statistics over the recent tick window"""
+        stats: dict[str, dict[str, float]] = {}
+        for tick in self.ticks:
+            for name, (duration_ns, calls, agents) in tick.items():
+                entry = stats.setdefault(
+                    name, {"total_ms": 0.0, "max_ms": 0.0, "calls": 0, "agents": 0}
+                )
+                ms = duration_ns / 1e6
+                entry["total_ms"] += ms
+                entry["max_ms"] = max(entry["max_ms"], ms)
+                entry["calls"] += calls
+                entry["agents"] = agents
+        for entry in stats.values():
+            entry["avg_ms"] = entry["total_ms"] / max(entry["calls"], 1)
+        return stats
+
+    def export_chrome_trace(self, path: str | Path):
+        """Write the buffered spans as Chrome trace JSON (chrome://tracing, Perfetto)"""
+        origin = self.spans[0][2] if self.spans else 0
+        events: list[dict[str, Any]] = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start_ns - origin) / 1000,
+                "dur": duration_ns / 1000,
+                "pid": 1,
+                "tid": 1,
+                "args": {"tick": tick, "agents": agents},
+            }
+            for tick, name, start_ns, duration_ns, agents in self.spans
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def render(self, screen: pygame.Surface, y: int) -> pygame.Rect:
+        """Render a per-section timing table at the top right of the screen"""
+        stats = self.summary()
+        lines = [f"{'section':<18} {'avg ms':>7} {'max ms':>7} {'calls':>6}"]
+        for name in sorted(stats):
+            entry = stats[name]
+            lines.append(
+                f"{name:<18} {entry['avg_ms']:>7.3f} {entry['max_ms']:>7.3f} "
+                f"{entry['calls']:>6.0f}"
+            )
+
+        # Timings change every frame, so render directly rather than filling
+        # the shared text cache with values that won't be seen again
+        font = text_cache.font(20)
+        surfaces = [font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(surface.get_width() for surface in surfaces) + 10
+        height = len(surfaces) * 18 + 10
+        x = screen.get_width() - width - 10
+
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        rect = screen.blit(panel, (x, y))
+        for i, surface in enumerate(surfaces):
+            screen.blit(surface, (x + 5, y + 5 + i * 18))
+        return rect
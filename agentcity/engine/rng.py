@@ -0,0 +1,119 @@
+import hashlib
+import random
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+
+def derive_seed(seed: int, *key: object) -> int:
+    """Derive a 64-bit seed from a parent seed and a key, stable across processes"""
+    digest = hashlib.blake2b(repr((seed, *key)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class RandomStream:
+    """A seeded stream of uniform random numbers, drawn in batches
+
+    Each stream owns one generator, which fills a block of `batch_size`
+    numbers at a time. The complete state of a stream is just its seed and
+    how many numbers have been drawn: the generator can be fast-forwarded to
+    any position, which keeps per-agent streams cheap to save in snapshots
+    and to hand between processes. The current block is held as packed
+    doubles, as every agent keeps one.
+
+    With numpy the generator is a PCG64 filled in one call per block;
+    without it, `random.Random`. The two give different (but each
+    deterministic) streams.
+    """
+
+    __slots__ = ("seed", "batch_size", "_generator", "_buffer", "_index", "_drawn")
+
+    def __init__(self, seed: int, batch_size: int = 64, position: int = 0):
+        self.seed = seed
+        self.batch_size = batch_size
+        self._buffer = array("d")
+        self._index = 0
+        self._drawn = 0  # Values generated, including the rest of the block
+        block_start = position - position % batch_size
+        if np is not None:
+            bit_generator = np.random.PCG64(seed)
+            # One 64-bit output per double, so the position is an exact step
+            bit_generator.advance(block_start)
+            self._generator = np.random.Generator(bit_generator)
+        else:
+            self._generator = random.Random(seed)
+            for _ in range(block_start):
+                self._generator.random()
+        self._drawn = block_start
+        if position % batch_size:
+            self._refill()
+            self._index = position % batch_size
+
+    @property
+    def position(self) -> int:
+        """Number of values drawn from the stream so far"""
+        return self._drawn - len(self._buffer) + self._index
+
+    def _refill(self):
+        if np is not None:
+            values = self._generator.random(self.batch_size).tobytes()
+            self._buffer = array("d", values)
+        else:
+            draw = self._generator.random
+            self._buffer = array("d", [draw() for _ in range(self.batch_size)])
+        self._drawn += self.batch_size
+        self._index = 0
+
+    def random(self) -> float:
+        """Return the next float in [0, 1)"""
+        index = self._index
+        try:
+            value = self._buffer[index]
+        except IndexError:
+            self._refill()
+            value = self._buffer[0]
+            index = 0
+        self._index = index + 1
+        return value
+
+    def random_batch(self, count: int) -> list[float]:
+        """Return the next `count` floats in [0, 1)"""
+        values: list[float] = []
+        while len(values) < count:
+            if self._index >= len(self._buffer):
+                self._refill()
+            take = min(count - len(values), len(self._buffer) - self._index)
+            values.extend(self._buffer[self._index : self._index + take])
+            self._index += take
+        return values
+
+    def randint(self, a: int, b: int) -> int:
+        """Return a random integer N such that a <= N <= b"""
+        return a + int(self.random() * (b - a + 1))
+
+
+class SimulationRNG:
+    """Root of all randomness in a simulation
+
+    Every consumer draws from its own stream derived from the simulation seed
+    and a stable key (such as an agent's name or a shard id), so the same seed
+    and configuration always give the same results regardless of update order
+    or how agents are spread over processes.
+    """
+
+    def __init__(self, seed: int | None = None):
+        self.seed = seed if seed is not None else random.randrange(2**63)
+
+    def stream(self, *key: object) -> RandomStream:
+        """Create the stream for a key"""
+        return RandomStream(derive_seed(self.seed, *key))
+
+    def agent_stream(self, agent_name: str) -> RandomStream:
+        return self.stream("agent", agent_name)
+
+    def spawn(self, *key: object) -> "SimulationRNG":
+        """Create an independent child RNG, e.g. for a shard"""
+        return SimulationRNG(derive_seed(self.seed, *key))
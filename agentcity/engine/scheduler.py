@@ -0,0 +1,77 @@
+import time
+
+from ..world.city import City
+from .time_system import TimeSystem
+
+
+class FixedStepScheduler:
+    """Runs the simulation in fixed ticks, decoupled from the render frame rate
+
+    Each call to `update` converts the real time since the last frame into a whole
+    number of game ticks, and advances time and the city together once per tick.
+    Catch-up is capped so a slow frame can't trigger a spiral of ever longer
+    frames; in fast-forward mode ticks run until the frame's time budget is spent.
+    """
+
+    def __init__(
+        self,
+        time_system: TimeSystem,
+        city: City,
+        max_catch_up_ticks: int = 10,
+        fast_forward_budget: float = 0.012,  # Seconds of simulation per frame
+    ):
+        self.time_system = time_system
+        self.city = city
+        self.max_catch_up_ticks = max_catch_up_ticks
+        self.fast_forward_budget = fast_forward_budget
+        self.fast_forward = False
+        self.ticks_last_frame = 0
+        self.dropped_ticks = 0  # Ticks skipped because catch-up was capped
+
+    def step(self):
+        """Advance game time and the city by exactly one tick"""
+        profiler = self.city.profiler
+        with profiler.section("time.advance"):
+            self.time_system.advance_tick()
+        with profiler.section("city.update", len(self.city.agents)):
+            self.city.update(
+                time_of_day=self.time_system.time.time_of_day,
+                current_hour=self.time_system.time.hour,
+                ticks_per_hour=self.time_system.ticks_per_hour,
+            )
+        profiler.end_tick()
+
+    def update(self, delta_time: float) -> int:
+        """Run the ticks due for `delta_time` real seconds, returning how many ran"""
+        if self.fast_forward:
+            ticks = self._run_fast_forward()
+        else:
+            ticks = self._run_fixed(delta_time)
+        self.ticks_last_frame = ticks
+        return ticks
+
+    def _run_fixed(self, delta_time: float) -> int:
+        time_system = self.time_system
+        time_system.accumulated_time += delta_time * time_system.time.time_scale
+
+        time_per_tick = 1.0 / time_system.ticks_per_hour
+        due = int(time_system.accumulated_time / time_per_tick)
+        time_system.accumulated_time -= due * time_per_tick
+
+        ticks = min(due, self.max_catch_up_ticks)
+        self.dropped_ticks += due - ticks
+        for _ in range(ticks):
+            self.step()
+        return ticks
+
+    def _run_fast_forward(self) -> int:
+        # Time accumulated while fast-forwarding is irrelevant, don't replay it later
+        self.time_system.accumulated_time = 0.0
+
+        deadline = time.perf_counter() + self.fast_forward_budget
+        ticks = 0
+        while True:
+            self.step()
+            ticks += 1
+            if time.perf_counter() >= deadline:
+                return ticks
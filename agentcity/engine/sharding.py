@@ -0,0 +1,549 @@
+import multiprocessing
+from collections.abc import Sequence
+from math import isqrt
+from multiprocessing.connection import Connection
+from typing import Any
+
+from ..ai.behaviors import Behavior, BehaviorState
+from ..ai.behaviors.needs import NeedBehavior
+from ..ai.needs import Need
+from ..entities.agent import DEFAULT_BEHAVIORS, Agent, AgentState
+from ..entities.building import Building
+from ..entities.objects import WorldObject
+from ..world.capabilities import CapabilityIndex
+from ..world.city import City
+from ..world.navigation import Navigator
+from .rng import RandomStream
+from .time_system import TimeSystem
+
+# (time_of_day, hour, ticks_per_hour) for each tick of a barrier interval
+TickInfo = tuple[str, int, int]
+
+
+def grid_shape(shards: int) -> tuple[int, int]:
+    """Split a number of shards into the most square (columns, rows) grid"""
+    rows = isqrt(shards)
+    while shards % rows:
+        rows -= 1
+    return shards // rows, rows
+
+
+class RegionGrid:
+    """Partitions the map into a grid of rectangular regions, one per shard"""
+
+    def __init__(self, width: int, height: int, shards: int):
+        self.width = width
+        self.height = height
+        self.columns, self.rows = grid_shape(shards)
+
+    def region_of(self, position: tuple[float, float]) -> int:
+        col = int(position[0] * self.columns // self.width)
+        row = int(position[1] * self.rows // self.height)
+        col = min(max(col, 0), self.columns - 1)
+        row = min(max(row, 0), self.rows - 1)
+        return row * self.columns + col
+
+
+def export_building(building: Building) -> tuple:
+    """Describe a building so it can be rebuilt identically in another process"""
+    return (
+        building.building_type,
+        building.position,
+        building.size,
+        [(obj.name, obj.position, obj.capabilities) for obj in building.objects],
+    )
+
+
+def import_building(spec: tuple) -> Building:
+    building_type, position, size, objects = spec
+    return Building(
+        building_type,
+        position,
+        size,
+        objects=[
+            WorldObject(name, obj_position, capabilities)
+            for name, obj_position, capabilities in objects
+        ],
+    )
+
+
+def occupancy_slots(objects: list[WorldObject]) -> list[tuple[WorldObject, str]]:
+    """Every (object, capability) pair with its own capacity, in a stable order"""
+    return [(obj, capability) for obj in objects for capability in obj.capacity]
+
+
+def export_agent(
+    agent: Agent,
+    object_ids: dict[WorldObject, int],
+    slot_ids: dict[tuple[WorldObject, str], int],
+    navigator: Navigator | None = None,
+) -> dict[str, Any]:
+    """Describe an agent, including its active behavior, for hand-off between shards
+
+    "slot" is the occupancy slot the agent holds, if any. Agents waiting in
+    line keep their behavior but have to rejoin the queue on arrival. The
+    agent's route is kept if `navigator` planned it.
+    """
+    behavior = agent.active_behavior
+    data: dict[str, Any] = {
+        "name": agent.name,
+        "state": (
+            agent.state.position,
+            agent.state.current_action,
+            agent.state.destination,
+            agent.state.speed,
+        ),
+        "needs": {
+            name: (need.current, need.decay_rate, need.critical_threshold)
+            for name, need in agent.needs.needs.items()
+        },
+        "behavior": None,
+        "slot": None,
+        "rng": (agent.rng.seed, agent.rng.position) if agent.rng else None,
+        "route": navigator.export_route(agent.state.route) if navigator else None,
+    }
+    if behavior is not None:
+        using_object = agent.behavior_state.using_object
+        if using_object is not None and agent.name in using_object.occupants:
+            capability = using_object.occupants[agent.name]
+            data["slot"] = slot_ids[using_object, capability]
+        data["behavior"] = (
+            agent.behaviors.index(behavior),
+            agent.behavior_state.export(),
+            object_ids[using_object] if using_object is not None else None,
+        )
+    return data
+
+
+def import_agent(
+    data: dict[str, Any],
+    objects: list[WorldObject],
+    behaviors: Sequence[Behavior],
+    navigator: Navigator | None = None,
+) -> Agent:
+    """Rebuild an agent exported by `export_agent` for a city with `behaviors`"""
+    position, current_action, destination, speed = data["state"]
+    agent = Agent(data["name"], position)
+    agent.state = AgentState(
+        position=position,
+        current_action=current_action,
+        destination=destination,
+        speed=speed,
+    )
+    for name, (current, decay_rate, critical_threshold) in data["needs"].items():
+        agent.needs.needs[name] = Need(current, decay_rate, critical_threshold)
+    if data["rng"] is not None:
+        seed, position = data["rng"]
+        agent.rng = RandomStream(seed, position=position)
+    if navigator is not None and data["route"] is not None:
+        agent.state.route = navigator.import_route(data["route"])
+
+    if data["behavior"] is not None:
+        index, state, object_id = data["behavior"]
+        agent.behavior_state = BehaviorState(**state)
+        if object_id is not None:
+            agent.behavior_state.using_object = objects[object_id]
+        agent.active_behavior = behaviors[index]
+    return agent
+
+
+class _JournalingCapabilityIndex(CapabilityIndex):
+    """Capability index that records which objects changed occupancy"""
+
+    def __init__(self):
+        super().__init__()
+        self.dirty: set[WorldObject] = set()
+        self.recording = True
+
+    def update_object(self, obj: WorldObject):
+        if self.recording:
+            self.dirty.add(obj)
+        super().update_object(obj)
+
+
+class ShardWorker:
+    """Simulates the agents inside one region against a replica of the city
+
+    Object occupancy in the replica is authoritative only for this shard's own
+    agents; the coordinator merges every shard's claims at each barrier and
+    sends back the combined occupancy, evicting agents from over-full objects.
+    """
+
+    def __init__(
+        self,
+        shard_id: int,
+        regions: RegionGrid,
+        buildings: list[tuple],
+        use_agent_store: bool,
+        seed: int,
+        lazy_needs: bool = False,
+        custom_behaviors: Sequence[Behavior] = (),
+        navigation: bool = False,
+    ):
+        self.shard_id = shard_id
+        self.regions = regions
+        self.city = City(
+            regions.width,
+            regions.height,
+            use_agent_store=use_agent_store,
+            create_layout=False,
+            seed=seed,
+            lazy_needs=lazy_needs,
+            navigation=navigation,
+        )
+        for behavior in custom_behaviors:
+            self.city.register_behavior(behavior)
+        self.index = _JournalingCapabilityIndex()
+        self.city.capability_index = self.index
+        for spec in buildings:
+            self.city.add_building(import_building(spec))
+
+        self.objects = [obj for b in self.city.buildings for obj in b.objects]
+        self.object_ids = {obj: i for i, obj in enumerate(self.objects)}
+        self.slots = occupancy_slots(self.objects)
+        self.slot_ids = {slot: i for i, slot in enumerate(self.slots)}
+
+    def apply_sync(
+        self,
+        occupancy: dict[int, list[str]],
+        evictions: list[str],
+        immigrants: list[dict[str, Any]],
+    ):
+        """Apply the coordinator's barrier decisions before running more ticks"""
+        # Hand-offs first: the coordinator has already moved their object claims
+        arrived = []
+        for data in immigrants:
+            agent = import_agent(
+                data, self.objects, self.city.behaviors, self.city.navigation
+            )
+            self.city.add_agent(agent)
+            arrived.append(agent)
+
+        self.index.recording = False
+        for name in evictions:
+            evicted = self.city.agents_by_name.get(name)
+            behavior = evicted.active_behavior if evicted else None
+            if evicted is None or not isinstance(behavior, NeedBehavior):
+                continue
+            self.city.wake_agent(evicted)
+            behavior.deactivate(evicted)
+            evicted.active_behavior = None
+            evicted.state.current_action = "idle"
+            evicted.state.destination = None
+
+        updated = set()
+        for slot_id, names in occupancy.items():
+            obj, capability = self.slots[slot_id]
+            obj.set_occupants(capability, names)
+            self.index.update_object(obj)
+            updated.add(obj)
+        self.index.recording = True
+
+        # Slots granted to agents waiting here are new claims for the coordinator
+        for agent in arrived:
+            if isinstance(agent.active_behavior, NeedBehavior):
+                agent.active_behavior.rejoin_queue(agent)
+        for obj in updated:
+            obj.grant_waiting()
+
+    def run(self, ticks: list[TickInfo]) -> dict[str, Any]:
+        """Run a barrier interval and report occupancy claims and emigrants"""
+        for time_of_day, hour, ticks_per_hour in ticks:
+            self.city.update(time_of_day, hour, ticks_per_hour)
+
+        emigrants = []
+        for agent in list(self.city.agents):
+            target = self.regions.region_of(agent.state.position)
+            if target == self.shard_id:
+                continue
+            self.city.wake_agent(agent)
+            data = export_agent(
+                agent, self.object_ids, self.slot_ids, self.city.navigation
+            )
+            # The coordinator moves its slot along to the agent's new shard
+            self.city.remove_agent(agent, keep_slot=True)
+            using_object = agent.behavior_state.using_object
+            if using_object is not None:
+                self.index.dirty.add(using_object)
+            emigrants.append((target, data))
+
+        claims = {
+            self.slot_ids[obj, capability]: [
+                name
+                for name, cap in obj.occupants.items()
+                if cap == capability and name in self.city.agents_by_name
+            ]
+            for obj in self.index.dirty
+            for capability in obj.capacity
+        }
+        self.index.dirty.clear()
+        return {"claims": claims, "emigrants": emigrants}
+
+    def export_agents(self) -> list[dict[str, Any]]:
+        self.city.wake_all()
+        return [
+            export_agent(agent, self.object_ids, self.slot_ids, self.city.navigation)
+            for agent in self.city.agents
+        ]
+
+
+def _worker_main(
+    conn: Connection,
+    shard_id: int,
+    regions: RegionGrid,
+    buildings: list[tuple],
+    use_agent_store: bool,
+    seed: int,
+    lazy_needs: bool,
+    custom_behaviors: list[Behavior],
+    navigation: bool,
+):
+    worker = ShardWorker(
+        shard_id,
+        regions,
+        buildings,
+        use_agent_store,
+        seed,
+        lazy_needs,
+        custom_behaviors,
+        navigation,
+    )
+    while True:
+        command, *args = conn.recv()
+        if command == "step":
+            occupancy, evictions, immigrants, ticks = args
+            worker.apply_sync(occupancy, evictions, immigrants)
+            conn.send(worker.run(ticks))
+        elif command == "gather":
+            occupancy, evictions, immigrants = args
+            worker.apply_sync(occupancy, evictions, immigrants)
+            conn.send(worker.export_agents())
+        elif command == "stop":
+            conn.close()
+            return
+
+
+class ShardedSimulation:
+    """Runs one city across worker processes, one per spatial region
+
+    The coordinator owns game time and the authoritative object occupancy.
+    Every `ticks_per_barrier` ticks the workers report which of their agents
+    claim which objects and which agents crossed into another region; the
+    coordinator resolves over-capacity claims, routes the hand-offs, and ships
+    the result to the workers along with the next batch of ticks.
+    """
+
+    def __init__(
+        self,
+        city: City,
+        time_system: TimeSystem | None = None,
+        shards: int | None = None,
+        ticks_per_barrier: int = 1,
+        use_agent_store: bool = False,
+        lazy_needs: bool = False,
+    ):
+        if city.chunks is not None:
+            # Every shard needs the same fixed set of objects to claim
+            raise ValueError("sharding requires a city without chunk streaming")
+        self.city = city
+        self.time_system = time_system or TimeSystem()
+        self.shards = shards or multiprocessing.cpu_count()
+        self.ticks_per_barrier = ticks_per_barrier
+        self.use_agent_store = use_agent_store
+        self.lazy_needs = lazy_needs
+        self.regions = RegionGrid(city.width, city.height, self.shards)
+
+        self.objects = [obj for b in city.buildings for obj in b.objects]
+        self.slots = occupancy_slots(self.objects)
+        self.capacity = [obj.capacity[capability] for obj, capability in self.slots]
+        # Slot id -> shard id -> names of that shard's agents using it
+        self.owners: list[dict[int, list[str]]] = [{} for _ in self.slots]
+
+        self._connections: list[Connection] = []
+        self._processes: list[multiprocessing.Process] = []
+        self._pending: list[tuple[dict[int, list[str]], list[str], list[dict]]] = []
+
+    def start(self):
+        """Spawn the workers and distribute the city's agents among them
+
+        Does nothing if the workers are running already.
+        """
+        if self._processes:
+            return
+        object_ids = {obj: i for i, obj in enumerate(self.objects)}
+        slot_ids = {slot: i for i, slot in enumerate(self.slots)}
+        buildings = [export_building(b) for b in self.city.buildings]
+        self.owners = [{} for _ in self.slots]
+        immigrants: list[list[dict]] = [[] for _ in range(self.shards)]
+        self.city.wake_all()
+        for agent in list(self.city.agents):
+            shard = self.regions.region_of(agent.state.position)
+            data = export_agent(agent, object_ids, slot_ids, self.city.navigation)
+            immigrants[shard].append(data)
+            if data["slot"] is not None:
+                self.owners[data["slot"]].setdefault(shard, []).append(agent.name)
+            self.city.remove_agent(agent, keep_slot=True)
+
+        # Seed every replica with the occupancy of objects already in use
+        occupancy = {
+            slot_id: [name for shard in sorted(owners) for name in owners[shard]]
+            for slot_id, owners in enumerate(self.owners)
+            if owners
+        }
+        self._pending = [
+            (occupancy, [], immigrants[shard]) for shard in range(self.shards)
+        ]
+
+        for shard_id in range(self.shards):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_worker_main,
+                args=(
+                    child,
+                    shard_id,
+                    self.regions,
+                    buildings,
+                    self.use_agent_store,
+                    # Each shard gets its own stream; agents carry theirs along
+                    self.city.rng.spawn("shard", shard_id).seed,
+                    self.lazy_needs,
+                    # Defaults are registered by every city already
+                    self.city.behaviors[len(DEFAULT_BEHAVIORS) :],
+                    self.city.navigation is not None,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def step(self):
+        """Advance all shards by one barrier interval, starting them if needed"""
+        if not self._processes:
+            self.start()
+        ticks: list[TickInfo] = []
+        for _ in range(self.ticks_per_barrier):
+            self.time_system.advance_tick()
+            game_time = self.time_system.time
+            ticks.append(
+                (game_time.time_of_day, game_time.hour, self.time_system.ticks_per_hour)
+            )
+
+        for conn, (occupancy, evictions, immigrants) in zip(
+            self._connections, self._pending
+        ):
+            conn.send(("step", occupancy, evictions, immigrants, ticks))
+        results = [conn.recv() for conn in self._connections]
+        self._pending = self._resolve(results)
+
+    def _resolve(
+        self, results: list[dict[str, Any]]
+    ) -> list[tuple[dict[int, list[str]], list[str], list[dict]]]:
+        """Merge shard claims, evict over-capacity claimants and route hand-offs"""
+        evictions: list[list[str]] = [[] for _ in range(self.shards)]
+        immigrants: list[list[dict]] = [[] for _ in range(self.shards)]
+        changed: set[int] = set()
+        # Object id -> shard id -> names that claimed the object this interval
+        new_claims: dict[int, dict[int, list[str]]] = {}
+
+        # Claims held by agents crossing regions move with them to the new shard;
+        # claims made during this interval are checked like any other new claim
+        handoffs = []
+        for shard, result in enumerate(results):
+            for target, data in result["emigrants"]:
+                immigrants[target].append(data)
+                slot_id = data["slot"]
+                if slot_id is None:
+                    continue
+                held = data["name"] in self.owners[slot_id].get(shard, [])
+                handoffs.append((slot_id, target, data["name"], held))
+
+        for shard, result in enumerate(results):
+            for slot_id, names in result["claims"].items():
+                owners = self.owners[slot_id]
+                previous = owners.get(shard, [])
+                if names != previous:
+                    changed.add(slot_id)
+                added = [name for name in names if name not in previous]
+                if added:
+                    new_claims.setdefault(slot_id, {})[shard] = added
+                owners[shard] = names
+
+        for slot_id, target, name, held in handoffs:
+            self.owners[slot_id].setdefault(target, []).append(name)
+            changed.add(slot_id)
+            if not held:
+                new_claims.setdefault(slot_id, {}).setdefault(target, []).append(name)
+
+        for slot_id, claims in new_claims.items():
+            owners = self.owners[slot_id]
+            excess = sum(len(names) for names in owners.values())
+            excess -= self.capacity[slot_id]
+            # Only fresh claims can be evicted, and later shards lose ties
+            for shard in sorted(claims, reverse=True):
+                for name in reversed(claims[shard]):
+                    if excess <= 0:
+                        break
+                    owners[shard].remove(name)
+                    evictions[shard].append(name)
+                    excess -= 1
+
+        occupancy = {
+            slot_id: [
+                name
+                for shard in sorted(self.owners[slot_id])
+                for name in self.owners[slot_id][shard]
+            ]
+            for slot_id in changed
+        }
+        return [
+            (occupancy, evictions[shard], immigrants[shard])
+            for shard in range(self.shards)
+        ]
+
+    def gather_agents(self) -> list[Agent]:
+        """Fetch copies of every agent from the workers"""
+        # Deliver the last barrier's decisions first so no agent is in flight
+        for conn, pending in zip(self._connections, self._pending):
+            conn.send(("gather", *pending))
+        self._pending = [({}, [], []) for _ in range(self.shards)]
+
+        agents: list[Agent] = []
+        for conn in self._connections:
+            agents.extend(
+                import_agent(
+                    data, self.objects, self.city.behaviors, self.city.navigation
+                )
+                for data in conn.recv()
+            )
+        return agents
+
+    def collect_agents(self):
+        """Move every agent back into the coordinator's city, with its occupancy"""
+        agents = self.gather_agents()
+        for agent in agents:
+            self.city.add_agent(agent)
+        for (obj, capability), owners in zip(self.slots, self.owners):
+            names = [name for shard in sorted(owners) for name in owners[shard]]
+            obj.set_occupants(capability, names)
+            self.city.capability_index.update_object(obj)
+        self.owners = [{} for _ in self.slots]
+        for agent in agents:
+            if isinstance(agent.active_behavior, NeedBehavior):
+                agent.active_behavior.rejoin_queue(agent)
+
+    def close(self):
+        """Stop the worker processes"""
+        for conn in self._connections:
+            conn.send(("stop",))
+        for process in self._processes:
+            process.join()
+        self._connections.clear()
+        self._processes.clear()
+
+    def __enter__(self) -> "ShardedSimulation":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
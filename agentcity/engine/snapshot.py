@@ -0,0 +1,412 @@
+import json
+import struct
+from array import array
+from collections.abc import Sequence
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from ..ai.behaviors import Behavior, BehaviorState
+from ..ai.needs import LazyNeed, Need
+from ..entities.agent import Agent
+from ..entities.building import Building, BuildingType
+from ..entities.objects import ObjectCapability, WorldObject
+from ..world.agent_store import NEED_NAMES, AgentStore, np
+from ..world.chunks import ChunkStreamer
+from ..world.city import City
+from ..world.navigation import Navigator
+from ..world.spatial import Cell
+from .rng import RandomStream
+from .time_system import TimeSystem
+
+# File layout (all little-endian):
+#   header:   magic, format version, metadata length, agent count
+#   metadata: UTF-8 JSON describing time, buildings, objects and agent identities
+#   padding:  zero bytes up to the next 8-byte boundary
+#   columns:  float64 matrix of shape (agents, COLUMN_WIDTH), row-major
+MAGIC = b"AGCITY\x00\x00"
+SNAPSHOT_VERSION = 3
+HEADER = struct.Struct("<8sHQQ")
+
+# Per-agent column layout; need columns follow in NEED_NAMES order
+POSITION, DESTINATION, HAS_DESTINATION, SPEED, NEEDS = 0, 2, 4, 5, 6
+NEED_COUNT = len(NEED_NAMES)
+DECAY_RATES = NEEDS + NEED_COUNT
+CRITICAL_THRESHOLDS = DECAY_RATES + NEED_COUNT
+COLUMN_WIDTH = CRITICAL_THRESHOLDS + NEED_COUNT
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is malformed or from an unsupported version"""
+
+
+def _agent_row(agent: Agent) -> list[float]:
+    state = agent.state
+    destination = state.destination
+    row = [
+        *state.position,
+        *(destination or (0.0, 0.0)),
+        1.0 if destination else 0.0,
+        state.speed,
+    ]
+    needs = [agent.needs.needs[name] for name in NEED_NAMES]
+    row.extend(need.current for need in needs)
+    row.extend(need.decay_rate for need in needs)
+    row.extend(need.critical_threshold for need in needs)
+    return row
+
+
+def _agent_meta(
+    agent: Agent, object_ids: dict[WorldObject, int], navigation: Navigator | None
+) -> dict[str, Any]:
+    meta: dict[str, Any] = {"name": agent.name, "action": agent.state.current_action}
+    if agent.rng is not None:
+        meta["rng"] = [agent.rng.seed, agent.rng.position]
+    behavior = agent.active_behavior
+    if behavior is not None:
+        using_object = agent.behavior_state.using_object
+        meta["behavior"] = [
+            agent.behaviors.index(behavior),
+            agent.behavior_state.export(),
+            object_ids[using_object] if using_object is not None else None,
+        ]
+    # Lazy needs are saved as the line they follow, so they resume exactly
+    lazy = {
+        name: [need.start_value, need.start_tick, need.rate]
+        for name, need in agent.needs.needs.items()
+        if isinstance(need, LazyNeed)
+    }
+    if lazy:
+        meta["lazy_needs"] = lazy
+    if navigation is not None:
+        route = navigation.export_route(agent.state.route)
+        if route is not None:
+            meta["route"] = route
+    return meta
+
+
+def save_snapshot(path: str | Path, city: City, time_system: TimeSystem):
+    """Write the complete simulation state to a binary snapshot file
+
+    Scheduled time-system events hold arbitrary callbacks and are not saved.
+    Parked agents are saved with the ticks they were parked at and will wake
+    at, and are restored parked; the city itself is left untouched.
+    """
+    objects = [obj for b in city.buildings for obj in b.objects]
+    object_ids = {obj: i for i, obj in enumerate(objects)}
+    agent_ids = {agent: i for i, agent in enumerate(city.agents)}
+
+    meta = {
+        "time": {
+            "hour": time_system.time.hour,
+            "day": time_system.time.day,
+            "time_scale": time_system.time.time_scale,
+            "accumulated_time": time_system.accumulated_time,
+            "current_tick": time_system.current_tick,
+        },
+        "city": {
+            "width": city.width,
+            "height": city.height,
+            "current_tick": city.current_tick,
+            "tick": city.tick,
+            "seed": city.rng.seed,
+            "layout_rng": city.layout_rng.position,
+            "position_rng": city.position_rng.position,
+            "chunks": _chunks_meta(city),
+        },
+        "buildings": [
+            {
+                "type": asdict(b.building_type),
+                "position": b.position,
+                "size": b.size,
+                "objects": [
+                    {
+                        "name": obj.name,
+                        "position": obj.position,
+                        "capabilities": [asdict(cap) for cap in obj.capabilities],
+                        "occupants": obj.occupants,
+                        "waiting": {
+                            capability: list(queue)
+                            for capability, queue in obj.waiting.items()
+                            if queue
+                        },
+                    }
+                    for obj in b.objects
+                ],
+            }
+            for b in city.buildings
+        ],
+        # Agents' behaviors are saved by their index in this list
+        "behaviors": [type(behavior).__name__ for behavior in city.behaviors],
+        "trips": city.navigation.export_trips() if city.navigation else [],
+        "agents": [
+            _agent_meta(agent, object_ids, city.navigation) for agent in city.agents
+        ],
+        # In the order they were parked, so wakeups are scheduled the same way
+        "parked": [
+            [agent_ids[agent], parked_at, event.tick, agent in city.dormant]
+            for agent, (event, parked_at) in city.parked.items()
+        ],
+    }
+    meta_bytes = json.dumps(meta, separators=(",", ":")).encode()
+    padding = -(HEADER.size + len(meta_bytes)) % 8
+
+    columns = array("d")
+    for agent in city.agents:
+        columns.extend(_agent_row(agent))
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, SNAPSHOT_VERSION, len(meta_bytes), len(city.agents)))
+        f.write(meta_bytes)
+        f.write(b"\x00" * padding)
+        columns.tofile(f)
+
+
+def _chunks_meta(city: City) -> dict | None:
+    """Loaded chunks of a chunked city, with the ticks since each was last hot
+
+    The buildings themselves are saved with the rest, as chunks may have
+    changed since they were generated. The ticks until the next streaming
+    update are kept too, as loading chunks changes the layout agents are
+    routed through.
+    """
+    if city.chunks is None:
+        return None
+    return {
+        "loaded": [
+            [x, y, city.tick - city.chunks.last_hot[(x, y)]]
+            for x, y in city.chunks.loaded
+        ],
+        "next_update": city.chunks.next_update - city.tick,
+    }
+
+
+def _read_columns(
+    path: str | Path, offset: int, count: int
+) -> "np.ndarray | list[list[float]]":
+    """Memory-map the agent column matrix, or read it into rows without numpy"""
+    if np is not None:
+        if count == 0:
+            return np.zeros((0, COLUMN_WIDTH))
+        return np.memmap(
+            path, dtype="<f8", mode="r", offset=offset, shape=(count, COLUMN_WIDTH)
+        )
+    columns = array("d")
+    with open(path, "rb") as f:
+        f.seek(offset)
+        columns.fromfile(f, count * COLUMN_WIDTH)
+    return [
+        columns[i * COLUMN_WIDTH : (i + 1) * COLUMN_WIDTH].tolist()
+        for i in range(count)
+    ]
+
+
+def _fill_store(city: City, store: AgentStore, matrix: "np.ndarray"):
+    """Copy the column matrix straight into the store's arrays
+
+    Rows are in agent order, as are the agents just attached to the empty
+    store. Only the values kept per agent in Python are read out one by one.
+    """
+    count = len(matrix)
+    store.positions[:count] = matrix[:, POSITION : POSITION + 2]
+    store.destinations[:count] = matrix[:, DESTINATION : DESTINATION + 2]
+    store.has_destination[:count] = matrix[:, HAS_DESTINATION] != 0.0
+    store.speeds[:count] = matrix[:, SPEED]
+    columns = [store.need_columns[name] for name in NEED_NAMES]
+    store.needs[:count, columns] = matrix[:, NEEDS : NEEDS + NEED_COUNT]
+    store.decay_rates[:count, columns] = matrix[
+        :, DECAY_RATES : DECAY_RATES + NEED_COUNT
+    ]
+
+    thresholds = matrix[:, CRITICAL_THRESHOLDS : CRITICAL_THRESHOLDS + NEED_COUNT]
+    positions = store.positions[:count].tolist()
+    for agent, row_thresholds, position in zip(
+        store.agents, thresholds.tolist(), positions
+    ):
+        for name, threshold in zip(NEED_NAMES, row_thresholds):
+            agent.needs.needs[name].critical_threshold = threshold
+        city.agent_index.move(agent, tuple(position))
+
+
+def load_snapshot(
+    path: str | Path,
+    use_agent_store: bool = False,
+    lazy_needs: bool = False,
+    navigation: bool = False,
+    custom_behaviors: Sequence[Behavior] = (),
+) -> tuple[City, TimeSystem]:
+    """Restore a city and time system saved with `save_snapshot`
+
+    Behaviors registered with `City.register_behavior` aren't saved, and
+    need to be passed as `custom_behaviors`, in the same order. The city may
+    use a different representation of needs than the one saved.
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise SnapshotError(f"{path}: file too short to be a snapshot")
+        magic, version, meta_length, agent_count = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise SnapshotError(f"{path}: not an agent city snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(
+                f"{path}: unsupported snapshot version {version} "
+                f"(expected {SNAPSHOT_VERSION})"
+            )
+        meta = json.loads(f.read(meta_length))
+    offset = HEADER.size + meta_length
+    offset += -offset % 8
+
+    time_system = TimeSystem()
+    time_meta = meta["time"]
+    time_system.time.hour = time_meta["hour"]
+    time_system.time.day = time_meta["day"]
+    time_system.time.time_scale = time_meta["time_scale"]
+    time_system.accumulated_time = time_meta["accumulated_time"]
+    time_system.current_tick = time_meta["current_tick"]
+
+    city_meta = meta["city"]
+    city = City(
+        city_meta["width"],
+        city_meta["height"],
+        use_agent_store=use_agent_store,
+        create_layout=False,
+        seed=city_meta["seed"],
+        lazy_needs=lazy_needs,
+        navigation=navigation,
+        chunked=city_meta.get("chunks") is not None,
+    )
+    for behavior in custom_behaviors:
+        city.register_behavior(behavior)
+    behavior_names = [type(behavior).__name__ for behavior in city.behaviors]
+    saved_names = meta.get("behaviors", behavior_names)
+    if saved_names != behavior_names:
+        raise SnapshotError(
+            f"{path}: saved with behaviors {saved_names}, "
+            f"but the city has {behavior_names}; pass custom_behaviors"
+        )
+    city.current_tick = city_meta["current_tick"]
+    city.tick = city_meta.get("tick", 0)
+    city.layout_rng = RandomStream(
+        city.layout_rng.seed, position=city_meta["layout_rng"]
+    )
+    city.position_rng = RandomStream(
+        city.position_rng.seed, position=city_meta["position_rng"]
+    )
+
+    objects: list[WorldObject] = []
+    buildings: list[Building] = []
+    building_types: dict[str, BuildingType] = {}
+    for building_meta in meta["buildings"]:
+        building_objects = [
+            WorldObject(
+                obj["name"],
+                tuple(obj["position"]),
+                [ObjectCapability(**cap) for cap in obj["capabilities"]],
+                occupants=obj["occupants"],
+            )
+            for obj in building_meta["objects"]
+        ]
+        objects.extend(building_objects)
+        type_meta = building_meta["type"]
+        building_type = building_types.get(type_meta["name"])
+        if building_type is None:
+            red, green, blue = type_meta["color"]
+            building_type = BuildingType(
+                type_meta["name"], (red, green, blue), type_meta["default_objects"]
+            )
+            building_types[building_type.name] = building_type
+        buildings.append(
+            Building(
+                building_type,
+                tuple(building_meta["position"]),
+                tuple(building_meta["size"]),
+                objects=building_objects,
+            )
+        )
+    if city.chunks is None:
+        for building in buildings:
+            city.add_building(building)
+    else:
+        _restore_chunks(city.chunks, city_meta["chunks"], buildings)
+
+    navigator = city.navigation
+    if navigator is not None:
+        navigator.import_trips(meta.get("trips", []))
+
+    matrix = _read_columns(path, offset, agent_count)
+    store = city.agent_store
+    dormant_ids = {index for index, _, _, dormant in meta.get("parked", []) if dormant}
+    for i, agent_meta in enumerate(meta["agents"]):
+        if store is not None:
+            # Columns are copied into the store in bulk once agents are attached
+            agent = Agent(agent_meta["name"], (0.0, 0.0))
+        else:
+            row = matrix[i] if isinstance(matrix, list) else matrix[i].tolist()
+            agent = Agent(agent_meta["name"], (row[POSITION], row[POSITION + 1]))
+            if row[HAS_DESTINATION]:
+                agent.state.destination = (row[DESTINATION], row[DESTINATION + 1])
+            agent.state.speed = row[SPEED]
+            for j, name in enumerate(NEED_NAMES):
+                need = agent.needs.needs[name]
+                need.current = row[NEEDS + j]
+                need.decay_rate = row[DECAY_RATES + j]
+                need.critical_threshold = row[CRITICAL_THRESHOLDS + j]
+        agent.state.current_action = agent_meta["action"]
+        if "rng" in agent_meta:
+            seed, position = agent_meta["rng"]
+            agent.rng = RandomStream(seed, position=position)
+
+        if "behavior" in agent_meta:
+            index, behavior_state, object_id = agent_meta["behavior"]
+            if behavior_state["target_position"] is not None:
+                behavior_state["target_position"] = tuple(
+                    behavior_state["target_position"]
+                )
+            agent.behavior_state = BehaviorState(**behavior_state)
+            if object_id is not None:
+                agent.behavior_state.using_object = objects[object_id]
+            agent.active_behavior = city.behaviors[index]
+        if navigator is not None and "route" in agent_meta:
+            agent.state.route = navigator.import_route(agent_meta["route"])
+        city.add_agent(agent)
+        # Lazy lines only carry over to needs kept as objects: in lazy cities,
+        # and while dormant outside the store. Otherwise saved values are used
+        if store is None and (lazy_needs or i in dormant_ids):
+            needs = agent.needs.needs
+            for name, line in agent_meta.get("lazy_needs", {}).items():
+                value, start_tick, rate = line
+                need = Need(
+                    value, needs[name].decay_rate, needs[name].critical_threshold
+                )
+                needs[name] = LazyNeed(need, rate, city, start_tick)
+    if store is not None and agent_count:
+        assert not isinstance(matrix, list)
+        _fill_store(city, store, matrix)
+    for index, parked_at, wake_tick, dormant in meta.get("parked", []):
+        city.restore_parked(city.agents[index], parked_at, wake_tick, dormant)
+
+    # Queues are restored in order, once the agents they call back exist
+    agents_by_name = city.agents_by_name
+    object_metas = (obj for b in meta["buildings"] for obj in b["objects"])
+    for obj, obj_meta in zip(objects, object_metas):
+        for capability, names in obj_meta["waiting"].items():
+            for name in names:
+                agent = agents_by_name[name]
+                obj.enqueue(name, capability, agent.wake)
+
+    return city, time_system
+
+
+def _restore_chunks(chunks: ChunkStreamer, meta: dict, buildings: list[Building]):
+    """Add saved buildings to the chunks they were loaded as"""
+    by_chunk: dict[Cell, list[Building]] = {(x, y): [] for x, y, _ in meta["loaded"]}
+    for building in buildings:
+        by_chunk.setdefault(chunks.generator.chunk_of(building.position), []).append(
+            building
+        )
+    ages = {(x, y): age for x, y, age in meta["loaded"]}
+    for chunk, chunk_buildings in by_chunk.items():
+        chunks.load(chunk, chunk_buildings)
+        chunks.last_hot[chunk] = chunks.city.tick - ages.get(chunk, 0)
+    chunks.next_update = chunks.city.tick + meta.get("next_update", 0)
@@ -1,14 +1,20 @@
+import logging
 from collections.abc import Callable
 from dataclasses import dataclass
 
 import pygame
 
+from ..ui.text import text_cache
+from .events import EventQueue, ScheduledEvent
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class GameTime:
     hour: int = 0
     day: int = 1
-    time_scale: float = 1.0  # 1.0 = 1 game hour per real second at 60 FPS
+    time_scale: float = 1.0  # Game hours per real second
 
     @property
     def is_night(self) -> bool:
@@ -26,29 +32,18 @@ class GameTime:
             return "night"
 
 
-@dataclass
-class ScheduledEvent:
-    hour: int
-    callback: Callable
-    recurring: bool = True
-    description: str = ""
-
-
 class TimeSystem:
     def __init__(self):
         self.time = GameTime(
             hour=6,  # Start at 6 AM
             time_scale=0.2,  # 0.2 = 5 real seconds per game hour
         )
-        self.events: list[ScheduledEvent] = []
+        self.events = EventQueue()
         self.accumulated_time = 0.0
-        self.ticks_per_hour = 60  # 60 ticks/hour = 1 tick per frame at 60 FPS
+        # Fixed simulation step: a tick is one game minute, whatever the frame rate
+        self.ticks_per_hour = 60
         self.current_tick = 0
 
-        # Font for rendering time
-        pygame.font.init()
-        self.font = pygame.font.Font(None, 36)
-
     def update(self, delta_time: float):
         """Update game time based on real time passed"""
         # Accumulate time
@@ -58,46 +53,92 @@ class TimeSystem:
         time_per_tick = 1.0 / self.ticks_per_hour
         while self.accumulated_time >= time_per_tick:
             self.accumulated_time -= time_per_tick
-            self._advance_tick()
+            self.advance_tick()
 
-    def _advance_tick(self):
-        """Advance game by one tick"""
+    @property
+    def absolute_tick(self) -> int:
+        """Ticks since midnight on day 1"""
+        hours = (self.time.day - 1) * 24 + self.time.hour
+        return hours * self.ticks_per_hour + self.current_tick
+
+    def ticks_for(self, hours: float = 0.0, minutes: float = 0.0) -> int:
+        """Convert a game duration to a whole number of ticks"""
+        return round((hours + minutes / 60) * self.ticks_per_hour)
+
+    def advance_tick(self):
+        """Advance game by one tick and fire any events due"""
         self.current_tick += 1
         if self.current_tick >= self.ticks_per_hour:
             self.current_tick = 0
             self._advance_hour()
+        self.events.run_due(self.absolute_tick)
 
     def _advance_hour(self):
-        """Advance time by one hour and handle events"""
+        """Advance time by one hour"""
         self.time.hour += 1
         if self.time.hour >= 24:
             self.time.hour = 0
             self.time.day += 1
 
-        print(
-            f"\nDay {self.time.day} - {self.time.hour:02d}:00 ({self.time.time_of_day})"
+        logger.info(
+            "Day %d - %02d:00 (%s)",
+            self.time.day,
+            self.time.hour,
+            self.time.time_of_day,
         )
 
-        # Handle scheduled events
-        self._process_events()
-
-    def _process_events(self):
-        """Process any events scheduled for the current hour"""
-        for event in self.events:
-            if event.hour == self.time.hour:
-                event.callback()
+    def schedule_event(self, event: ScheduledEvent) -> ScheduledEvent:
+        """Schedule an event at its tick or hour, returning it as a handle"""
+        if event.hour is not None:
+            event.tick = self._next_time_of_day(event.hour)
+            event.interval = 24 * self.ticks_per_hour if event.daily else None
+            event.hour = None
+        return self.events.push(event)
+
+    def schedule_in(
+        self,
+        ticks: int,
+        callback: Callable[[], object],
+        interval: int | None = None,
+        description: str = "",
+    ) -> ScheduledEvent:
+        """Schedule a callback `ticks` from now, optionally repeating every `interval`"""
+        return self.events.schedule(
+            self.absolute_tick + max(ticks, 1), callback, interval, description
+        )
 
-    def schedule_event(self, event: ScheduledEvent):
-        """Schedule a new event"""
-        self.events.append(event)
+    def schedule_daily(
+        self,
+        hour: int,
+        callback: Callable[[], object],
+        minute: int = 0,
+        recurring: bool = True,
+        description: str = "",
+    ) -> ScheduledEvent:
+        """Schedule a callback at the next occurrence of a time of day"""
+        return self.events.schedule(
+            self._next_time_of_day(hour, minute),
+            callback,
+            24 * self.ticks_per_hour if recurring else None,
+            description,
+        )
 
-    def render(self, screen: pygame.Surface):
-        """Render current time"""
+    def _next_time_of_day(self, hour: int, minute: int = 0) -> int:
+        """Absolute tick of the next occurrence of a time of day"""
+        day_ticks = 24 * self.ticks_per_hour
+        offset = self.ticks_for(hour, minute) % day_ticks
+        now = self.absolute_tick
+        tick = now - now % day_ticks + offset
+        if tick <= now:
+            tick += day_ticks
+        return tick
+
+    def render(self, screen: pygame.Surface) -> pygame.Rect:
+        """Render current time, returning the area drawn"""
         time_str = (
             f"Day {self.time.day} - {self.time.hour:02d}:00 ({self.time.time_of_day})"
         )
-        text_surface = self.font.render(time_str, True, (0, 0, 0))
-        screen.blit(text_surface, (10, 10))
+        return screen.blit(text_cache.render(time_str, 36), (10, 10))
 
     def get_day_progress(self) -> float:
         """Return progress through the day as a float 0-1"""
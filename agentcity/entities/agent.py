@@ -1,41 +1,64 @@
 import hashlib
+import math
+import sys
+from collections.abc import Sequence
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-import pygame
-
-from ..ai.behaviors import Behavior
+from ..ai.behaviors import Behavior, BehaviorState
 from ..ai.behaviors.needs import EatBehavior, RestBehavior, SocializeBehavior
 from ..ai.behaviors.wandering import WanderingBehavior
-from ..ai.needs import NeedsSystem
+from ..ai.needs import TOLERANCE, NeedsSystem
+from ..engine.rng import RandomStream
+
+if TYPE_CHECKING:
+    from ..world.navigation import Route
+
+# Behaviors every city starts with, in priority order (needs first, then
+# wandering). They hold no per-agent state, so all agents share them
+DEFAULT_BEHAVIORS: tuple[Behavior, ...] = (
+    RestBehavior(),
+    EatBehavior(),
+    SocializeBehavior(),
+    WanderingBehavior(),
+)
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentState:
     position: tuple[float, float]
     current_action: str = "idle"
     destination: tuple[float, float] | None = None
-    speed: float = 3.0  # pixels per tick (180 pixels/sec at 60 FPS)
+    speed: float = 3.0  # Pixels per tick (one game minute), independent of frame rate
+    route: "Route | None" = None  # Way around buildings for this trip, see Navigator
 
 
 class Agent:
+    __slots__ = (
+        "name",
+        "state",
+        "needs",
+        "city",
+        "rng",
+        "active_behavior",
+        "behavior_state",
+        "personality_color",
+    )
+
+    # Temporary visualization, the same for every agent
+    size = 20
+    color = (0, 0, 255)  # Blue
+
     def __init__(self, name: str, position: tuple[float, float], city=None):
-        self.name = name
+        # Names are also held by objects in use and in snapshots; share one copy
+        self.name = sys.intern(name)
         self.state = AgentState(position=position)
         self.needs = NeedsSystem()
         self.city = city
+        self.rng: RandomStream | None = None  # Assigned by the city if not restored
 
-        # Behaviors in priority order (needs first, then wandering)
-        self.behaviors = [
-            RestBehavior(),
-            EatBehavior(),
-            SocializeBehavior(),
-            WanderingBehavior(),
-        ]
         self.active_behavior: Behavior | None = None
-
-        # Temporary visualization
-        self.size = 20
-        self.color = (0, 0, 255)  # Blue
+        self.behavior_state = BehaviorState()
 
         # Customization
         self.personality_color = self._generate_personality_color()
@@ -50,14 +73,36 @@ class Agent:
         b = int(name_hash[4:6], 16)
         return (r, g, b)
 
+    @property
+    def behaviors(self) -> Sequence[Behavior]:
+        """Behaviors to choose from: the city's, or the defaults outside one"""
+        return self.city.behaviors if self.city is not None else DEFAULT_BEHAVIORS
+
+    def wake(self):
+        """Resume polling the agent's behavior, if its city parked it"""
+        if self.city is not None:
+            self.city.wake_agent(self)
+
     def update(self, time_of_day: str, available_buildings: list[str]):
         """Update agent state and behaviors each tick"""
-        # Handle behaviors
+        self.update_behavior()
+        self.move()
+
+    def update_behavior(self):
+        """Update the active behavior, or select a new one if idle"""
         if self.active_behavior:
             # Update current behavior
-            self.active_behavior.update(self)
-            if not self.active_behavior.state.active:
+            behavior = self.active_behavior
+            behavior.update(self)
+            if self.active_behavior is not behavior:
+                return  # Handed over to another behavior, which starts next tick
+            if not self.behavior_state.active:
                 self.active_behavior = None
+            elif self.city is not None:
+                # Stop polling while the behavior is predictably quiet
+                quiet = self.active_behavior.quiet_ticks(self)
+                if quiet > 0:
+                    self.city.park_agent(self, quiet)
         else:
             # Check behaviors in priority order
             highest_priority: float = -1.0  # Allow behaviors with priority 0
@@ -66,22 +111,38 @@ class Agent:
             for behavior in self.behaviors:
                 if behavior.should_activate(self):
                     priority = behavior.get_priority(self)
-                    if priority > highest_priority:
+                    # Near ties go to the first, whatever the rounding
+                    if priority > highest_priority + TOLERANCE:
                         highest_priority = priority
                         selected_behavior = behavior
 
             if selected_behavior:
                 self.active_behavior = selected_behavior
-
-        # Move towards destination if one exists
-        if self.state.destination:
-            dx = self.state.destination[0] - self.state.position[0]
-            dy = self.state.destination[1] - self.state.position[1]
-            distance = (dx**2 + dy**2) ** 0.5
-
-            if distance < self.state.speed:  # Can reach destination in this tick
-                self.state.position = self.state.destination
-                self.state.destination = None
+            elif self.city is not None:
+                # Nothing to do until the first behavior is due to activate
+                predictions = [
+                    behavior.ticks_until_activation(self) for behavior in self.behaviors
+                ]
+                quiet = min((p for p in predictions if p is not None), default=0)
+                if quiet > 0:
+                    self.city.park_agent(self, quiet)
+
+    def move(self):
+        """Move one tick towards the destination, if one exists"""
+        destination = self.state.destination
+        if destination:
+            # Walk around buildings when the city provides navigation
+            target = destination
+            if self.city is not None and self.city.navigation is not None:
+                target = self.city.navigation.steer(self)
+            dx = target[0] - self.state.position[0]
+            dy = target[1] - self.state.position[1]
+            distance = math.sqrt(dx * dx + dy * dy)
+
+            if distance < self.state.speed:  # Can reach target in this tick
+                self.state.position = target
+                if target == destination:
+                    self.state.destination = None
 
             else:
                 # Move one tick's worth of distance
@@ -95,45 +156,6 @@ class Agent:
         self.state.destination = destination
         # Keep the current action, don't override with "moving"
 
-    def render(self, screen: pygame.Surface):
-        """Render the agent"""
-        # Draw agent circle with personality color
-        pygame.draw.circle(
-            screen,
-            self.personality_color,
-            (int(self.state.position[0]), int(self.state.position[1])),
-            self.size,
-        )
-
-        # Draw a smaller inner circle with color based on most urgent need
-        most_urgent_need = self.needs.get_most_urgent_need()
-        inner_color = self._get_need_color(most_urgent_need)
-        pygame.draw.circle(
-            screen,
-            inner_color,
-            (int(self.state.position[0]), int(self.state.position[1])),
-            self.size // 2,
-        )
-
-        # Draw destination if exists
-        if self.state.destination:
-            pygame.draw.circle(
-                screen,
-                (255, 0, 0),  # Red
-                (int(self.state.destination[0]), int(self.state.destination[1])),
-                5,
-                1,  # Line width
-            )
-
-    def _get_need_color(self, need_name: str) -> tuple[int, int, int]:
-        """Get color based on need type"""
-        need_colors = {
-            "energy": (255, 255, 0),  # Yellow
-            "hunger": (255, 165, 0),  # Orange
-            "social": (147, 112, 219),  # Purple
-        }
-        return need_colors.get(need_name, (128, 128, 128))  # Gray for unknown needs
-
     def get_status(self) -> dict:
         """Get a dictionary of the agent's current status"""
         return {
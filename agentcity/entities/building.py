@@ -1,25 +1,49 @@
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import pygame
 
+from ..engine.rng import RandomStream
 from .objects import WorldObject
 
+if TYPE_CHECKING:
+    from ..ui.camera import Camera
 
-@dataclass
+
+@dataclass(slots=True)
 class BuildingType:
     name: str
     color: tuple[int, int, int]
     default_objects: list[str]  # List of object types to place in this building
 
 
+# One shared instance per distinct building type, however buildings were made
+_interned_types: dict[tuple, BuildingType] = {}
+
+
+def intern_building_type(building_type: BuildingType) -> BuildingType:
+    """Return the shared instance equal to `building_type`, registering it if new"""
+    key = (
+        building_type.name,
+        tuple(building_type.color),
+        tuple(building_type.default_objects),
+    )
+    return _interned_types.setdefault(key, building_type)
+
+
 class Building:
+    __slots__ = ("building_type", "position", "size", "rect", "objects", "entrance")
+
     def __init__(
         self,
         building_type: BuildingType,
         position: tuple[float, float],
         size: tuple[float, float],
+        objects: list[WorldObject] | None = None,
+        rng: RandomStream | None = None,
     ):
-        self.building_type = building_type
+        # Types arriving from snapshots or other processes are copies
+        self.building_type = intern_building_type(building_type)
         self.position = position
         self.size = size
         self.rect = pygame.Rect(position[0], position[1], size[0], size[1])
@@ -31,12 +55,17 @@ class Building:
             position[1] + size[1],  # Bottom center
         )
 
-        # Place default objects
-        self._place_default_objects()
+        # Place default objects, unless restoring a building with known contents
+        if objects is not None:
+            self.objects = objects
+        elif rng is not None:
+            self._place_default_objects(rng)
+        else:
+            raise ValueError("a new building needs an rng to place its objects")
 
-    def _place_default_objects(self):
+    def _place_default_objects(self, rng: RandomStream):
         """Place the default objects for this building type"""
-        from random import randint
+        randint = rng.randint
 
         for obj_type in self.building_type.default_objects:
             # Place object at random position within building
@@ -70,19 +99,27 @@ class Building:
     ) -> WorldObject | None:
         """Find an available object that provides the given capability"""
         for obj in self.objects:
-            if any(cap.name == capability for cap in obj.capabilities) and obj.can_use(
-                agent_name
-            ):
+            if capability in obj.capacity and obj.can_use(agent_name, capability):
                 return obj
         return None
 
-    def render(self, screen: pygame.Surface):
-        """Render the building"""
-        pygame.draw.rect(screen, self.building_type.color, self.rect)
+    def render(self, screen: pygame.Surface, camera: "Camera | None" = None):
+        """Render the building, as seen through the camera if one is given"""
+        if camera is None:
+            rect, zoom = self.rect, 1.0
+            to_screen = _to_pixel
+        else:
+            rect, zoom = camera.rect_to_screen(self.rect), camera.zoom
+            to_screen = camera.to_screen
+        pygame.draw.rect(screen, self.building_type.color, rect)
+
+        # Details shrink with the zoom, and are left out once too small to see
+        if zoom < 0.25:
+            return
 
         # Draw entrance point
         pygame.draw.circle(
-            screen, (0, 255, 0), (int(self.entrance[0]), int(self.entrance[1])), 5
+            screen, (0, 255, 0), to_screen(self.entrance), max(1, round(5 * zoom))
         )
 
         # Draw objects (as small circles)
@@ -90,11 +127,15 @@ class Building:
             pygame.draw.circle(
                 screen,
                 (200, 200, 200),  # Light gray
-                (int(obj.position[0]), int(obj.position[1])),
-                3,
+                to_screen(obj.position),
+                max(1, round(3 * zoom)),
             )
 
 
+def _to_pixel(position: tuple[float, float]) -> tuple[int, int]:
+    return (int(position[0]), int(position[1]))
+
+
 # Define common building types with their default objects
 BUILDING_TYPES = {
     "house": BuildingType(
@@ -113,3 +154,6 @@ BUILDING_TYPES = {
         default_objects=["bench", "bench", "trail"],
     ),
 }
+
+for _building_type in BUILDING_TYPES.values():
+    intern_building_type(_building_type)
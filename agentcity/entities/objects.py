@@ -1,7 +1,13 @@
+import sys
+from collections.abc import Callable
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from ..world.capabilities import CapabilityIndex
 
-@dataclass
+
+@dataclass(slots=True)
 class ObjectCapability:
     """A capability that an object provides"""
 
@@ -10,37 +16,125 @@ class ObjectCapability:
     satisfaction_rate: float = 0.0  # How quickly it satisfies needs
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class WorldObject:
-    """An object in the world that provides capabilities"""
+    """An object in the world that provides capabilities
+
+    Each capability has its own capacity. Occupancy is kept in dicts, so
+    reserving, releasing and checking for room are O(1). Agents that find
+    every object taken can line up in a per-capability queue; released slots
+    go to the first agent waiting for that capability, whose callback is
+    then called.
+    """
 
     name: str
     position: tuple[float, float]
     capabilities: list[ObjectCapability]
-    in_use_by: list[str] = field(
-        default_factory=list
-    )  # List of agent names currently using this object
+    # Agent name -> capability it is using, in the order slots were reserved.
+    # Names are unique within a city, see City.add_agent
+    occupants: dict[str, str] = field(default_factory=dict)
+    capability_index: "CapabilityIndex | None" = field(
+        default=None, repr=False
+    )  # Notified when occupancy changes
+    capacity: dict[str, int] = field(init=False, repr=False)
+    in_use: dict[str, int] = field(init=False, repr=False)
+    # Capability -> agent name -> called when the agent is granted a slot
+    waiting: dict[str, dict[str, Callable[[], object]]] = field(init=False, repr=False)
 
     def __post_init__(self):
-        self.in_use_by = self.in_use_by or []
+        self.name = sys.intern(self.name)
+        self.capacity = {}
+        for cap in self.capabilities:
+            self.capacity[cap.name] = self.capacity.get(cap.name, 0) + cap.capacity
+        self.in_use = dict.fromkeys(self.capacity, 0)
+        self.waiting = {}
+        # Agent names are interned, so restored occupancy shares their strings
+        occupants, self.occupants = self.occupants, {}
+        for agent_name, capability in occupants.items():
+            self._add(sys.intern(agent_name), capability)
+
+    def _add(self, agent_name: str, capability: str):
+        self.occupants[agent_name] = capability
+        self.in_use[capability] += 1
 
-    def can_use(self, agent_name: str) -> bool:
+    def _changed(self):
+        if self.capability_index is not None:
+            self.capability_index.update_object(self)
+
+    def has_free_capacity(self, capability: str) -> bool:
+        """Check if at least one more agent can start using a capability"""
+        return self.in_use.get(capability, 0) < self.capacity.get(capability, 0)
+
+    def can_use(self, agent_name: str, capability: str) -> bool:
         """Check if the object can be used by another agent"""
-        if agent_name in self.in_use_by:
+        if agent_name in self.occupants:
             return True
-        return len(self.in_use_by) < sum(cap.capacity for cap in self.capabilities)
+        return self.has_free_capacity(capability)
 
-    def start_using(self, agent_name: str) -> bool:
-        """Start using the object"""
-        if self.can_use(agent_name) and agent_name not in self.in_use_by:
-            self.in_use_by.append(agent_name)
-            return True
-        return False
+    def reserve(self, agent_name: str, capability: str) -> bool:
+        """Claim a slot of a capability for an agent, if one is free"""
+        if agent_name in self.occupants:
+            return False
+        if not self.has_free_capacity(capability):
+            return False
+        self._add(agent_name, capability)
+        self._changed()
+        return True
+
+    def release(self, agent_name: str) -> None:
+        """Give up an agent's slot, or its place in a queue
+
+        A freed slot goes to the first agent waiting for the same capability.
+        """
+        capability = self.occupants.pop(agent_name, None)
+        if capability is not None:
+            self.in_use[capability] -= 1
+            self._grant(capability)
+            self._changed()
+            return
+        for queue in self.waiting.values():
+            queue.pop(agent_name, None)
+
+    def enqueue(
+        self, agent_name: str, capability: str, on_granted: Callable[[], object]
+    ) -> None:
+        """Line up for a capability; `on_granted` is called once a slot is reserved"""
+        self.waiting.setdefault(capability, {})[agent_name] = on_granted
+        if self._grant(capability):
+            self._changed()
+
+    def queue_length(self, capability: str) -> int:
+        return len(self.waiting.get(capability, ()))
+
+    def set_occupants(self, capability: str, agent_names: list[str]) -> None:
+        """Replace the agents using a capability, without granting queued slots"""
+        for agent_name in [
+            name for name, cap in self.occupants.items() if cap == capability
+        ]:
+            del self.occupants[agent_name]
+        self.in_use[capability] = 0
+        for agent_name in agent_names:
+            self._add(agent_name, capability)
+
+    def grant_waiting(self) -> None:
+        """Give every free slot to the agents first in line for it"""
+        granted = False
+        for capability in self.waiting:
+            granted |= self._grant(capability)
+        if granted:
+            self._changed()
 
-    def stop_using(self, agent_name: str) -> None:
-        """Stop using the object"""
-        if agent_name in self.in_use_by:
-            self.in_use_by.remove(agent_name)
+    def _grant(self, capability: str) -> bool:
+        queue = self.waiting.get(capability)
+        granted = False
+        while queue and self.has_free_capacity(capability):
+            agent_name = next(iter(queue))
+            on_granted = queue.pop(agent_name)
+            if agent_name not in self.occupants:
+                self._add(agent_name, capability)
+                granted = True
+                on_granted()
+        return granted
 
 
 # Define common object types and their capabilities
@@ -1,41 +1,85 @@
+import argparse
+import logging
 import traceback
 
 import pygame
 
 from .engine.game import Game, GameConfig
+from .engine.headless import HeadlessSimulation
+from .engine.scheduler import FixedStepScheduler
+from .engine.snapshot import load_snapshot, save_snapshot
 from .engine.time_system import TimeSystem
 from .entities.agent import Agent
+from .ui.camera import Camera
+from .ui.layers import LayeredDisplay
+from .ui.text import text_cache
 from .world.city import City
 
+INITIAL_AGENTS = [
+    ("Alice", (100, 100)),
+    ("Bob", (200, 200)),
+    ("Charlie", (300, 300)),
+    ("Diana", (400, 400)),
+]
+
+# Arrow keys pan by this fraction of the window; each zoom step scales by ZOOM_STEP
+PAN_KEYS = {
+    pygame.K_LEFT: (-0.25, 0.0),
+    pygame.K_RIGHT: (0.25, 0.0),
+    pygame.K_UP: (0.0, -0.25),
+    pygame.K_DOWN: (0.0, 0.25),
+}
+ZOOM_STEP = 1.25
+
+
+def add_initial_agents(city: City, extra: int = 0):
+    """Add some initial agents to the city, plus `extra` at random positions"""
+    for name, pos in INITIAL_AGENTS:
+        city.add_agent(Agent(name, pos))
+    for i in range(extra):
+        city.add_agent(Agent(f"Agent {i}", city.get_random_position()))
+
 
 class AgentCity(Game):
-    def __init__(self):
+    def __init__(
+        self,
+        use_agent_store: bool = False,
+        seed: int | None = None,
+        lazy_needs: bool = False,
+        navigation: bool = False,
+        world_size: tuple[int, int] | None = None,
+        extra_agents: int = 0,
+    ):
         super().__init__(GameConfig(width=800, height=600, title="Agent City"))
 
         # Initialize systems
         self.time_system = TimeSystem()
-        self.city = City(self.config.width, self.config.height)
+        width, height = world_size or (self.config.width, self.config.height)
+        self.city = City(
+            width,
+            height,
+            use_agent_store=use_agent_store,
+            seed=seed,
+            lazy_needs=lazy_needs,
+            navigation=navigation,
+            chunked=world_size is not None,
+        )
+        self.scheduler = FixedStepScheduler(self.time_system, self.city)
+        self.display = LayeredDisplay(self.screen)
+        self.camera = Camera(
+            (self.config.width, self.config.height), (self.city.width, self.city.height)
+        )
+        self.dragging = False
 
         # Add some initial agents
-        self._add_initial_agents()
+        add_initial_agents(self.city, extra_agents)
 
         # Debug flags
         self.show_debug = False
         self.show_stats = False
+        self.show_profiler = False
         self.time_scale = 1.0
 
-    def _add_initial_agents(self):
-        """Add some initial agents to the city"""
-        initial_agents = [
-            ("Alice", (100, 100)),
-            ("Bob", (200, 200)),
-            ("Charlie", (300, 300)),
-            ("Diana", (400, 400)),
-        ]
-
-        for name, pos in initial_agents:
-            self.city.add_agent(Agent(name, pos))
-
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -44,6 +88,21 @@ class AgentCity(Game):
                 self._handle_keypress(event)
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 self._handle_mouse_click(event)
+            elif event.type == pygame.MOUSEBUTTONUP and event.button in (2, 3):
+                self.dragging = False
+            elif event.type == pygame.MOUSEMOTION and self.dragging:
+                # Drag the map along with the mouse
+                self.camera.pan(-event.rel[0], -event.rel[1])
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEORESIZE):
+                self.display.invalidate()
+            elif event.type == pygame.MOUSEWHEEL:
+                mouse = pygame.mouse.get_pos()
+                if self.city.status_table.rect.collidepoint(mouse):
+                    # Scroll the status table
+                    self.city.status_table.scroll_by(-event.y)
+                else:
+                    # Zoom the map around the mouse
+                    self.camera.zoom_by(ZOOM_STEP**event.y, mouse)
 
     def _handle_keypress(self, event):
         if event.key == pygame.K_SPACE:
@@ -55,82 +114,277 @@ class AgentCity(Game):
         elif event.key == pygame.K_s:
             # Toggle stats
             self.show_stats = not self.show_stats
+        elif event.key == pygame.K_f:
+            # Toggle fast-forward (run as many ticks as fit in each frame)
+            self.scheduler.fast_forward = not self.scheduler.fast_forward
+        elif event.key == pygame.K_a:
+            # Filter the status table by action
+            self.city.status_table.cycle_action_filter()
+        elif event.key == pygame.K_PAGEUP:
+            self.city.status_table.scroll_by(-self.city.status_table.max_rows)
+        elif event.key == pygame.K_PAGEDOWN:
+            self.city.status_table.scroll_by(self.city.status_table.max_rows)
+        elif event.key == pygame.K_p:
+            # Toggle the profiler and its timing overlay
+            self.show_profiler = not self.show_profiler
+            self.city.profiler.enabled = self.show_profiler
+        elif event.key in PAN_KEYS:
+            # Pan the map by a fraction of the window
+            dx, dy = PAN_KEYS[event.key]
+            self.camera.pan(dx * self.config.width, dy * self.config.height)
+        elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+            self.camera.zoom_by(ZOOM_STEP)
+        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.camera.zoom_by(1 / ZOOM_STEP)
 
     def _handle_mouse_click(self, event):
+        # Right or middle button drags the map
+        if event.button in (2, 3):
+            self.dragging = True
+            return
+        # Clicks on the status table sort it by the clicked column
+        if event.button != 1 or self.city.status_table.handle_click(event.pos):
+            return
+
         # Send nearest agent to clicked location
-        pos = event.pos
-        if self.city.agents:
-            nearest_agent = min(
-                self.city.agents,
-                key=lambda a: (
-                    (a.state.position[0] - pos[0]) ** 2
-                    + (a.state.position[1] - pos[1]) ** 2
-                ),
-            )
+        pos = self.camera.to_world(event.pos)
+        nearest_agent = self.city.nearest_agent(pos)
+        if nearest_agent is not None:
+            # Its behavior may have been parked on the assumption it stays put
+            self.city.wake_agent(nearest_agent)
             nearest_agent.set_destination(pos)
 
     def update(self):
         delta_time = self.clock.get_time() / 1000.0  # Convert to seconds
 
-        # Update time system
-        self.time_system.update(delta_time * self.time_scale)
+        # Keep the chunks in view loaded, even where no agents are
+        if self.city.chunks is not None:
+            self.city.chunks.focus = [self.camera.view]
 
-        # Update city and agents using game time
-        self.city.update(
-            time_of_day=self.time_system.time.time_of_day,
-            current_hour=self.time_system.time.hour,
-            ticks_per_hour=self.time_system.ticks_per_hour,
-        )
+        # Advance time and the city together in fixed ticks
+        self.scheduler.update(delta_time * self.time_scale)
 
-    def render(self):
+    def _render_background(self, surface: pygame.Surface):
         # Clear screen with sky color
         sky_color = (
             (150, 200, 255) if not self.time_system.time.is_night else (20, 20, 50)
         )
-        self.screen.fill(sky_color)
+        surface.fill(sky_color)
+        self.city.render_static(surface, self.camera)
+
+    def render(self):
+        # Restore the cached sky and buildings under last frame's drawing
+        background_key = (
+            self.time_system.time.is_night,
+            self.city.layout_version,
+            self.camera.key,
+        )
+        self.display.begin_frame(background_key, self._render_background)
 
         # Render city
-        self.city.render(self.screen)
+        with self.city.profiler.section("city.render", len(self.city.agents)):
+            dirty = self.city.render(self.screen, self.camera)
 
         # Render time
-        self.time_system.render(self.screen)
+        dirty.append(self.time_system.render(self.screen))
 
         # Render debug info if enabled
         if self.show_debug:
-            self._render_debug_info()
+            dirty.extend(self._render_debug_info())
 
         # Render stats if enabled
         if self.show_stats:
-            self._render_stats()
+            dirty.extend(self._render_stats())
 
-        pygame.display.flip()
+        # Render profiler timings if enabled
+        if self.show_profiler:
+            y = 40 + 20 * len(self.city.get_building_stats()) if self.show_stats else 40
+            dirty.append(self.city.profiler.render(self.screen, y))
 
-    def _render_debug_info(self):
-        font = pygame.font.Font(None, 24)
+        self.display.end_frame(dirty)
+
+    def _render_debug_info(self) -> list[pygame.Rect]:
+        dirty = []
         y = 40  # Start below time display
 
         for agent in self.city.agents:
             status = agent.get_status()
-            text = f"{status['name']}: {status['action']} - {status['needs']}"
-            text_surface = font.render(text, True, (0, 0, 0))
-            self.screen.blit(text_surface, (10, y))
+            # Round needs so the line is only re-rendered when a shown value changes
+            needs = {name: round(value, 1) for name, value in status["needs"].items()}
+            text = f"{status['name']}: {status['action']} - {needs}"
+            dirty.append(self.screen.blit(text_cache.render(text), (10, y)))
             y += 20
+        return dirty
 
-    def _render_stats(self):
-        font = pygame.font.Font(None, 24)
+    def _render_stats(self) -> list[pygame.Rect]:
+        dirty = []
         stats = self.city.get_building_stats()
         y = 40
 
         for building_type, count in stats.items():
             text = f"{building_type}: {count}"
-            text_surface = font.render(text, True, (0, 0, 0))
-            self.screen.blit(text_surface, (self.config.width - 150, y))
+            surface = text_cache.render(text)
+            dirty.append(self.screen.blit(surface, (self.config.width - 150, y)))
             y += 20
+        return dirty
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Agent City simulation")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run the simulation without a display, as fast as possible",
+    )
+    parser.add_argument(
+        "--ticks",
+        type=int,
+        help="Number of ticks to simulate in headless mode (default: one day)",
+    )
+    parser.add_argument(
+        "--agent-store",
+        action="store_true",
+        help="Keep agent state in columnar NumPy arrays (requires numpy)",
+    )
+    parser.add_argument(
+        "--lazy-needs",
+        action="store_true",
+        help="Evaluate needs in closed form instead of stepping them every tick",
+    )
+    parser.add_argument(
+        "--navigation",
+        action="store_true",
+        help="Route agents around buildings instead of walking in straight lines",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        help="Split a headless city into this many regions simulated in parallel",
+    )
+    parser.add_argument(
+        "--barrier-ticks",
+        type=int,
+        help="Ticks each shard runs between synchronization barriers",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Seed for all randomness; the same seed gives identical runs",
+    )
+    parser.add_argument(
+        "--world-size",
+        type=int,
+        nargs=2,
+        metavar=("WIDTH", "HEIGHT"),
+        help="Generate a city this many pixels across, loaded in chunks near agents",
+    )
+    parser.add_argument(
+        "--agents",
+        type=int,
+        default=0,
+        help="Extra agents to place at random positions",
+    )
+    parser.add_argument(
+        "--load",
+        metavar="PATH",
+        help="Resume a headless run from a snapshot file",
+    )
+    parser.add_argument(
+        "--save",
+        metavar="PATH",
+        help="Write a snapshot of the full simulation state after a headless run",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Profile a headless run and write a Chrome trace (chrome://tracing)",
+    )
+    args = parser.parse_args(argv)
+    headless_only = {
+        "--ticks": args.ticks,
+        "--shards": args.shards,
+        "--barrier-ticks": args.barrier_ticks,
+        "--load": args.load,
+        "--save": args.save,
+        "--profile": args.profile,
+    }
+    given = [option for option, value in headless_only.items() if value is not None]
+    if given and not args.headless:
+        parser.error(f"{', '.join(given)} can only be used with --headless")
+    if args.ticks is None:
+        args.ticks = 24 * 60
+    if args.shards is None:
+        args.shards = 1
+    if args.barrier_ticks is None:
+        args.barrier_ticks = 1
+    if args.agent_store and args.lazy_needs:
+        parser.error("--lazy-needs can't be combined with --agent-store")
+    if args.world_size and args.shards > 1:
+        parser.error("--world-size can't be combined with --shards")
+    return args
 
 
-def main():
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    # The hour of day is logged as it passes; headless runs only report errors
+    logging.basicConfig(
+        format="%(message)s", level=logging.WARNING if args.headless else logging.INFO
+    )
+    if args.headless:
+        if args.load:
+            city, time_system = load_snapshot(
+                args.load, args.agent_store, args.lazy_needs, args.navigation
+            )
+            sim = HeadlessSimulation(
+                use_agent_store=args.agent_store,
+                lazy_needs=args.lazy_needs,
+                shards=args.shards,
+                ticks_per_barrier=args.barrier_ticks,
+                city=city,
+                time_system=time_system,
+            )
+        else:
+            city = None
+            if args.world_size:
+                city = City(
+                    width=args.world_size[0],
+                    height=args.world_size[1],
+                    use_agent_store=args.agent_store,
+                    seed=args.seed,
+                    lazy_needs=args.lazy_needs,
+                    navigation=args.navigation,
+                    chunked=True,
+                )
+            sim = HeadlessSimulation(
+                use_agent_store=args.agent_store,
+                lazy_needs=args.lazy_needs,
+                shards=args.shards,
+                ticks_per_barrier=args.barrier_ticks,
+                city=city,
+                seed=args.seed,
+                navigation=args.navigation,
+            )
+            add_initial_agents(sim.city, args.agents)
+        if args.profile:
+            sim.city.profiler.enabled = True
+        sim.run(args.ticks)
+        if args.profile:
+            sim.city.profiler.export_chrome_trace(args.profile)
+            print(f"Wrote profile trace to {args.profile}")
+        if args.save:
+            save_snapshot(args.save, sim.city, sim.time_system)
+            print(f"Saved snapshot to {args.save}")
+        return
+
     try:
-        game = AgentCity()
+        game = AgentCity(
+            use_agent_store=args.agent_store,
+            seed=args.seed,
+            lazy_needs=args.lazy_needs,
+            navigation=args.navigation,
+            world_size=args.world_size,
+            extra_agents=args.agents,
+        )
         game.run()
     except Exception as e:
         print("Error occurred:", str(e))
@@ -0,0 +1,229 @@
+from collections import OrderedDict
+from collections.abc import Iterable
+from enum import IntEnum
+
+import pygame
+
+from ..entities.agent import Agent
+from ..world.agent_store import AgentStore, np
+from .camera import Camera
+
+Color = tuple[int, int, int]
+
+NEED_COLORS: dict[str, Color] = {
+    "energy": (255, 255, 0),  # Yellow
+    "hunger": (255, 165, 0),  # Orange
+    "social": (147, 112, 219),  # Purple
+}
+UNKNOWN_NEED_COLOR = (128, 128, 128)  # Gray
+DESTINATION_COLOR = (255, 0, 0)  # Red
+
+# Sprites use a color key rather than per-pixel alpha, which blits much faster
+TRANSPARENT = (255, 0, 255)
+
+
+class Detail(IntEnum):
+    FULL = 0  # Body, urgent-need dot and destination marker
+    SIMPLE = 1  # Body only, with colors quantized to share sprites
+    DENSITY = 2  # Agent counts aggregated into tiles
+
+
+class AgentRenderer:
+    """Draws agents from pre-rendered sprites with a single `blits` call
+
+    Sprites are cached per personality color, urgent need and size. As agents
+    per screen area grow, detail drops: first the need dot and destination
+    markers go, then agents are aggregated into shaded density tiles.
+    """
+
+    def __init__(
+        self,
+        radius: int = 20,
+        full_density: float = 1_000,  # Agents per megapixel
+        simple_density: float = 10_000,
+        tile_size: int = 16,
+        max_sprites: int = 4096,
+    ):
+        self.radius = radius
+        self.full_density = full_density
+        self.simple_density = simple_density
+        self.tile_size = tile_size
+        self.max_sprites = max_sprites
+        self.sprites: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.detail = Detail.FULL
+
+    def level_of_detail(self, agent_count: int, screen: pygame.Surface) -> Detail:
+        width, height = screen.get_size()
+        density = agent_count * 1e6 / max(width * height, 1)
+        if density <= self.full_density:
+            return Detail.FULL
+        if density <= self.simple_density:
+            return Detail.SIMPLE
+        return Detail.DENSITY
+
+    def _new_sprite(self, size: int) -> pygame.Surface:
+        sprite = pygame.Surface((size, size))
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        sprite.fill(TRANSPARENT)
+        sprite.set_colorkey(TRANSPARENT, pygame.RLEACCEL)
+        return sprite
+
+    def sprite(
+        self, color: Color, need: str | None, radius: int | None = None
+    ) -> pygame.Surface:
+        """Get the agent sprite for a color and urgent need (None for no dot)"""
+        r = self.radius if radius is None else radius
+        key = (color, need, r)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+
+        sprite = self._new_sprite(2 * r + 1)
+        pygame.draw.circle(sprite, color, (r, r), r)
+        if need is not None:
+            inner_color = NEED_COLORS.get(need, UNKNOWN_NEED_COLOR)
+            pygame.draw.circle(sprite, inner_color, (r, r), r // 2)
+
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_sprites:
+            self.sprites.popitem(last=False)
+        return sprite
+
+    def destination_sprite(self) -> pygame.Surface:
+        sprite = self.sprites.get(("destination",))
+        if sprite is None:
+            sprite = self._new_sprite(11)
+            pygame.draw.circle(sprite, DESTINATION_COLOR, (5, 5), 5, 1)
+            self.sprites[("destination",)] = sprite
+        return sprite
+
+    def tile_sprite(self, level: int) -> pygame.Surface:
+        """Get the density tile for a shade level from 1 (sparse) to 8 (dense)"""
+        key = ("tile", level)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((self.tile_size, self.tile_size))
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            # Yellow for sparse tiles through to red for dense ones
+            sprite.fill((255, 255 - level * 28, 0))
+            self.sprites[key] = sprite
+        return sprite
+
+    def render(
+        self,
+        screen: pygame.Surface,
+        agents: list[Agent],
+        store: AgentStore | None = None,
+        camera: Camera | None = None,
+    ) -> list[pygame.Rect]:
+        """Render the given agents, returning the areas drawn
+
+        With a camera, agents are drawn where it shows them and scaled by its
+        zoom; the caller passes just the agents in its view.
+        """
+        self.detail = self.level_of_detail(len(agents), screen)
+        if camera is None:
+            x, y, zoom = 0.0, 0.0, 1.0
+        else:
+            x, y, zoom = camera.x, camera.y, camera.zoom
+        rows = None
+        if store is not None and np is not None:
+            # Read positions and urgent needs straight from the store's arrays
+            rows = store.rows_of(agents)
+        if self.detail == Detail.DENSITY:
+            return self._render_density(screen, agents, store, rows, x, y, zoom)
+
+        r = max(2, round(self.radius * zoom))
+        if store is not None and rows is not None:
+            positions = (((store.positions[rows] - (x, y)) * zoom) - r).astype(int)
+            positions = positions.tolist()
+            if self.detail == Detail.FULL:
+                need_names = store.need_names
+                urgent = [
+                    need_names[col] for col in store.needs[rows].argmin(axis=1).tolist()
+                ]
+        else:
+            positions = [
+                (int((px - x) * zoom) - r, int((py - y) * zoom) - r)
+                for px, py in (agent.state.position for agent in agents)
+            ]
+            if self.detail == Detail.FULL:
+                urgent = [agent.needs.get_most_urgent_need() for agent in agents]
+
+        sprite = self.sprite
+        if self.detail == Detail.FULL:
+            sequence = [
+                (sprite(agent.personality_color, need, r), position)
+                for agent, need, position in zip(agents, urgent, positions)
+            ]
+            marker = self.destination_sprite()
+            sequence.extend(
+                (
+                    marker,
+                    (
+                        int((destination[0] - x) * zoom) - 5,
+                        int((destination[1] - y) * zoom) - 5,
+                    ),
+                )
+                for agent in agents
+                if (destination := agent.state.destination)
+            )
+        else:
+            # Quantize colors to 3 bits per channel so agents share sprites
+            sequence = [
+                (sprite(_quantize(agent.personality_color), None, r), position)
+                for agent, position in zip(agents, positions)
+            ]
+        return screen.blits(sequence)
+
+    def _render_density(
+        self,
+        screen: pygame.Surface,
+        agents: list[Agent],
+        store: AgentStore | None,
+        rows: "np.ndarray | None",
+        x: float,
+        y: float,
+        zoom: float,
+    ) -> list[pygame.Rect]:
+        size = self.tile_size
+        tile_counts: Iterable[tuple[tuple[int, int], int]]
+        if store is not None and rows is not None:
+            # Count agents per on-screen tile with a single bincount
+            columns = screen.get_width() // size + 1
+            rows_on_screen = screen.get_height() // size + 1
+            tiles = (((store.positions[rows] - (x, y)) * zoom) // size).astype(int)
+            on_screen = (
+                (tiles[:, 0] >= 0)
+                & (tiles[:, 0] < columns)
+                & (tiles[:, 1] >= 0)
+                & (tiles[:, 1] < rows_on_screen)
+            )
+            tiles = tiles[on_screen]
+            counts = np.bincount(tiles[:, 1] * columns + tiles[:, 0])
+            occupied = np.flatnonzero(counts)
+            tile_counts = zip(
+                zip((occupied % columns).tolist(), (occupied // columns).tolist()),
+                counts[occupied].tolist(),
+            )
+        else:
+            counts_by_tile: dict[tuple[int, int], int] = {}
+            for agent in agents:
+                px, py = agent.state.position
+                tile = (int((px - x) * zoom // size), int((py - y) * zoom // size))
+                counts_by_tile[tile] = counts_by_tile.get(tile, 0) + 1
+            tile_counts = counts_by_tile.items()
+
+        sequence = [
+            (self.tile_sprite(min(8, count)), (tx * size, ty * size))
+            for (tx, ty), count in tile_counts
+        ]
+        return screen.blits(sequence)
+
+
+def _quantize(color: Color) -> Color:
+    r, g, b = color
+    return (r & 0xE0, g & 0xE0, b & 0xE0)
@@ -0,0 +1,96 @@
+import math
+
+import pygame
+
+
+class Camera:
+    """Viewport onto the city that can be panned and zoomed
+
+    The camera maps world coordinates to the screen: the world point at
+    (`x`, `y`) is drawn at the top-left corner of the viewport, and one world
+    pixel covers `zoom` screen pixels. The view is kept within the world, or
+    centered on it when the whole world fits on screen.
+    """
+
+    def __init__(
+        self,
+        viewport: tuple[int, int],
+        world: tuple[int, int],
+        zoom: float = 1.0,
+        min_zoom: float = 0.05,
+        max_zoom: float = 4.0,
+    ):
+        self.viewport_width, self.viewport_height = viewport
+        self.world_width, self.world_height = world
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.zoom = min(max(zoom, min_zoom), max_zoom)
+        self.x = 0.0
+        self.y = 0.0
+        self._clamp()
+
+    @property
+    def key(self) -> tuple[float, float, float]:
+        """Changes whenever the view does, for caching what was drawn with it"""
+        return (self.x, self.y, self.zoom)
+
+    @property
+    def view(self) -> pygame.Rect:
+        """The part of the world on screen, rounded outwards to whole pixels"""
+        left, top = math.floor(self.x), math.floor(self.y)
+        right = math.ceil(self.x + self.viewport_width / self.zoom)
+        bottom = math.ceil(self.y + self.viewport_height / self.zoom)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def to_screen(self, position: tuple[float, float]) -> tuple[int, int]:
+        return (
+            int((position[0] - self.x) * self.zoom),
+            int((position[1] - self.y) * self.zoom),
+        )
+
+    def to_world(self, position: tuple[float, float]) -> tuple[float, float]:
+        return (
+            position[0] / self.zoom + self.x,
+            position[1] / self.zoom + self.y,
+        )
+
+    def rect_to_screen(self, rect: pygame.Rect) -> pygame.Rect:
+        left, top = self.to_screen(rect.topleft)
+        right, bottom = self.to_screen(rect.bottomright)
+        return pygame.Rect(left, top, max(right - left, 1), max(bottom - top, 1))
+
+    def pan(self, dx: float, dy: float):
+        """Move the view by a distance in screen pixels"""
+        self.x += dx / self.zoom
+        self.y += dy / self.zoom
+        self._clamp()
+
+    def zoom_by(self, factor: float, anchor: tuple[float, float] | None = None):
+        """Scale the zoom, keeping the world point under `anchor` in place
+
+        The anchor is a screen position and defaults to the viewport center.
+        """
+        if anchor is None:
+            anchor = (self.viewport_width / 2, self.viewport_height / 2)
+        world_x, world_y = self.to_world(anchor)
+        self.zoom = min(max(self.zoom * factor, self.min_zoom), self.max_zoom)
+        self.x = world_x - anchor[0] / self.zoom
+        self.y = world_y - anchor[1] / self.zoom
+        self._clamp()
+
+    def center_on(self, position: tuple[float, float]):
+        self.x = position[0] - self.viewport_width / 2 / self.zoom
+        self.y = position[1] - self.viewport_height / 2 / self.zoom
+        self._clamp()
+
+    def _clamp(self):
+        view_width = self.viewport_width / self.zoom
+        view_height = self.viewport_height / self.zoom
+        self.x = _clamp_axis(self.x, view_width, self.world_width)
+        self.y = _clamp_axis(self.y, view_height, self.world_height)
+
+
+def _clamp_axis(start: float, view: float, world: float) -> float:
+    if view >= world:
+        return (world - view) / 2
+    return min(max(start, 0.0), world - view)
@@ -0,0 +1,52 @@
+from collections.abc import Callable, Hashable
+
+import pygame
+
+
+class LayeredDisplay:
+    """Draws moving content over a cached static background
+
+    The background is drawn once into an offscreen surface and only redrawn
+    when its key changes (e.g. buildings were added or night fell). Each frame
+    restores the background under whatever was drawn the frame before, and
+    only the restored and newly drawn areas are sent to the display. Frames
+    with more dirty areas than `max_dirty_rects` update the whole display.
+    """
+
+    def __init__(self, screen: pygame.Surface, max_dirty_rects: int = 256):
+        self.screen = screen
+        self.max_dirty_rects = max_dirty_rects
+        self.background: pygame.Surface | None = None
+        self.background_key: Hashable = None
+        self._previous: list[pygame.Rect] = []
+        self._full_update = True
+
+    def invalidate(self):
+        """Redraw and update the whole display on the next frame"""
+        self._full_update = True
+
+    def begin_frame(
+        self, key: Hashable, draw_background: Callable[[pygame.Surface], None]
+    ):
+        """Restore the background, rebuilding it first if `key` changed"""
+        if self.background is None or key != self.background_key:
+            self.background = pygame.Surface(self.screen.get_size())
+            draw_background(self.background)
+            self.background_key = key
+            self._full_update = True
+
+        if self._full_update:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self._previous:
+                self.screen.blit(self.background, rect, rect)
+
+    def end_frame(self, dirty: list[pygame.Rect]):
+        """Send the areas drawn this frame and last frame to the display"""
+        if self._full_update or len(dirty) + len(self._previous) > self.max_dirty_rects:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._previous + dirty)
+        self._previous = dirty
+        # Restoring many small areas is slower than one full background blit
+        self._full_update = len(dirty) > self.max_dirty_rects
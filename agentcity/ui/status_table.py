@@ -0,0 +1,194 @@
+import heapq
+import time
+from bisect import insort
+from collections.abc import Callable
+from typing import Any
+
+import pygame
+
+from ..entities.agent import Agent
+from .text import text_cache
+
+COLUMNS = ("name", "action", "energy", "hunger", "social")
+HEADERS = ("Name", "Action", "Energy", "Hunger", "Social")
+
+SORT_KEYS: dict[str, Callable[[Agent], Any]] = {
+    "name": lambda agent: agent.name,
+    "action": lambda agent: agent.state.current_action,
+    "energy": lambda agent: agent.needs.needs["energy"].current,
+    "hunger": lambda agent: agent.needs.needs["hunger"].current,
+    "social": lambda agent: agent.needs.needs["social"].current,
+}
+
+
+class StatusTable:
+    """Agent status table that only draws the rows in view
+
+    Agents are kept in name order as they are added, so sorting by name
+    costs nothing. For columns that change every tick (or while filtering by
+    action) only the rows up to the end of the view are selected, with a
+    partial heap sort, at most once per `resort_interval` seconds. Drawing
+    only touches the visible rows, so the per-frame cost depends on the
+    viewport rather than the population.
+    """
+
+    def __init__(
+        self,
+        max_rows: int = 10,
+        row_height: int = 25,
+        col_widths: tuple[int, ...] = (80, 120, 80, 80, 80),
+        resort_interval: float = 0.5,
+    ):
+        self.max_rows = max_rows
+        self.row_height = row_height
+        self.col_widths = col_widths
+        self.resort_interval = resort_interval
+
+        self.agents: list[Agent] = []  # All agents, in name order
+        self.visible: list[Agent] = []  # Rows in view, in sort order
+        self.row_count = 0  # Agents passing the filter
+        self.sort_column = "name"
+        self.descending = False
+        self.action_filter: str | None = None
+        self.scroll = 0  # Index of the first visible row
+
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self._dirty = True
+        self._last_refresh = 0.0
+
+    def add(self, agent: Agent):
+        insort(self.agents, agent, key=SORT_KEYS["name"])
+        self._dirty = True
+
+    def remove(self, agent: Agent):
+        self.agents.remove(agent)
+        self._dirty = True
+
+    def sort_by(self, column: str):
+        """Sort by a column, reversing the order if it is already sorted by it"""
+        if column == self.sort_column:
+            self.descending = not self.descending
+        else:
+            self.sort_column = column
+            self.descending = False
+        self._dirty = True
+
+    def cycle_action_filter(self):
+        """Show only agents doing the next action in turn, then all agents again"""
+        actions = sorted({agent.state.current_action for agent in self.agents})
+        if self.action_filter in actions:
+            index = actions.index(self.action_filter) + 1
+            self.action_filter = actions[index] if index < len(actions) else None
+        else:
+            self.action_filter = actions[0] if actions else None
+        self.scroll = 0
+        self._dirty = True
+
+    def scroll_by(self, rows: int):
+        scroll = max(0, min(self.scroll + rows, self.row_count - self.max_rows))
+        if scroll != self.scroll:
+            self.scroll = scroll
+            self._dirty = True
+
+    def refresh(self):
+        """Select the rows in view again if they may be out of date"""
+        now = time.monotonic()
+        changing = self.sort_column != "name" or self.action_filter is not None
+        if not self._dirty and not (
+            changing and now - self._last_refresh >= self.resort_interval
+        ):
+            return
+
+        rows = self.agents
+        if self.action_filter is not None:
+            rows = [
+                agent
+                for agent in rows
+                if agent.state.current_action == self.action_filter
+            ]
+        self.row_count = len(rows)
+        self.scroll = max(0, min(self.scroll, self.row_count - self.max_rows))
+        end = self.scroll + self.max_rows
+
+        if self.sort_column == "name":
+            # Already in name order, so the view is a slice from either end
+            if self.descending:
+                start = max(0, self.row_count - end)
+                window = rows[start : self.row_count - self.scroll][::-1]
+            else:
+                window = rows[self.scroll : end]
+        else:
+            # Order just the rows up to the end of the view
+            select = heapq.nlargest if self.descending else heapq.nsmallest
+            window = select(end, rows, key=SORT_KEYS[self.sort_column])
+            window = window[self.scroll :]
+        self.visible = window
+        self._dirty = False
+        self._last_refresh = now
+
+    def handle_click(self, pos: tuple[int, int]) -> bool:
+        """Handle a click, returning whether it was on the table"""
+        if not self.rect.collidepoint(pos):
+            return False
+        if pos[1] < self.rect.y + self.row_height:
+            column_x = self.rect.x
+            for column, width in zip(COLUMNS, self.col_widths):
+                if pos[0] < column_x + width:
+                    self.sort_by(column)
+                    break
+                column_x += width
+        return True
+
+    def render(self, screen: pygame.Surface) -> pygame.Rect:
+        """Render the visible rows at the bottom left of the screen"""
+        self.refresh()
+
+        visible = self.visible
+        table_width = sum(self.col_widths)
+        height = (len(visible) + 2) * self.row_height
+        x = 10
+        y = screen.get_height() - height - 10
+        self.rect = pygame.Rect(x, y, table_width, height)
+
+        # Draw header, marking the sort column
+        current_x = x
+        for column, header, width in zip(COLUMNS, HEADERS, self.col_widths):
+            if column == self.sort_column:
+                header += " v" if self.descending else " ^"
+            screen.blit(text_cache.render(header), (current_x, y))
+            current_x += width
+
+        # Draw visible agent rows
+        for i, agent in enumerate(visible):
+            status = agent.get_status()
+            y_pos = y + (i + 1) * self.row_height
+
+            # Draw row background (alternating colors)
+            row_rect = pygame.Rect(x, y_pos, table_width, self.row_height)
+            shade = (240, 240, 240) if (self.scroll + i) % 2 == 0 else (220, 220, 220)
+            pygame.draw.rect(screen, shade, row_rect)
+
+            # Draw cells
+            cells = [
+                status["name"],
+                status["action"],
+                f"{status['needs']['energy']:.1f}",
+                f"{status['needs']['hunger']:.1f}",
+                f"{status['needs']['social']:.1f}",
+            ]
+
+            current_x = x
+            for cell, width in zip(cells, self.col_widths):
+                # +5 for vertical centering
+                screen.blit(text_cache.render(cell), (current_x, y_pos + 5))
+                current_x += width
+
+        # Draw footer with the visible range and filter
+        first = self.scroll + 1 if visible else 0
+        footer = (
+            f"{first}-{self.scroll + len(visible)} of {self.row_count}"
+            f"  filter: {self.action_filter or 'all'}"
+        )
+        footer_y = y + (len(visible) + 1) * self.row_height + 5
+        footer_rect = screen.blit(text_cache.render(footer), (x, footer_y))
+        return self.rect.union(footer_rect)
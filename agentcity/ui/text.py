@@ -0,0 +1,62 @@
+from collections import OrderedDict
+
+import pygame
+
+Color = tuple[int, int, int]
+
+
+class TextCache:
+    """Shared fonts and an LRU cache of rendered text surfaces
+
+    Surfaces are keyed by (text, size, color), so a label is only rendered
+    again when its formatted value changes. The least recently used surfaces
+    are dropped once their pixel data exceeds `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.fonts: dict[int, pygame.font.Font] = {}
+        self.surfaces: OrderedDict[tuple[str, int, Color], pygame.Surface] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size: int) -> pygame.font.Font:
+        """Get the shared default font at the given size"""
+        font = self.fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def render(
+        self, text: str, size: int = 24, color: Color = (0, 0, 0)
+    ) -> pygame.Surface:
+        """Get the rendered surface for a string, rendering it on a cache miss"""
+        key = (text, size, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.font(size).render(text, True, color)
+        self.surfaces[key] = surface
+        self.bytes += surface.get_pitch() * surface.get_height()
+        while self.bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.bytes -= evicted.get_pitch() * evicted.get_height()
+        return surface
+
+    def clear(self):
+        """Drop all cached surfaces"""
+        self.surfaces.clear()
+        self.bytes = 0
+
+
+# Shared by everything drawn on the main window
+text_cache = TextCache()
@@ -0,0 +1,307 @@
+from typing import TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None  # type: ignore[assignment]
+
+from ..ai.needs import Need
+from ..entities.agent import AgentState
+
+if TYPE_CHECKING:
+    from ..entities.agent import Agent
+    from .navigation import Route
+
+NEED_NAMES = ("energy", "hunger", "social")
+
+COLUMNS = (
+    "positions",
+    "destinations",
+    "has_destination",
+    "targets",
+    "target_cells",
+    "speeds",
+    "needs",
+    "decay_rates",
+    "satisfaction_rates",
+    "dormant",
+)
+
+
+class AgentStateView:
+    """Drop-in replacement for `AgentState` backed by a row of an `AgentStore`"""
+
+    __slots__ = ("_store", "_row", "current_action", "route", "needs")
+
+    def __init__(self, store: "AgentStore", row: int, current_action: str):
+        self._store = store
+        self._row = row
+        self.current_action = current_action
+        self.route: Route | None = None
+        self.needs: list[NeedView] = []  # Views onto the same row's need cells
+
+    def rebind(self, row: int):
+        """Point this view and its need views at another row"""
+        self._row = row
+        for need in self.needs:
+            need._row = row
+
+    @property
+    def position(self) -> tuple[float, float]:
+        x, y = self._store.positions[self._row]
+        return (float(x), float(y))
+
+    @position.setter
+    def position(self, value: tuple[float, float]):
+        self._store.positions[self._row] = value
+
+    @property
+    def destination(self) -> tuple[float, float] | None:
+        if not self._store.has_destination[self._row]:
+            return None
+        x, y = self._store.destinations[self._row]
+        return (float(x), float(y))
+
+    @destination.setter
+    def destination(self, value: tuple[float, float] | None):
+        # Steer again on the next tick, even without changing cells
+        self._store.target_cells[self._row] = -1
+        if value is None:
+            self._store.has_destination[self._row] = False
+        else:
+            self._store.destinations[self._row] = value
+            self._store.has_destination[self._row] = True
+
+    @property
+    def speed(self) -> float:
+        return float(self._store.speeds[self._row])
+
+    @speed.setter
+    def speed(self, value: float):
+        self._store.speeds[self._row] = value
+
+
+class NeedView:
+    """Drop-in replacement for `Need` backed by a cell of an `AgentStore`"""
+
+    __slots__ = ("_store", "_row", "_col", "critical_threshold")
+
+    def __init__(
+        self, store: "AgentStore", row: int, col: int, critical_threshold: float
+    ):
+        self._store = store
+        self._row = row
+        self._col = col
+        self.critical_threshold = critical_threshold
+
+    @property
+    def current(self) -> float:
+        return float(self._store.needs[self._row, self._col])
+
+    @current.setter
+    def current(self, value: float):
+        self._store.needs[self._row, self._col] = value
+
+    @property
+    def decay_rate(self) -> float:
+        return float(self._store.decay_rates[self._row, self._col])
+
+    @decay_rate.setter
+    def decay_rate(self, value: float):
+        self._store.decay_rates[self._row, self._col] = value
+
+    def update(self, delta_time: float):
+        """No-op: decay is applied to the whole store by `AgentStore.decay_needs`"""
+
+    @property
+    def is_critical(self) -> bool:
+        return self.current <= self.critical_threshold
+
+
+class AgentStore:
+    """Contiguous position, destination, speed and need arrays for all agents
+
+    Attached agents have their `state` and needs replaced by thin views onto
+    their row, so behavior code keeps working unchanged while need decay,
+    clamping and movement run as whole-population array operations.
+    """
+
+    def __init__(self, capacity: int = 1024, need_names: tuple[str, ...] = NEED_NAMES):
+        if np is None:
+            raise ImportError("AgentStore requires numpy (pip install numpy)")
+
+        self.need_names = need_names
+        self.need_columns = {name: col for col, name in enumerate(need_names)}
+        self.count = 0
+        self.agents: list[Agent] = []  # Row index -> agent
+        self.views: list[AgentStateView] = []  # Row index -> the agent's state view
+        self.rows: dict[Agent, int] = {}
+
+        self.positions = np.zeros((capacity, 2))
+        self.destinations = np.zeros((capacity, 2))
+        self.has_destination = np.zeros(capacity, dtype=bool)
+        # Points to walk towards this tick when navigating, and the cell each
+        # was steered from (-1 to steer again), see Navigator.steer_store
+        self.targets = np.zeros((capacity, 2))
+        self.target_cells = np.full(capacity, -1, dtype=np.int64)
+        self.target_version = -1
+        self.speeds = np.zeros(capacity)
+        self.needs = np.zeros((capacity, len(need_names)))
+        self.decay_rates = np.zeros((capacity, len(need_names)))
+        # Per-hour gains applied in bulk to dormant agents using an object
+        self.satisfaction_rates = np.zeros((capacity, len(need_names)))
+        self.dormant = np.zeros(capacity, dtype=bool)
+        self.dormant_count = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self.speeds)
+
+    def _grow(self):
+        """Double the capacity of every column"""
+        new_capacity = self.capacity * 2
+        for attr in COLUMNS:
+            old = getattr(self, attr)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, attr, new)
+
+    def attach(self, agent: "Agent") -> int:
+        """Move an agent's state into the store and replace it with views"""
+        if self.count == self.capacity:
+            self._grow()
+        row = self.count
+        self.count += 1
+        self.agents.append(agent)
+        self.rows[agent] = row
+
+        state = agent.state
+        view = AgentStateView(self, row, state.current_action)
+        view.position = state.position
+        view.destination = state.destination
+        view.speed = state.speed
+        view.route = state.route
+        agent.state = view  # type: ignore[assignment]
+        self.views.append(view)
+
+        needs = agent.needs.needs
+        for name, need in needs.items():
+            col = self.need_columns[name]
+            self.needs[row, col] = need.current
+            self.decay_rates[row, col] = need.decay_rate
+            need_view = NeedView(self, row, col, need.critical_threshold)
+            view.needs.append(need_view)
+            needs[name] = need_view  # type: ignore[assignment]
+        return row
+
+    def detach(self, agent: "Agent"):
+        """Remove an agent from the store, giving it back plain state objects"""
+        row = self.rows.pop(agent)
+        view = self.views[row]
+        agent.state = AgentState(
+            position=view.position,
+            current_action=view.current_action,
+            destination=view.destination,
+            speed=view.speed,
+            route=view.route,
+        )
+        needs = agent.needs.needs
+        for name, need in needs.items():
+            needs[name] = Need(
+                current=need.current,
+                decay_rate=need.decay_rate,
+                critical_threshold=need.critical_threshold,
+            )
+
+        if self.dormant[row]:
+            self.dormant_count -= 1
+            self.dormant[row] = False
+            self.satisfaction_rates[row] = 0.0
+
+        # Fill the hole with the last row so the columns stay contiguous
+        last = self.count - 1
+        if row != last:
+            for attr in COLUMNS:
+                column = getattr(self, attr)
+                column[row] = column[last]
+            moved = self.agents[last]
+            self.agents[row] = moved
+            self.rows[moved] = row
+            self.views[row] = self.views[last]
+            self.views[row].rebind(row)
+        self.has_destination[last] = False
+        self.dormant[last] = False
+        self.satisfaction_rates[last] = 0.0
+        self.agents.pop()
+        self.views.pop()
+        self.count -= 1
+
+    def decay_needs(self, delta_time: float):
+        """Decay and clamp every need of every agent by `delta_time` hours"""
+        needs = self.needs[: self.count]
+        needs -= self.decay_rates[: self.count] * delta_time
+        np.clip(needs, 0.0, 100.0, out=needs)
+        if self.dormant_count:
+            # Same operations as NeedsSystem.satisfy_need, so results match
+            needs += self.satisfaction_rates[: self.count] * delta_time
+            np.minimum(needs, 100.0, out=needs)
+
+    def set_dormant(self, agent: "Agent", need_name: str, rate: float):
+        """Satisfy a need at `rate` per hour in bulk, skipping the agent's interactions"""
+        row = self.rows[agent]
+        if not self.dormant[row]:
+            self.dormant_count += 1
+        self.dormant[row] = True
+        self.satisfaction_rates[row, self.need_columns[need_name]] = rate
+
+    def clear_dormant(self, agent: "Agent"):
+        row = self.rows[agent]
+        if self.dormant[row]:
+            self.dormant_count -= 1
+        self.dormant[row] = False
+        self.satisfaction_rates[row] = 0.0
+
+    def move_towards_destinations(self, steered: bool = False):
+        """Step every agent with a destination one tick towards it
+
+        With `steered`, agents walk towards their `targets` instead, and only
+        stop once the target is the destination itself.
+        """
+        n = self.count
+        positions = self.positions[:n]
+        destinations = self.destinations[:n]
+        has_destination = self.has_destination[:n]
+        speeds = self.speeds[:n]
+        targets = self.targets[:n] if steered else destinations
+
+        delta = targets - positions
+        # Same operations as Agent.move, so both paths give bit-identical results
+        distance = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+
+        # Agents that can reach their target this tick snap to it
+        arriving = has_destination & (distance < speeds)
+        positions[arriving] = targets[arriving]
+        moving = has_destination & ~arriving
+        if steered:
+            arriving &= (targets == destinations).all(axis=1)
+        has_destination[arriving] = False
+
+        direction = delta[moving] / distance[moving, None]
+        positions[moving] += direction * speeds[moving, None]
+
+    def moving_rows(self) -> "np.ndarray":
+        """Rows of agents that have a destination and will move this tick"""
+        return np.flatnonzero(self.has_destination[: self.count])
+
+    def rows_of(self, agents: list["Agent"]) -> "np.ndarray":
+        """Rows of the given agents, for reading their part of the columns"""
+        rows = self.rows
+        return np.fromiter(
+            (rows[agent] for agent in agents), dtype=np.intp, count=len(agents)
+        )
+
+    def stopped_agents(self) -> list["Agent"]:
+        """Agents that currently have no destination and aren't dormant"""
+        n = self.count
+        rows = np.flatnonzero(~(self.has_destination[:n] | self.dormant[:n]))
+        return [self.agents[row] for row in rows]
@@ -0,0 +1,114 @@
+from ..entities.building import Building
+from ..entities.objects import WorldObject
+from .spatial import PointGrid
+
+
+class CapabilityIndex:
+    """City-wide index from capability name to objects with free capacity
+
+    Objects register themselves here when their building is added to the city,
+    and `WorldObject.reserve`/`release` keep the index current, so finding the
+    nearest free object never scans buildings or their objects. Every object
+    is also indexed regardless of occupancy, to find a queue to join when
+    nothing is free.
+
+    Objects are further split by their satisfaction rate for each capability.
+    Searches with a `min_rate` then skip the rates that are too slow outright,
+    instead of looking further and further out past free objects that don't
+    qualify.
+    """
+
+    def __init__(self, cell_size: float = 100.0):
+        self.cell_size = cell_size
+        # Capability -> satisfaction rate -> objects
+        self.free_objects: dict[str, dict[float, PointGrid[WorldObject]]] = {}
+        self.all_objects: dict[str, dict[float, PointGrid[WorldObject]]] = {}
+        self.building_of: dict[WorldObject, Building] = {}
+
+    def _grid(
+        self,
+        grids: dict[str, dict[float, PointGrid[WorldObject]]],
+        obj: WorldObject,
+        capability: str,
+    ) -> PointGrid[WorldObject]:
+        """The grid holding an object for a capability, created if needed"""
+        rate = max(
+            cap.satisfaction_rate for cap in obj.capabilities if cap.name == capability
+        )
+        by_rate = grids.setdefault(capability, {})
+        grid = by_rate.get(rate)
+        if grid is None:
+            grid = by_rate[rate] = PointGrid(self.cell_size)
+            # Fastest first, which breaks ties between equally near objects
+            grids[capability] = dict(sorted(by_rate.items(), reverse=True))
+        return grid
+
+    def add_building(self, building: Building):
+        """Index every object in a building"""
+        for obj in building.objects:
+            self.building_of[obj] = building
+            obj.capability_index = self
+            for capability in obj.capacity:
+                self._grid(self.all_objects, obj, capability).insert(obj, obj.position)
+            self.update_object(obj)
+
+    def remove_building(self, building: Building):
+        """Drop every object in a building from the index"""
+        for obj in building.objects:
+            for capability in obj.capacity:
+                for grids in (self.free_objects, self.all_objects):
+                    self._grid(grids, obj, capability).remove(obj)
+            obj.capability_index = None
+            self.building_of.pop(obj, None)
+
+    def update_object(self, obj: WorldObject):
+        """Re-check which capabilities of an object have room and (un)list it"""
+        for capability in obj.capacity:
+            has_room = obj.has_free_capacity(capability)
+            grid = self._grid(self.free_objects, obj, capability)
+            if has_room and obj not in grid:
+                grid.insert(obj, obj.position)
+            elif not has_room and obj in grid:
+                grid.remove(obj)
+
+    def nearest_free(
+        self, capability: str, position: tuple[float, float], min_rate: float = 0.0
+    ) -> tuple[Building, WorldObject] | None:
+        """Find the closest object with free capacity providing a capability
+
+        Objects whose satisfaction rate for the capability is not above
+        `min_rate` are skipped, so callers can pass a need's decay rate to
+        ignore objects that would never satisfy it. Of equally close objects,
+        the fastest is found.
+        """
+        return self._nearest(self.free_objects, capability, position, min_rate)
+
+    def nearest_queue(
+        self, capability: str, position: tuple[float, float], min_rate: float = 0.0
+    ) -> tuple[Building, WorldObject] | None:
+        """Find the closest object providing a capability, whether free or not"""
+        return self._nearest(self.all_objects, capability, position, min_rate)
+
+    def _nearest(
+        self,
+        grids: dict[str, dict[float, PointGrid[WorldObject]]],
+        capability: str,
+        position: tuple[float, float],
+        min_rate: float,
+    ) -> tuple[Building, WorldObject] | None:
+        px, py = position
+        best: WorldObject | None = None
+        best_distance = 0.0
+        for rate, grid in grids.get(capability, {}).items():
+            if min_rate > 0.0 and rate <= min_rate:
+                break  # The rest are slower still
+            obj = grid.nearest(position)
+            if obj is None:
+                continue
+            x, y = obj.position
+            distance = (x - px) ** 2 + (y - py) ** 2
+            if best is None or distance < best_distance:
+                best, best_distance = obj, distance
+        if best is None:
+            return None
+        return self.building_of[best], best
@@ -0,0 +1,102 @@
+from typing import TYPE_CHECKING
+
+import pygame
+
+from ..entities.building import Building
+from .generation import CityGenerator
+from .spatial import Cell
+
+if TYPE_CHECKING:
+    from .city import City
+
+LOAD_RADIUS = 1  # Chunks around an agent or focus area that are kept loaded
+EVICT_AFTER = 600  # Ticks a chunk stays loaded after it was last needed
+STREAM_INTERVAL = 30  # Ticks between checks for chunks to load or evict
+
+
+class ChunkStreamer:
+    """Loads generated chunks into a city as they are needed, evicting cold ones
+
+    A chunk is hot while an agent, or a focus rectangle such as the camera's
+    view, is within `load_radius` chunks of it. Hot chunks are generated and
+    added to the city; chunks that have been cold for `evict_after` ticks are
+    removed again, unless someone is using or waiting for one of their
+    objects. Chunks regenerate identically, so evicting one loses nothing.
+    """
+
+    def __init__(
+        self,
+        city: "City",
+        generator: CityGenerator,
+        load_radius: int = LOAD_RADIUS,
+        evict_after: int = EVICT_AFTER,
+    ):
+        self.city = city
+        self.generator = generator
+        self.load_radius = load_radius
+        self.evict_after = evict_after
+        self.loaded: dict[Cell, list[Building]] = {}
+        self.last_hot: dict[Cell, int] = {}  # Tick each loaded chunk was last hot
+        # Areas in world coordinates to keep loaded, whether or not agents are near
+        self.focus: list[pygame.Rect] = []
+        self.next_update = 0
+
+    def hot_chunks(self) -> set[Cell]:
+        """Chunks near any agent or focus area"""
+        generator = self.generator
+        # Agents are found through the occupied cells of the city's agent index
+        index = self.city.agent_index
+        centers = {
+            generator.chunk_of((x * index.cell_size, y * index.cell_size))
+            for x, y in index.cells
+        }
+        for rect in self.focus:
+            x0, y0 = generator.chunk_of(rect.topleft)
+            x1, y1 = generator.chunk_of(rect.bottomright)
+            centers.update((x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1))
+
+        radius = self.load_radius
+        hot = set()
+        for cx, cy in centers:
+            for x in range(cx - radius, cx + radius + 1):
+                for y in range(cy - radius, cy + radius + 1):
+                    if generator.contains((x, y)):
+                        hot.add((x, y))
+        return hot
+
+    def update(self, tick: int):
+        """Load hot chunks and evict cold ones, every `STREAM_INTERVAL` ticks"""
+        if tick < self.next_update:
+            return
+        self.next_update = tick + STREAM_INTERVAL
+
+        # Sorted, so chunks are always added in the same order
+        for chunk in sorted(self.hot_chunks()):
+            self.last_hot[chunk] = tick
+            if chunk not in self.loaded:
+                self.load(chunk)
+        for chunk, last_hot in list(self.last_hot.items()):
+            if tick - last_hot >= self.evict_after and self._idle(chunk):
+                self.evict(chunk)
+
+    def load(self, chunk: Cell, buildings: list[Building] | None = None):
+        """Add a chunk's buildings to the city, generating them unless given"""
+        if buildings is None:
+            buildings = self.generator.generate_chunk(chunk)
+        self.loaded[chunk] = buildings
+        self.last_hot.setdefault(chunk, self.city.tick)
+        for building in buildings:
+            self.city.add_building(building)
+
+    def evict(self, chunk: Cell):
+        """Remove a chunk's buildings from the city"""
+        self.city.remove_buildings(self.loaded.pop(chunk))
+        del self.last_hot[chunk]
+
+    def _idle(self, chunk: Cell) -> bool:
+        """Whether no agent holds or waits for a slot at an object in the chunk"""
+        return not any(
+            obj.occupants or any(obj.waiting.values())
+            for building in self.loaded[chunk]
+            for obj in building.objects
+        )
@@ -1,20 +1,106 @@
+import math
+
 import pygame
 
+from ..ai.behaviors import Behavior
 from ..ai.behaviors.needs import NeedBehavior
-from ..entities.agent import Agent
+from ..ai.selection import BatchBehaviorSelector
+from ..engine.events import EventQueue, ScheduledEvent
+from ..engine.profiler import TickProfiler
+from ..engine.rng import RandomStream, SimulationRNG
+from ..entities.agent import DEFAULT_BEHAVIORS, Agent
 from ..entities.building import BUILDING_TYPES, Building
+from ..entities.objects import WorldObject
+from ..ui.agent_sprites import AgentRenderer
+from ..ui.camera import Camera
+from ..ui.status_table import StatusTable
+from .agent_store import AgentStore
+from .capabilities import CapabilityIndex
+from .chunks import ChunkStreamer
+from .generation import CityGenerator
+from .navigation import Navigator
+from .spatial import BuildingIndex, PointGrid
+
+# Walking agents closer than this many pixels step apart
+AGENT_SPACING = 10.0
+# Agents outside any object chat with up to MAX_CHAT_PARTNERS others within
+# CHAT_RADIUS, gaining CHAT_RATE social per hour from each. Chats are only
+# checked every CHAT_INTERVAL ticks
+CHAT_RADIUS = 40.0
+CHAT_RATE = 1.5
+MAX_CHAT_PARTNERS = 3
+CHAT_INTERVAL = 10
 
 
 class City:
-    def __init__(self, width: int, height: int):
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        use_agent_store: bool = False,
+        create_layout: bool = True,
+        seed: int | None = None,
+        lazy_needs: bool = False,
+        navigation: bool = False,
+        chunked: bool = False,
+    ):
+        if lazy_needs and use_agent_store:
+            raise ValueError("lazy_needs can't be combined with use_agent_store")
         self.width = width
         self.height = height
+
+        # All randomness is drawn from streams derived from a single seed
+        self.rng = SimulationRNG(seed)
+        self.layout_rng = self.rng.stream("layout")
+        self.position_rng = self.rng.stream("positions")
+
         self.buildings: list[Building] = []
         self.agents: list[Agent] = []
+        # Objects track occupants and queues by agent name, so names are unique
+        self.agents_by_name: dict[str, Agent] = {}
         self.current_tick = 0
-
-        # Create initial city layout
-        self._create_initial_layout()
+        self.ticks_per_hour = 60
+
+        # Agents whose behavior needn't be polled until a known tick. Dormant
+        # ones are using an object and also skip per-tick needs and interactions
+        self.tick = 0
+        self.wakeups = EventQueue()
+        self.parked: dict[Agent, tuple[ScheduledEvent, int]] = {}
+        self.dormant: set[Agent] = set()
+        # Agents woken while behaviors are being polled, see wake_agent
+        self.woken: set[Agent] | None = None
+        self.building_index = BuildingIndex()
+        self.layout_version = 0  # Bumped whenever buildings change
+        self.capability_index = CapabilityIndex()
+        # Agent positions, updated as agents move, for proximity queries
+        self.agent_index: PointGrid[Agent] = PointGrid(cell_size=40.0)
+        # Routes around buildings; without it agents walk in straight lines
+        self.navigation = Navigator(self) if navigation else None
+
+        # Optional columnar storage for vectorized movement and need decay
+        self.agent_store = AgentStore() if use_agent_store else None
+
+        # Behavior definitions shared by every agent, in priority order
+        self.behaviors: list[Behavior] = list(DEFAULT_BEHAVIORS)
+        self.behavior_selector = self._make_behavior_selector()
+        # Alternatively, needs evaluated in closed form and never stepped
+        self.lazy_needs = lazy_needs
+
+        # Per-subsystem timings, off unless enabled
+        self.profiler = TickProfiler()
+
+        # Sorted, scrollable agent status table
+        self.status_table = StatusTable()
+        self.agent_renderer = AgentRenderer()
+
+        # A generated world streamed in chunk by chunk around agents, instead
+        # of the small fixed layout
+        self.chunks: ChunkStreamer | None = None
+        if chunked:
+            generator = CityGenerator(width, height, self.rng.spawn("world"))
+            self.chunks = ChunkStreamer(self, generator)
+        elif create_layout:
+            self._create_initial_layout()
 
         # Cache available building types
         self.available_building_types = self._get_available_building_types()
@@ -24,64 +110,265 @@ class City:
         # Create a row of houses on the top
         house_width, house_height = 60, 80
         for i in range(4):
-            self.buildings.append(
+            self.add_building(
                 Building(
                     BUILDING_TYPES["house"],
                     position=(50 + i * (house_width + 20), 50),
                     size=(house_width, house_height),
+                    rng=self.layout_rng,
                 )
             )
 
         # Add restaurants in the middle
-        self.buildings.append(
-            Building(BUILDING_TYPES["restaurant"], position=(200, 200), size=(100, 80))
+        self.add_building(
+            Building(
+                BUILDING_TYPES["restaurant"],
+                position=(200, 200),
+                size=(100, 80),
+                rng=self.layout_rng,
+            )
         )
-        self.buildings.append(
-            Building(BUILDING_TYPES["restaurant"], position=(400, 200), size=(100, 80))
+        self.add_building(
+            Building(
+                BUILDING_TYPES["restaurant"],
+                position=(400, 200),
+                size=(100, 80),
+                rng=self.layout_rng,
+            )
         )
 
         # Add parks at the bottom
-        self.buildings.append(
-            Building(BUILDING_TYPES["park"], position=(50, 350), size=(150, 100))
+        self.add_building(
+            Building(
+                BUILDING_TYPES["park"],
+                position=(50, 350),
+                size=(150, 100),
+                rng=self.layout_rng,
+            )
         )
-        self.buildings.append(
-            Building(BUILDING_TYPES["park"], position=(300, 350), size=(150, 100))
+        self.add_building(
+            Building(
+                BUILDING_TYPES["park"],
+                position=(300, 350),
+                size=(150, 100),
+                rng=self.layout_rng,
+            )
         )
 
+    def register_behavior(self, behavior: Behavior):
+        """Offer a custom behavior to every agent, below the existing ones in priority"""
+        self.behaviors.append(behavior)
+        self.behavior_selector = self._make_behavior_selector()
+
+    def _make_behavior_selector(self) -> BatchBehaviorSelector | None:
+        """Batch selection over the agent store, if it supports every behavior"""
+        if self.agent_store is None or not BatchBehaviorSelector.supports(
+            self.behaviors
+        ):
+            return None
+        return BatchBehaviorSelector(self.behaviors, self.agent_store.need_columns)
+
     def _get_available_building_types(self) -> list[str]:
         """Get a list of all building types present in the city"""
-        return list(set(b.building_type.name for b in self.buildings))
+        return [
+            name
+            for name, entrances in self.building_index.entrances_by_type.items()
+            if len(entrances)
+        ]
+
+    def add_building(self, building: Building):
+        """Add a building to the city and its spatial index"""
+        self.buildings.append(building)
+        self.building_index.add(building)
+        self.capability_index.add_building(building)
+        if self.navigation is not None:
+            self.navigation.add_building(building)
+        self.layout_version += 1
+        if hasattr(self, "available_building_types"):
+            self.available_building_types = self._get_available_building_types()
+
+    def remove_building(self, building: Building):
+        """Remove a building from the city and its spatial index"""
+        self.remove_buildings([building])
+
+    def remove_buildings(self, buildings: list[Building]):
+        """Remove several buildings, in one pass over the city's buildings"""
+        removed = set(buildings)
+        self.buildings[:] = [b for b in self.buildings if b not in removed]
+        for building in buildings:
+            self.building_index.remove(building)
+            self.capability_index.remove_building(building)
+            if self.navigation is not None:
+                self.navigation.remove_building(building)
+        self.layout_version += 1
+        self.available_building_types = self._get_available_building_types()
 
     def add_agent(self, agent: Agent):
         """Add a new agent to the city"""
+        if agent.name in self.agents_by_name:
+            raise ValueError(f"an agent named {agent.name!r} is already in the city")
+        self.agents_by_name[agent.name] = agent
         agent.city = self  # Set the city reference
+        if agent.rng is None:
+            agent.rng = self.rng.agent_stream(agent.name)
         self.agents.append(agent)
+        self.agent_index.insert(agent, agent.state.position)
+        self.status_table.add(agent)
+        if self.agent_store is not None:
+            self.agent_store.attach(agent)
+        if self.lazy_needs:
+            agent.needs.make_lazy(self, self.ticks_per_hour)
+
+    def remove_agent(self, agent: Agent, keep_slot: bool = False):
+        """Remove an agent from the city, giving up its object slot or queue place
+
+        With `keep_slot`, a slot in use stays taken, for callers handing it
+        over along with the agent.
+        """
+        self.wake_agent(agent)
+        using_object = agent.behavior_state.using_object
+        if using_object is not None and not (
+            keep_slot and agent.name in using_object.occupants
+        ):
+            using_object.release(agent.name)
+        self.agents.remove(agent)
+        del self.agents_by_name[agent.name]
+        self.agent_index.remove(agent)
+        self.status_table.remove(agent)
+        if self.agent_store is not None:
+            self.agent_store.detach(agent)
+        if self.lazy_needs:
+            agent.needs.make_eager()
+        agent.city = None
+
+    def park_agent(self, agent: Agent, ticks: int):
+        """Skip the agent's behavior updates for the next `ticks` ticks"""
+        if ticks < 1 or agent in self.parked:
+            return
+        event = self.wakeups.schedule(
+            self.tick + ticks + 1, lambda: self.wake_agent(agent)
+        )
+        self.parked[agent] = (event, self.tick)
+
+        behavior = agent.active_behavior
+        if isinstance(behavior, NeedBehavior) and behavior.is_using(agent):
+            self._make_dormant(agent, behavior)
+
+    def _make_dormant(self, agent: Agent, behavior: NeedBehavior):
+        """Integrate the agent's needs in closed form until it wakes"""
+        self.dormant.add(agent)
+        rate = behavior.satisfaction_rate(agent)
+        if self.agent_store is not None:
+            self.agent_store.set_dormant(agent, behavior.need_name, rate)
+            return
+
+        needs = agent.needs
+        if needs.lazy:
+            # Lazy needs have already decayed this tick; apply the
+            # satisfaction the skipped interaction would have, then keep rising
+            needs.satisfy_need(behavior.need_name, rate / self.ticks_per_hour)
+            start_tick = None
+        else:
+            # Ticks already counted by the clock include the one in progress
+            start_tick = self.tick - 1
+        needs.integrate(self, self._dormant_rates(agent, behavior, rate), start_tick)
+
+    def _dormant_rates(
+        self, agent: Agent, behavior: NeedBehavior, rate: float
+    ) -> dict[str, float]:
+        """Per-tick change of each need while the agent uses its object"""
+        ticks_per_hour = self.ticks_per_hour
+        rates = {
+            name: -need.decay_rate / ticks_per_hour
+            for name, need in agent.needs.needs.items()
+        }
+        rates[behavior.need_name] += rate / ticks_per_hour
+        return rates
+
+    def wake_agent(self, agent: Agent):
+        """Resume polling a parked agent, crediting the ticks it skipped"""
+        parked = self.parked.pop(agent, None)
+        if parked is None:
+            return
+        event, parked_at = parked
+        event.cancel()
+        skipped = self.tick - parked_at
+        if self.woken is not None:
+            # The update for this tick is still to come, unless the agent was
+            # already passed over; that is credited after polling
+            skipped -= 1
+            self.woken.add(agent)
+        if agent in self.dormant:
+            self.dormant.discard(agent)
+            if self.agent_store is not None:
+                self.agent_store.clear_dormant(agent)
+            else:
+                agent.needs.resume_decay(self, self.ticks_per_hour)
+        if agent.active_behavior is not None:
+            agent.active_behavior.skip_ticks(agent, skipped)
+
+    def restore_parked(
+        self, agent: Agent, parked_at: int, wake_tick: int, dormant: bool
+    ):
+        """Park an agent again as it was saved, e.g. when loading a snapshot
+
+        A dormant agent's needs go on from their current values, or from the
+        lines they already follow if those were restored.
+        """
+        event = self.wakeups.schedule(wake_tick, lambda: self.wake_agent(agent))
+        self.parked[agent] = (event, parked_at)
+        behavior = agent.active_behavior
+        if dormant and isinstance(behavior, NeedBehavior):
+            self.dormant.add(agent)
+            rate = behavior.satisfaction_rate(agent)
+            if self.agent_store is not None:
+                self.agent_store.set_dormant(agent, behavior.need_name, rate)
+            else:
+                rates = self._dormant_rates(agent, behavior, rate)
+                agent.needs.integrate(self, rates)
+
+    def wake_all(self):
+        """Wake every parked agent, e.g. before handing agents to shard workers"""
+        for agent in list(self.parked):
+            self.wake_agent(agent)
 
     def get_nearest_building_of_type(
         self, position: tuple[float, float], building_type: str
     ) -> Building | None:
         """Find the nearest building of a specific type"""
-        buildings_of_type = [
-            b for b in self.buildings if b.building_type.name == building_type
-        ]
-        if not buildings_of_type:
-            return None
-
-        return min(
-            buildings_of_type,
-            key=lambda b: (
-                (b.entrance[0] - position[0]) ** 2 + (b.entrance[1] - position[1]) ** 2
-            ),
-        )
+        return self.building_index.nearest_of_type(position, building_type)
 
     def get_building_at_position(
         self, position: tuple[float, float]
     ) -> Building | None:
         """Get building at the given position, if any"""
-        for building in self.buildings:
-            if building.rect.collidepoint(position):
-                return building
-        return None
+        return self.building_index.building_at(position)
+
+    def agents_within(
+        self, position: tuple[float, float], radius: float
+    ) -> list[Agent]:
+        """Find all agents within `radius` of a position"""
+        return self.agent_index.within_radius(position, radius)
+
+    def nearest_agents(self, position: tuple[float, float], k: int) -> list[Agent]:
+        """Find up to `k` agents closest to a position, nearest first"""
+        return self.agent_index.k_nearest(position, k)
+
+    def nearest_agent(self, position: tuple[float, float]) -> Agent | None:
+        """Find the agent closest to a position, if there are any agents"""
+        return self.agent_index.nearest(position)
+
+    def find_free_object(
+        self, capability: str, position: tuple[float, float], min_rate: float = 0.0
+    ) -> tuple[Building, WorldObject] | None:
+        """Find the nearest object with free capacity providing a capability"""
+        return self.capability_index.nearest_free(capability, position, min_rate)
+
+    def find_queue(
+        self, capability: str, position: tuple[float, float], min_rate: float = 0.0
+    ) -> tuple[Building, WorldObject] | None:
+        """Find the nearest object providing a capability to wait in line for"""
+        return self.capability_index.nearest_queue(capability, position, min_rate)
 
     def update(self, time_of_day: str, current_hour: int, ticks_per_hour: int):
         """Update all agents in the city on each tick"""
@@ -89,99 +376,255 @@ class City:
         hour_progress = 1.0 / ticks_per_hour  # How much of an hour each tick represents
 
         self.current_tick = (self.current_tick + 1) % ticks_per_hour
-
-        for agent in self.agents:
-            # Update agent behavior
-            agent.update(time_of_day, self.available_building_types)
-
-            # Update needs based on game time
-            agent.needs.update(hour_progress)
-
-            # Handle building interactions
-            if not agent.state.destination:  # Agent has stopped moving
+        if ticks_per_hour != self.ticks_per_hour:
+            self.ticks_per_hour = ticks_per_hour
+            if self.lazy_needs:
+                # Per-tick rates depend on the tick length
+                self.wake_all()
+                for agent in self.agents:
+                    agent.needs.make_eager()
+                    agent.needs.make_lazy(self, ticks_per_hour)
+
+        # Wake agents due this tick before their behaviors are polled
+        self.wakeups.run_due(self.tick + 1)
+        self.tick += 1
+
+        if self.chunks is not None:
+            with self.profiler.section("city.chunks"):
+                self.chunks.update(self.tick)
+
+        if self.agent_store is not None:
+            self._update_stored_agents(self.agent_store, hour_progress)
+            return
+
+        # Agents only affect each other through object claims made while
+        # selecting behaviors, so the tick can run in phases
+        profiler = self.profiler
+        with profiler.section("agents.behavior", len(self.agents)):
+            parked = self.parked
+            woken = self.woken = set()
+            for agent in self.agents:
+                if agent not in parked:
+                    agent.update_behavior()
+                if woken:
+                    woken.discard(agent)
+            self._credit_passed_over(woken)
+
+        with profiler.section("agents.movement", len(self.agents)):
+            dormant = self.dormant
+            moved = []
+            if self.lazy_needs:
+                # Lazy needs follow the tick counter by themselves
+                for agent in self.agents:
+                    if agent not in dormant and agent.state.destination:
+                        agent.move()
+                        moved.append(agent)
+            else:
+                for agent in self.agents:
+                    if agent in dormant:
+                        continue
+                    if agent.state.destination:
+                        agent.move()
+                        moved.append(agent)
+                    # Update needs based on game time
+                    agent.needs.update(hour_progress)
+            self._track_agents(moved)
+
+        with profiler.section("agents.social"):
+            if self.tick % CHAT_INTERVAL == 0:
+                self._chat(hour_progress * CHAT_INTERVAL)
+
+        with profiler.section("city.interactions"):
+            for agent in self.agents:
+                if agent in dormant or not self._holds_slot(agent):
+                    continue
+                # Handle building interactions
+                if not agent.state.destination:  # Agent has stopped moving
+                    building = self.get_building_at_position(agent.state.position)
+                    if building:
+                        self._handle_building_interaction(
+                            agent, building, hour_progress
+                        )
+
+    def _update_stored_agents(self, store: AgentStore, hour_progress: float):
+        """Update agents backed by the agent store, vectorizing per-agent work"""
+        profiler = self.profiler
+        with profiler.section("agents.behavior", len(self.agents)):
+            parked = self.parked
+            selector = self.behavior_selector
+            idle = []
+            woken = self.woken = set()
+            for agent in self.agents:
+                if agent not in parked:
+                    if agent.active_behavior or selector is None:
+                        agent.update_behavior()
+                    else:
+                        idle.append(agent)
+                if woken:
+                    woken.discard(agent)
+            self._credit_passed_over(woken)
+            if selector is not None:
+                # Selection only reads an agent's own needs and random stream, so
+                # idle agents can all select after the active ones have updated
+                selector.select(idle, store, self.ticks_per_hour)
+
+        with profiler.section("agents.movement", store.count):
+            if self.navigation is not None:
+                self.navigation.steer_store(store)
+            rows = store.moving_rows()
+            store.move_towards_destinations(steered=self.navigation is not None)
+            store.decay_needs(hour_progress)
+            self._track_agents([store.agents[row] for row in rows])
+
+        with profiler.section("agents.social"):
+            if self.tick % CHAT_INTERVAL == 0:
+                self._chat(hour_progress * CHAT_INTERVAL)
+
+        with profiler.section("city.interactions"):
+            for agent in store.stopped_agents():
+                if not self._holds_slot(agent):
+                    continue
                 building = self.get_building_at_position(agent.state.position)
                 if building:
                     self._handle_building_interaction(agent, building, hour_progress)
 
+    def _credit_passed_over(self, woken: set[Agent]):
+        """Count this tick's update for agents woken after their turn to poll"""
+        self.woken = None
+        for agent in woken:
+            if agent.active_behavior is not None:
+                agent.active_behavior.skip_ticks(agent, 1)
+
+    def _track_agents(self, moved: list[Agent]):
+        """Update the agent index after a movement step, then space agents out"""
+        index = self.agent_index
+        for agent in moved:
+            index.move(agent, agent.state.position)
+        self._keep_apart([agent for agent in moved if agent.state.destination])
+
+    def _keep_apart(self, walking: list[Agent]):
+        """Nudge walking agents away from other walking agents that are too close
+
+        Pushes are all worked out before any is applied, so the result doesn't
+        depend on the order of agents, and are limited to half a step so agents
+        still make headway through a crowd. Agents never get pushed into a
+        building.
+        """
+        if len(walking) < 2:
+            return
+        index = self.agent_index
+        positions = index.positions
+        walking_set = set(walking)
+        pushes = []
+        for agent in walking:
+            x, y = positions[agent]
+            push_x = push_y = 0.0
+            for other in index.within_radius((x, y), AGENT_SPACING):
+                if other is agent or other not in walking_set:
+                    continue
+                other_x, other_y = positions[other]
+                dx, dy = x - other_x, y - other_y
+                distance = math.sqrt(dx * dx + dy * dy)
+                if distance == 0:
+                    continue  # No telling which way is apart
+                overlap = (AGENT_SPACING - distance) / 2
+                push_x += dx / distance * overlap
+                push_y += dy / distance * overlap
+            if push_x or push_y:
+                pushes.append((agent, push_x, push_y))
+
+        navigation = self.navigation
+        for agent, push_x, push_y in pushes:
+            length = math.sqrt(push_x * push_x + push_y * push_y)
+            limit = agent.state.speed / 2
+            if length > limit:
+                push_x *= limit / length
+                push_y *= limit / length
+            x, y = positions[agent]
+            position = (x + push_x, y + push_y)
+            if navigation is not None and not navigation.is_walkable(position):
+                continue
+            agent.state.position = position
+            index.move(agent, position)
+
+    def _chat(self, hours: float):
+        """Satisfy the social need of agents near others, outside of objects
+
+        Idle agents are parked on the assumption that their needs only decay,
+        so those that chat are woken to reconsider.
+        """
+        index = self.agent_index
+        positions = index.positions
+        parked = self.parked
+        for agent in self.agents:
+            if agent.behavior_state.using_object is not None:
+                continue
+            partners = 0
+            for other in index.within_radius(positions[agent], CHAT_RADIUS):
+                if other is agent or other.behavior_state.using_object is not None:
+                    continue
+                partners += 1
+                if partners == MAX_CHAT_PARTNERS:
+                    break
+            if partners:
+                agent.needs.satisfy_need("social", CHAT_RATE * partners * hours)
+                if agent in parked and agent.active_behavior is None:
+                    self.wake_agent(agent)
+
+    @staticmethod
+    def _holds_slot(agent: Agent) -> bool:
+        """Whether the agent occupies an object, e.g. rather than waiting in line"""
+        using_object = agent.behavior_state.using_object
+        return using_object is not None and agent.name in using_object.occupants
+
     def _handle_building_interaction(
         self, agent: Agent, building: Building, hour_progress: float
     ):
         """Handle agent interaction with objects in a building"""
         if agent.active_behavior and isinstance(agent.active_behavior, NeedBehavior):
             behavior = agent.active_behavior
-            if behavior.using_object:
+            using_object = agent.behavior_state.using_object
+            # Agents still waiting in line get nothing from the object
+            if using_object is not None and agent.name in using_object.occupants:
                 # Apply object's capability effects
-                for cap in behavior.using_object.capabilities:
+                for cap in using_object.capabilities:
                     if cap.name == behavior.required_capability:
                         # Scale satisfaction rate to game time
                         tick_satisfaction = cap.satisfaction_rate * hour_progress
                         agent.needs.satisfy_need(behavior.need_name, tick_satisfaction)
 
-    def render(self, screen: pygame.Surface):
-        """Render the entire city"""
-        # Draw buildings
-        for building in self.buildings:
-            building.render(screen)
-
-        # Draw agents
-        for agent in self.agents:
-            agent.render(screen)
+    def render_static(self, surface: pygame.Surface, camera: Camera | None = None):
+        """Render the parts of the city that only change with the layout
+
+        Only buildings in the camera's view (or the surface, without one) are
+        looked up and drawn, so the cost doesn't grow with the city.
+        """
+        view = camera.view if camera is not None else surface.get_rect()
+        for building in self.building_index.within_rect(view):
+            building.render(surface, camera)
+
+    def render(
+        self, screen: pygame.Surface, camera: Camera | None = None
+    ) -> list[pygame.Rect]:
+        """Render agents and the status table, returning the areas drawn"""
+        # Draw the agents in view, including those only partly on screen
+        view = camera.view if camera is not None else screen.get_rect()
+        margin = self.agent_renderer.radius + 1
+        visible = self.agent_index.within_rect(view.inflate(2 * margin, 2 * margin))
+        dirty = self.agent_renderer.render(screen, visible, self.agent_store, camera)
 
         # Draw status table
-        self._render_status_table(screen)
-
-    def _render_status_table(self, screen: pygame.Surface):
-        """Render a table showing agent status"""
-        font = pygame.font.Font(None, 24)
-        row_height = 25
-        col_widths = [80, 120, 80, 80, 80]  # Widths for each column
-        table_width = sum(col_widths)
-
-        # Table position (bottom left)
-        x = 10
-        y = screen.get_height() - (len(self.agents) + 1) * row_height - 10
-
-        # Draw header
-        headers = ["Name", "Action", "Energy", "Hunger", "Social"]
-        current_x = x
-        for header, width in zip(headers, col_widths):
-            text = font.render(header, True, (0, 0, 0))
-            screen.blit(text, (current_x, y))
-            current_x += width
-
-        # Draw agent rows
-        for i, agent in enumerate(self.agents):
-            status = agent.get_status()
-            y_pos = y + (i + 1) * row_height
-
-            # Draw row background (alternating colors)
-            row_rect = pygame.Rect(x, y_pos, table_width, row_height)
-            pygame.draw.rect(
-                screen, (240, 240, 240) if i % 2 == 0 else (220, 220, 220), row_rect
-            )
+        dirty.append(self.status_table.render(screen))
+        return dirty
 
-            # Draw cells
-            cells = [
-                status["name"],
-                status["action"],
-                f"{status['needs']['energy']:.1f}",
-                f"{status['needs']['hunger']:.1f}",
-                f"{status['needs']['social']:.1f}",
-            ]
-
-            current_x = x
-            for cell, width in zip(cells, col_widths):
-                text = font.render(cell, True, (0, 0, 0))
-                screen.blit(text, (current_x, y_pos + 5))  # +5 for vertical centering
-                current_x += width
-
-    def get_random_position(self) -> tuple[float, float]:
+    def get_random_position(
+        self, rng: RandomStream | None = None
+    ) -> tuple[float, float]:
         """Get a random position within the city bounds"""
-        from random import randint
-
+        rng = rng or self.position_rng
         return (
-            randint(self.width // 10, self.width * 9 // 10),
-            randint(self.height // 10, self.height * 9 // 10),
+            rng.randint(self.width // 10, self.width * 9 // 10),
+            rng.randint(self.height // 10, self.height * 9 // 10),
         )
 
     def get_building_stats(self) -> dict[str, int]:
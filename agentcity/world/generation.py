@@ -0,0 +1,123 @@
+from collections.abc import Iterator
+from math import floor, hypot
+
+from ..engine.rng import RandomStream, SimulationRNG
+from ..entities.building import BUILDING_TYPES, Building
+from .spatial import Cell
+
+BLOCK_SIZE = 200  # Pixels per block, including half a street on every side
+STREET_WIDTH = 40
+BLOCKS_PER_CHUNK = 4
+VACANT_CHANCE = 0.1  # Share of blocks left empty
+
+
+class CityGenerator:
+    """Seeded procedural city layout, generated one chunk at a time
+
+    The world is a grid of square blocks separated by streets, grouped into
+    square chunks of `blocks_per_chunk` blocks a side. Each block is zoned
+    residential (a pair of houses), commercial (a restaurant) or park, with
+    commercial blocks getting more common towards the city center. Buildings
+    sit at the back of their block, leaving their entrance open to the street.
+
+    Everything in a chunk is drawn from a random stream keyed by the chunk's
+    coordinates, so any chunk can be generated on its own, in any order and
+    any number of times, with the same result.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        rng: SimulationRNG,
+        blocks_per_chunk: int = BLOCKS_PER_CHUNK,
+    ):
+        self.width = width
+        self.height = height
+        self.rng = rng
+        self.chunk_size = BLOCK_SIZE * blocks_per_chunk
+        self.blocks_per_chunk = blocks_per_chunk
+        self.chunk_cols = -(-width // self.chunk_size)
+        self.chunk_rows = -(-height // self.chunk_size)
+
+    def chunk_of(self, position: tuple[float, float]) -> Cell:
+        return (
+            floor(position[0] / self.chunk_size),
+            floor(position[1] / self.chunk_size),
+        )
+
+    def contains(self, chunk: Cell) -> bool:
+        return 0 <= chunk[0] < self.chunk_cols and 0 <= chunk[1] < self.chunk_rows
+
+    def chunks(self) -> Iterator[Cell]:
+        """Every chunk of the world, row by row"""
+        for y in range(self.chunk_rows):
+            for x in range(self.chunk_cols):
+                yield (x, y)
+
+    def generate_chunk(self, chunk: Cell) -> list[Building]:
+        """Create the buildings of a chunk, without adding them to a city"""
+        rng = self.rng.stream("chunk", *chunk)
+        buildings: list[Building] = []
+        first_x = chunk[0] * self.blocks_per_chunk
+        first_y = chunk[1] * self.blocks_per_chunk
+        for block_y in range(first_y, first_y + self.blocks_per_chunk):
+            for block_x in range(first_x, first_x + self.blocks_per_chunk):
+                left, top = block_x * BLOCK_SIZE, block_y * BLOCK_SIZE
+                # Blocks cut off by the edge of the world stay empty
+                if left + BLOCK_SIZE > self.width or top + BLOCK_SIZE > self.height:
+                    continue
+                zone = self._zone(left, top, rng)
+                if zone is not None:
+                    buildings.extend(self._build_block(zone, left, top, rng))
+        return buildings
+
+    def _zone(self, left: int, top: int, rng: RandomStream) -> str | None:
+        """Pick the building type for a block, or None to leave it vacant"""
+        roll = rng.random()
+        if roll < VACANT_CHANCE:
+            return None
+        # 0 at the center of the world, 1 in its corners
+        center_x, center_y = self.width / 2, self.height / 2
+        distance = hypot(
+            left + BLOCK_SIZE / 2 - center_x, top + BLOCK_SIZE / 2 - center_y
+        )
+        remoteness = distance / max(hypot(center_x, center_y), 1.0)
+        commercial = 0.05 + 0.4 * (1.0 - remoteness)
+        park = 0.12
+        roll = (roll - VACANT_CHANCE) / (1.0 - VACANT_CHANCE)
+        if roll < commercial:
+            return "restaurant"
+        if roll < commercial + park:
+            return "park"
+        return "house"
+
+    def _build_block(
+        self, zone: str, left: int, top: int, rng: RandomStream
+    ) -> list[Building]:
+        building_type = BUILDING_TYPES[zone]
+        inner_left = left + STREET_WIDTH // 2
+        inner_top = top + STREET_WIDTH // 2
+        inner_size = BLOCK_SIZE - STREET_WIDTH
+
+        if zone == "house":
+            # Two houses side by side, each on half the block
+            lot = inner_size // 2
+            lots = [(inner_left, lot), (inner_left + lot, lot)]
+            sizes = [(rng.randint(50, 70), rng.randint(60, 100)) for _ in lots]
+        elif zone == "restaurant":
+            lots = [(inner_left, inner_size)]
+            sizes = [(rng.randint(100, 140), rng.randint(70, 100))]
+        else:
+            lots = [(inner_left, inner_size)]
+            sizes = [(rng.randint(120, 160), rng.randint(80, 110))]
+
+        return [
+            Building(
+                building_type,
+                position=(lot_left + (lot_width - width) // 2, inner_top),
+                size=(width, height),
+                rng=rng,
+            )
+            for (lot_left, lot_width), (width, height) in zip(lots, sizes)
+        ]
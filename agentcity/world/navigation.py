@@ -0,0 +1,749 @@
+import heapq
+from collections import OrderedDict
+from collections.abc import Iterator
+from math import ceil, floor, inf, sqrt
+from typing import TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from ..entities.agent import Agent
+    from ..entities.building import Building
+    from .agent_store import AgentStore
+    from .city import City
+
+DIAGONAL = sqrt(2)
+# A* overestimates the remaining distance by this factor. Routes may then be
+# up to 20% longer than the shortest, but street grids get searched an order
+# of magnitude faster, as the search stops trying every equally long zigzag
+ROUTE_WEIGHT = 1.2
+# Cells past the last known step on a leg where agents cutting corners may be
+LOOKAHEAD = 3
+BLOCK_MOVES = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy]
+
+
+class WalkabilityGrid:
+    """Grid of cells over the city marking where agents can walk
+
+    Cells are numbered row by row. A cell is blocked when its center lies
+    inside a building, except for the cell holding a building's entrance.
+    Only blocked cells are stored, so memory grows with the buildings and the
+    city's perimeter rather than its area. A blocked border one cell wide
+    means neighbours never need bounds checks; positions outside the city are
+    clamped to the cells just inside it.
+    """
+
+    def __init__(
+        self, width: int, height: int, buildings: list["Building"], cell_size: float
+    ):
+        self.cell_size = cell_size
+        self.cols = max(1, ceil(width / cell_size))
+        self.rows = max(1, ceil(height / cell_size))
+        stride = self.stride = self.cols + 2
+        last_row = (self.rows + 1) * stride
+        self.blocked: set[int] = set(range(stride))
+        self.blocked.update(range(last_row, last_row + stride))
+        for y in range(1, self.rows + 1):
+            self.blocked.add(y * stride)
+            self.blocked.add(y * stride + stride - 1)
+        # Building covering each blocked cell, to find the way in or out
+        self.owners: dict[int, Building] = {}
+        self.entrances: set[int] = set()
+
+        # (index offset, cost, offsets of the two cells a diagonal move cuts past)
+        self.moves = [
+            (1, 1.0, 0, 0),
+            (-1, 1.0, 0, 0),
+            (stride, 1.0, 0, 0),
+            (-stride, 1.0, 0, 0),
+        ] + [
+            (dx + dy * stride, DIAGONAL, dx, dy * stride)
+            for dx, dy in ((1, 1), (1, -1), (-1, 1), (-1, -1))
+        ]
+
+        for building in buildings:
+            self.add_building(building)
+
+    def cells_covered(self, building: "Building") -> Iterator[int]:
+        """Cells whose center lies inside the building"""
+        rect = building.rect
+        size = self.cell_size
+        x0 = max(0, floor(rect.left / size - 0.5))
+        y0 = max(0, floor(rect.top / size - 0.5))
+        x1 = min(self.cols - 1, ceil(rect.right / size - 0.5))
+        y1 = min(self.rows - 1, ceil(rect.bottom / size - 0.5))
+        for y in range(y0, y1 + 1):
+            for x in range(x0, x1 + 1):
+                if rect.collidepoint((x + 0.5) * size, (y + 0.5) * size):
+                    yield (y + 1) * self.stride + x + 1
+
+    def add_building(self, building: "Building"):
+        """Block the cells a building covers, keeping every entrance open"""
+        entrance = self.cell_of(building.entrance)
+        self.entrances.add(entrance)
+        if self.owners.pop(entrance, None) is not None:
+            self.blocked.discard(entrance)
+        for cell in self.cells_covered(building):
+            if cell not in self.entrances:
+                self.blocked.add(cell)
+                self.owners[cell] = building
+
+    def remove_building(self, building: "Building"):
+        """Open up the cells a building covered"""
+        self.entrances.discard(self.cell_of(building.entrance))
+        for cell in self.cells_covered(building):
+            if self.owners.get(cell) is building:
+                del self.owners[cell]
+                self.blocked.discard(cell)
+
+    def cell_of(self, position: tuple[float, float]) -> int:
+        x = floor(position[0] / self.cell_size)
+        y = floor(position[1] / self.cell_size)
+        if not 0 <= x < self.cols:
+            x = 0 if x < 0 else self.cols - 1
+        if not 0 <= y < self.rows:
+            y = 0 if y < 0 else self.rows - 1
+        return (y + 1) * self.stride + x + 1
+
+    def cells_of(self, positions: "np.ndarray") -> "np.ndarray":
+        """Vectorized `cell_of` for an (n, 2) array of positions"""
+        x = np.clip(np.floor(positions[:, 0] / self.cell_size), 0, self.cols - 1)
+        y = np.clip(np.floor(positions[:, 1] / self.cell_size), 0, self.rows - 1)
+        return (y.astype(np.int64) + 1) * self.stride + x.astype(np.int64) + 1
+
+    def center(self, cell: int) -> tuple[float, float]:
+        y, x = divmod(cell, self.stride)
+        return ((x - 0.5) * self.cell_size, (y - 0.5) * self.cell_size)
+
+    def neighbours(self, cell: int) -> list[tuple[int, float]]:
+        """Walkable neighbours of a cell with the cost of moving there
+
+        Diagonal moves may not cut the corner of a blocked cell.
+        """
+        blocked = self.blocked
+        return [
+            (cell + offset, cost)
+            for offset, cost, side_a, side_b in self.moves
+            if cell + offset not in blocked
+            and not (side_a and (cell + side_a in blocked or cell + side_b in blocked))
+        ]
+
+    def find_path(
+        self, start: int, goal: int, limit: int | None = None
+    ) -> list[int] | None:
+        """Weighted A* search for the cells from `start` to `goal`
+
+        Returns None if the goal can't be reached, or once more than `limit`
+        cells have been searched without reaching it.
+        """
+        return self.search(start, goal, limit)[0]
+
+    def search(
+        self, start: int, goal: int, limit: int | None = None
+    ) -> tuple[list[int] | None, set[int]]:
+        """`find_path`, also returning the cells whose neighbours were checked"""
+        stride = self.stride
+        blocked = self.blocked
+        moves = self.moves
+        goal_y, goal_x = divmod(goal, stride)
+        # Octile distance, inflated by ROUTE_WEIGHT
+        straight = ROUTE_WEIGHT
+        diagonal = ROUTE_WEIGHT * (DIAGONAL - 1)
+
+        came_from: dict[int, int] = {}
+        costs = {start: 0.0}
+        # Among equally promising cells, expand the one nearest the goal first
+        frontier = [(0.0, 0.0, start)]
+        closed: set[int] = set()
+        while frontier:
+            _, _, cell = heapq.heappop(frontier)
+            if cell == goal:
+                path = [cell]
+                while cell != start:
+                    cell = came_from[cell]
+                    path.append(cell)
+                path.reverse()
+                return path, closed
+            if cell in closed:
+                continue
+            closed.add(cell)
+            if limit is not None and len(closed) > limit:
+                return None, closed
+            cost = costs[cell]
+            for offset, step, side_a, side_b in moves:
+                neighbour = cell + offset
+                if neighbour in blocked or (
+                    side_a and (cell + side_a in blocked or cell + side_b in blocked)
+                ):
+                    continue
+                total = cost + step
+                if total < costs.get(neighbour, inf):
+                    costs[neighbour] = total
+                    came_from[neighbour] = cell
+                    y, x = divmod(neighbour, stride)
+                    dx = abs(x - goal_x)
+                    dy = abs(y - goal_y)
+                    if dx > dy:
+                        remaining = straight * dx + diagonal * dy
+                    else:
+                        remaining = straight * dy + diagonal * dx
+                    heapq.heappush(frontier, (total + remaining, remaining, neighbour))
+        return None, closed
+
+
+class FlowField:
+    """Direction to a goal cell from every cell that can reach it
+
+    The field is a Dijkstra search outwards from the goal that only runs as
+    far as the cells asked about so far, and resumes when an agent asks from
+    further away. Pausing doesn't change the order cells are settled in, so
+    the result is the same as searching the whole grid up front.
+    """
+
+    __slots__ = ("grid", "goal", "next_cells", "_costs", "_candidates", "_frontier")
+
+    def __init__(self, grid: WalkabilityGrid, goal: int):
+        self.grid = grid
+        self.goal = goal
+        # Settled cells, mapped to the neighbour to step to (-1 at the goal)
+        self.next_cells: dict[int, int] = {}
+        self._costs = {goal: 0.0}
+        self._candidates = {goal: -1}
+        self._frontier = [(0.0, goal)]
+
+    def next_cell(self, cell: int) -> int:
+        """The cell to step to from `cell`, or -1 if it can't reach the goal"""
+        found = self.next_cells.get(cell)
+        if found is not None:
+            return found
+
+        next_cells = self.next_cells
+        costs = self._costs
+        candidates = self._candidates
+        frontier = self._frontier
+        blocked = self.grid.blocked
+        moves = self.grid.moves
+        while frontier:
+            cost, settled = heapq.heappop(frontier)
+            if settled in next_cells:
+                continue
+            next_cells[settled] = candidates.pop(settled)
+            del costs[settled]
+            for offset, step, side_a, side_b in moves:
+                neighbour = settled + offset
+                if neighbour in blocked or neighbour in next_cells:
+                    continue
+                if side_a and (
+                    settled + side_a in blocked or settled + side_b in blocked
+                ):
+                    continue
+                total = cost + step
+                if total < costs.get(neighbour, inf):
+                    costs[neighbour] = total
+                    candidates[neighbour] = settled
+                    heapq.heappush(frontier, (total, neighbour))
+            if settled == cell:
+                return next_cells[cell]
+        return -1
+
+    @property
+    def size(self) -> int:
+        """Cells the field holds, settled or on its frontier"""
+        return len(self.next_cells) + len(self._costs)
+
+
+class Route:
+    """An agent's way to a goal cell, kept on its state for the whole trip
+
+    A route visits one waypoint in each block of cells it crosses. The legs
+    between waypoints are planned as the agent reaches them and shared by
+    every agent walking the same leg, so the route itself only holds the
+    current leg and its position along it. Routes without `waypoints` follow
+    the goal's flow field instead. The last steering target is kept as well,
+    since it only changes when the agent changes cells.
+
+    `version` is the navigator's change count when the route was last checked
+    against the layout; `blocks` and `leg_blocks` are the blocks whose changes
+    invalidate the route or its current leg.
+    """
+
+    __slots__ = (
+        "version",
+        "goal",
+        "waypoints",
+        "blocks",
+        "leg",
+        "path",
+        "leg_blocks",
+        "step",
+        "cell",
+        "destination",
+        "target",
+    )
+
+    def __init__(
+        self,
+        version: int,
+        goal: int,
+        waypoints: tuple[int, ...] | None,
+        blocks: tuple[int, ...] = (),
+    ):
+        self.version = version
+        self.goal = goal
+        self.waypoints = waypoints
+        self.blocks = blocks
+        self.leg = 0  # Waypoint the agent is heading for
+        self.path: tuple[int, ...] | None = None  # Cells of the current leg
+        self.leg_blocks: tuple[int, ...] = ()
+        self.step = 0  # Position along `path`
+        self.cell = -1
+        self.destination: tuple[float, float] | None = None
+        self.target = (0.0, 0.0)
+
+
+class Navigator:
+    """Routes agents around buildings on a walkability grid
+
+    Trips to a building entrance follow a flow field shared by every agent
+    heading there, once the entrance has been the goal of `min_field_trips`
+    trips; fields are kept in an LRU cache of at most `max_fields` fields and
+    `max_field_cells` cells. Other trips first search a coarse grid of blocks
+    of `block_cells` cells for the blocks to cross, then walk between one
+    waypoint per block. The legs between waypoints are short A* searches,
+    cached in an LRU of at most `max_leg_cells` cells, so agents crossing the
+    same blocks share them. Either way, the choice is kept for the whole trip.
+
+    The grid follows buildings as they are added and removed. A change only
+    drops the waypoints of the blocks it touches, the legs whose search
+    looked at those blocks, and the fields that have reached its cells; each
+    block remembers the last change to it, so routes are re-planned only if
+    one of their waypoints' blocks changed since they were last checked.
+
+    `steer` turns an agent's destination into the point to walk towards this
+    tick. It only depends on which cell the agent is in, so the last point is
+    kept on the agent's route until it changes cells.
+    """
+
+    def __init__(
+        self,
+        city: "City",
+        cell_size: float = 20.0,
+        max_fields: int = 64,
+        max_field_cells: int = 100_000,
+        min_field_trips: int = 8,
+        block_cells: int = 8,
+        max_leg_cells: int = 100_000,
+    ):
+        self.city = city
+        self.cell_size = cell_size
+        self.max_fields = max_fields
+        self.max_field_cells = max_field_cells
+        self.min_field_trips = min_field_trips
+        self.block_cells = block_cells
+        self.max_leg_cells = max_leg_cells
+        # Legs only span neighbouring blocks; give up on any that wander further
+        self.leg_search_limit = 16 * block_cells * block_cells
+        self.changes = 0  # Buildings added or removed so far
+        self.block_changes: dict[int, int] = {}  # Last change touching each block
+        self.grid = WalkabilityGrid(city.width, city.height, [], cell_size)
+        self.block_cols = ceil(self.grid.cols / block_cells)
+        self.block_rows = ceil(self.grid.rows / block_cells)
+        self.fields: OrderedDict[int, FlowField] = OrderedDict()
+        # Routes planned to each entrance cell, to tell which deserve a field
+        self.trips: dict[int, int] = {}
+        # Walkable cell nearest the middle of each block, or -1 if there is none
+        self.waypoints: dict[int, int] = {}
+        self.block_links: dict[int, list[tuple[int, int, int, int]]] = {}
+        # Each leg's cells and the blocks its search looked at
+        self.legs: OrderedDict[
+            tuple[int, int], tuple[tuple[int, ...], tuple[int, ...]]
+        ] = OrderedDict()
+        self.legs_by_block: dict[int, set[tuple[int, int]]] = {}
+        self.leg_cells = 0
+
+    def add_building(self, building: "Building"):
+        self.grid.add_building(building)
+        self._invalidate(building)
+
+    def remove_building(self, building: "Building"):
+        self.grid.remove_building(building)
+        self._invalidate(building)
+
+    def _invalidate(self, building: "Building"):
+        """Drop cached fields, legs and waypoints depending on a building's cells"""
+        grid = self.grid
+        entrance = grid.cell_of(building.entrance)
+        cells = {entrance, *grid.cells_covered(building)}
+        self.changes += 1
+        blocks = {self._block_of(cell) for cell in cells}
+        for block in blocks:
+            self.block_changes[block] = self.changes
+            self.waypoints.pop(block, None)
+            for key in self.legs_by_block.pop(block, ()):
+                self._drop_leg(key)
+            # Links hold the waypoints of the neighbouring blocks
+            self.block_links.pop(block, None)
+            block_y, block_x = divmod(block, self.block_cols)
+            for dx, dy in BLOCK_MOVES:
+                if (
+                    0 <= block_x + dx < self.block_cols
+                    and 0 <= block_y + dy < self.block_rows
+                ):
+                    self.block_links.pop(block + dy * self.block_cols + dx, None)
+        # A field has looked at a cell once it settled the cell or a neighbour
+        nearby = {cell + move[0] for cell in cells for move in grid.moves} | cells
+        for goal, field in list(self.fields.items()):
+            if not nearby.isdisjoint(field.next_cells):
+                del self.fields[goal]
+        # Trips to an entrance only count for the building there
+        self.trips.pop(entrance, None)
+
+    def flow_field(self, goal: int) -> FlowField:
+        """The shared flow field towards a goal cell"""
+        field = self.fields.get(goal)
+        if field is not None:
+            self.fields.move_to_end(goal)
+            return field
+        field = self.fields[goal] = FlowField(self.grid, goal)
+        if len(self.fields) > self.max_fields:
+            self.fields.popitem(last=False)
+        return field
+
+    def _field_next_cell(self, goal: int, cell: int) -> int:
+        """Next cell on the goal's flow field, evicting fields over the cell budget"""
+        field = self.flow_field(goal)
+        size = len(field.next_cells)
+        next_cell = field.next_cell(cell)
+        if len(field.next_cells) != size:
+            # The field grew; drop the least recently used others until it fits
+            total = sum(other.size for other in self.fields.values())
+            while total > self.max_field_cells and len(self.fields) > 1:
+                _, dropped = self.fields.popitem(last=False)
+                total -= dropped.size
+        return next_cell
+
+    def _block_of(self, cell: int) -> int:
+        y, x = divmod(cell, self.grid.stride)
+        size = self.block_cells
+        return (y - 1) // size * self.block_cols + (x - 1) // size
+
+    def _waypoint(self, block: int) -> int:
+        """The walkable cell nearest the middle of a block, or -1 if all are blocked"""
+        waypoint = self.waypoints.get(block)
+        if waypoint is not None:
+            return waypoint
+        grid = self.grid
+        size = self.block_cells
+        block_y, block_x = divmod(block, self.block_cols)
+        x0, y0 = block_x * size, block_y * size
+        x1, y1 = min(x0 + size, grid.cols), min(y0 + size, grid.rows)
+        middle_x, middle_y = (x0 + x1 - 1) / 2, (y0 + y1 - 1) / 2
+        candidates = [
+            ((x - middle_x) ** 2 + (y - middle_y) ** 2, cell)
+            for y in range(y0, y1)
+            for x in range(x0, x1)
+            if (cell := (y + 1) * grid.stride + x + 1) not in grid.blocked
+        ]
+        waypoint = self.waypoints[block] = min(candidates)[1] if candidates else -1
+        return waypoint
+
+    def _links(self, block: int) -> list[tuple[int, int, int, int]]:
+        """Neighbouring blocks, with their waypoint and its cell coordinates"""
+        links = self.block_links.get(block)
+        if links is not None:
+            return links
+        stride = self.grid.stride
+        block_y, block_x = divmod(block, self.block_cols)
+        links = self.block_links[block] = []
+        for dx, dy in BLOCK_MOVES:
+            if (
+                0 <= block_x + dx < self.block_cols
+                and 0 <= block_y + dy < self.block_rows
+            ):
+                neighbour = block + dy * self.block_cols + dx
+                waypoint = self._waypoint(neighbour)
+                links.append((neighbour, waypoint, *divmod(waypoint, stride)))
+        return links
+
+    def _plan_waypoints(self, start: int, goal: int) -> tuple[int, ...]:
+        """Waypoints of the blocks between `start` and `goal`, ending at `goal`
+
+        A weighted A* search over blocks, moving between the waypoints of
+        neighbouring blocks, or straight to the goal if no blocks lead there.
+        """
+        start_block = self._block_of(start)
+        goal_block = self._block_of(goal)
+        if start_block == goal_block:
+            return (goal,)
+        stride = self.grid.stride
+        goal_y, goal_x = divmod(goal, stride)
+
+        came_from: dict[int, int] = {}
+        costs = {start_block: 0.0}
+        # Cell coordinates each block is entered at: its waypoint, or the goal
+        points = {start_block: divmod(start, stride)}
+        frontier = [(0.0, start_block)]
+        closed: set[int] = set()
+        while frontier:
+            _, block = heapq.heappop(frontier)
+            if block == goal_block:
+                break
+            if block in closed:
+                continue
+            closed.add(block)
+            cost = costs[block]
+            y, x = points[block]
+            for neighbour, waypoint, point_y, point_x in self._links(block):
+                if neighbour == goal_block:
+                    point_y, point_x = goal_y, goal_x
+                elif waypoint < 0:
+                    continue
+                total = cost + sqrt((point_x - x) ** 2 + (point_y - y) ** 2)
+                if total < costs.get(neighbour, inf):
+                    costs[neighbour] = total
+                    came_from[neighbour] = block
+                    points[neighbour] = (point_y, point_x)
+                    remaining = sqrt((goal_x - point_x) ** 2 + (goal_y - point_y) ** 2)
+                    heapq.heappush(
+                        frontier, (total + ROUTE_WEIGHT * remaining, neighbour)
+                    )
+        else:
+            return (goal,)
+
+        waypoints = [goal]
+        block = came_from[goal_block]
+        while block != start_block:
+            waypoints.append(self._waypoint(block))
+            block = came_from[block]
+        waypoints.reverse()
+        return tuple(waypoints)
+
+    def _leg(self, start: int, end: int) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        """Cells from `start` to `end`, straight there if the search gives up
+
+        Also returns the blocks the search looked at, whose changes may change
+        the leg.
+        """
+        key = (start, end)
+        leg = self.legs.get(key)
+        if leg is not None:
+            self.legs.move_to_end(key)
+            return leg
+        found, searched = self.grid.search(start, end, self.leg_search_limit)
+        path = tuple(found) if found else (start, end)
+        blocks = self._blocks_around(searched | {start, end})
+        leg = self.legs[key] = (path, blocks)
+        for block in blocks:
+            self.legs_by_block.setdefault(block, set()).add(key)
+        self.leg_cells += len(path)
+        while self.leg_cells > self.max_leg_cells:
+            self._drop_leg(next(iter(self.legs)))
+        return leg
+
+    def _drop_leg(self, key: tuple[int, int]):
+        path, blocks = self.legs.pop(key)
+        self.leg_cells -= len(path)
+        for block in blocks:
+            keys = self.legs_by_block.get(block)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.legs_by_block[block]
+
+    def _blocks_around(self, cells: set[int]) -> tuple[int, ...]:
+        """Blocks overlapping the cells, or any of their neighbours"""
+        grid = self.grid
+        ys, xs = zip(*(divmod(cell, grid.stride) for cell in cells))
+        # Cell coordinates start at 1, inside the border
+        size = self.block_cells
+        x0 = (max(min(xs) - 1, 1) - 1) // size
+        x1 = (min(max(xs) + 1, grid.cols) - 1) // size
+        y0 = (max(min(ys) - 1, 1) - 1) // size
+        y1 = (min(max(ys) + 1, grid.rows) - 1) // size
+        return tuple(
+            y * self.block_cols + x
+            for y in range(y0, y1 + 1)
+            for x in range(x0, x1 + 1)
+        )
+
+    def _follow(self, route: Route, cell: int) -> int:
+        """Next cell along the route's legs, planning each leg as it is reached"""
+        assert route.waypoints is not None
+        while True:
+            path = route.path
+            if path is None:
+                path, route.leg_blocks = self._leg(cell, route.waypoints[route.leg])
+                route.path = path
+                route.step = 0
+            step = route.step
+            ahead = range(step, min(step + LOOKAHEAD + 1, len(path)))
+            # Cutting corners may skip a cell, so look a few steps ahead
+            for i in ahead:
+                if path[i] == cell:
+                    break
+            else:
+                # Pushed off the leg: step back onto it, or plan it again from here
+                nearby = {neighbour for neighbour, _ in self.grid.neighbours(cell)}
+                for i in reversed(ahead):
+                    if path[i] in nearby:
+                        return path[i]
+                route.path = None
+                continue
+            if i + 1 < len(path):
+                route.step = i
+                return path[i + 1]
+            # The end of a leg, on to the next waypoint
+            route.leg += 1
+            route.path = None
+            if route.leg == len(route.waypoints):
+                return -1
+
+    def _current(self, route: Route) -> bool:
+        """Whether a route still fits the layout, dropping its leg if that changed"""
+        if route.version == self.changes:
+            return True
+        block_changes = self.block_changes
+        if any(block_changes.get(block, 0) > route.version for block in route.blocks):
+            return False
+        if route.path is not None and any(
+            block_changes.get(block, 0) > route.version for block in route.leg_blocks
+        ):
+            route.path = None
+        route.version = self.changes
+        return True
+
+    def _route(self, goal: int, waypoints: tuple[int, ...] | None) -> Route:
+        blocks = waypoints if waypoints is not None else (goal,)
+        return Route(
+            self.changes,
+            goal,
+            waypoints,
+            tuple({self._block_of(cell) for cell in blocks}),
+        )
+
+    def _next_cell(self, agent: "Agent", cell: int, goal: int) -> int:
+        """Next cell on the agent's way to `goal`, choosing how when needed
+
+        Each trip sticks to the flow field or route it started with, so the
+        answer never changes while the agent stays in a cell.
+        """
+        route = agent.state.route
+        if route is None or route.goal != goal or not self._current(route):
+            # A new trip. Whether it gets a field only depends on the trips
+            # counted, not on which fields are cached, so routes can be saved
+            if (
+                goal in self.grid.entrances
+                and self.trips.get(goal, 0) >= self.min_field_trips
+            ):
+                route = self._route(goal, None)
+            else:
+                if goal in self.grid.entrances:
+                    self.trips[goal] = self.trips.get(goal, 0) + 1
+                route = self._route(goal, self._plan_waypoints(cell, goal))
+            agent.state.route = route
+        if route.waypoints is None:
+            return self._field_next_cell(goal, cell)
+        return self._follow(route, cell)
+
+    def export_trips(self) -> list[list[int]]:
+        """Trips counted to each entrance cell, for snapshots"""
+        return [[goal, count] for goal, count in self.trips.items()]
+
+    def import_trips(self, trips: list[list[int]]):
+        self.trips.update((goal, count) for goal, count in trips)
+
+    def export_route(self, route: Route | None) -> list | None:
+        """A route as plain data for snapshots, or None if there is none to keep
+
+        Legs are saved by the cell they start from, as planning one again
+        from there gives the same cells.
+        """
+        if route is None or not self._current(route):
+            return None
+        if route.waypoints is None:
+            return [route.goal]
+        start = route.path[0] if route.path is not None else None
+        return [route.goal, list(route.waypoints), route.leg, start, route.step]
+
+    def import_route(self, data: list) -> Route:
+        if len(data) == 1:
+            return self._route(data[0], None)
+        goal, waypoints, leg, start, step = data
+        route = self._route(goal, tuple(waypoints))
+        route.leg = leg
+        if start is not None:
+            route.path, route.leg_blocks = self._leg(start, waypoints[leg])
+            route.step = step
+        return route
+
+    def steer(self, agent: "Agent") -> tuple[float, float]:
+        """Point to walk towards on the way to the agent's destination
+
+        Returns the destination itself once nothing is in the way, and falls
+        back to it when the destination can't be reached.
+        """
+        state = agent.state
+        destination = state.destination
+        assert destination is not None
+        cell = self.grid.cell_of(state.position)
+        route = state.route
+        if (
+            route is not None
+            and route.cell == cell
+            and route.destination == destination
+            and route.version == self.changes
+        ):
+            return route.target
+        target = self._steer(agent, cell, destination)
+        route = state.route
+        if route is not None:
+            route.cell = cell
+            route.destination = destination
+            route.target = target
+        return target
+
+    def _steer(
+        self, agent: "Agent", cell: int, destination: tuple[float, float]
+    ) -> tuple[float, float]:
+        grid = self.grid
+        # Destinations inside a building are reached through its entrance
+        goal = destination
+        goal_cell = grid.cell_of(destination)
+        owner = grid.owners.get(goal_cell)
+        if owner is not None:
+            goal = owner.entrance
+            goal_cell = grid.cell_of(goal)
+            # Walk in once at the entrance, or already inside
+            if cell == goal_cell or grid.owners.get(cell) is owner:
+                return destination
+        if cell == goal_cell:
+            return goal
+
+        # Leave buildings through their entrance, too
+        inside = grid.owners.get(cell)
+        if inside is not None:
+            return inside.entrance
+
+        next_cell = self._next_cell(agent, cell, goal_cell)
+        if next_cell < 0 or next_cell == goal_cell:
+            return goal
+        return grid.center(next_cell)
+
+    def is_walkable(self, position: tuple[float, float]) -> bool:
+        """Whether agents may stand at a position, i.e. not inside a building"""
+        return self.grid.cell_of(position) not in self.grid.blocked
+
+    def steer_store(self, store: "AgentStore"):
+        """Update the store's steering targets of agents that changed cells"""
+        n = store.count
+        cells = self.grid.cells_of(store.positions[:n])
+        if store.target_version != self.changes:
+            store.target_cells[:n] = -1
+            store.target_version = self.changes
+        stale = store.has_destination[:n] & (cells != store.target_cells[:n])
+        for row in np.flatnonzero(stale):
+            store.targets[row] = self.steer(store.agents[row])
+        store.target_cells[:n] = cells
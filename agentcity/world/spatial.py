@@ -0,0 +1,297 @@
+import heapq
+from collections.abc import Callable, Hashable, Iterator
+from math import floor
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pygame
+
+    from ..entities.building import Building
+
+Cell = tuple[int, int]
+
+
+class PointGrid[T: Hashable]:
+    """Uniform grid of point items supporting nearest-neighbour queries
+
+    Items are bucketed by the cell containing their position. Nearest queries
+    search outwards ring by ring and stop as soon as no unvisited ring can hold
+    anything closer, so their cost depends on local density rather than on the
+    total number of items. Ties are broken by insertion order.
+    """
+
+    def __init__(self, cell_size: float = 100.0):
+        self.cell_size = cell_size
+        self.cells: dict[Cell, list[T]] = {}
+        self.positions: dict[T, tuple[float, float]] = {}
+        self._order: dict[T, int] = {}
+        self._next_order = 0
+        # Bounds of cells ever occupied, used to terminate searches
+        self._min_cell: Cell | None = None
+        self._max_cell: Cell | None = None
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self.positions
+
+    def cell_of(self, position: tuple[float, float]) -> Cell:
+        return (
+            floor(position[0] / self.cell_size),
+            floor(position[1] / self.cell_size),
+        )
+
+    def insert(self, item: T, position: tuple[float, float]):
+        """Add an item at the given position"""
+        cell = self.cell_of(position)
+        self.cells.setdefault(cell, []).append(item)
+        self.positions[item] = position
+        self._order[item] = self._next_order
+        self._next_order += 1
+        self._extend_bounds(cell)
+
+    def _extend_bounds(self, cell: Cell):
+        if self._min_cell is None or self._max_cell is None:
+            self._min_cell = self._max_cell = cell
+        else:
+            self._min_cell = (
+                min(self._min_cell[0], cell[0]),
+                min(self._min_cell[1], cell[1]),
+            )
+            self._max_cell = (
+                max(self._max_cell[0], cell[0]),
+                max(self._max_cell[1], cell[1]),
+            )
+
+    def remove(self, item: T):
+        """Remove an item, if present"""
+        position = self.positions.pop(item, None)
+        if position is None:
+            return
+        del self._order[item]
+        cell = self.cell_of(position)
+        bucket = self.cells[cell]
+        bucket.remove(item)
+        if not bucket:
+            del self.cells[cell]
+
+    def move(self, item: T, position: tuple[float, float]):
+        """Update the position of an item, re-bucketing it only if its cell changed"""
+        old_position = self.positions.get(item)
+        if old_position is None:
+            self.insert(item, position)
+            return
+        old_cell = self.cell_of(old_position)
+        new_cell = self.cell_of(position)
+        self.positions[item] = position
+        if old_cell != new_cell:
+            bucket = self.cells[old_cell]
+            bucket.remove(item)
+            if not bucket:
+                del self.cells[old_cell]
+            self.cells.setdefault(new_cell, []).append(item)
+            self._extend_bounds(new_cell)
+
+    def _ring(self, center: Cell, radius: int) -> Iterator[Cell]:
+        """Cells at exactly Chebyshev distance `radius` from `center`"""
+        cx, cy = center
+        if radius == 0:
+            yield center
+            return
+        for x in range(cx - radius, cx + radius + 1):
+            yield (x, cy - radius)
+            yield (x, cy + radius)
+        for y in range(cy - radius + 1, cy + radius):
+            yield (cx - radius, y)
+            yield (cx + radius, y)
+
+    def _max_radius(self, center: Cell) -> int:
+        if self._min_cell is None or self._max_cell is None:
+            return -1
+        return max(
+            abs(center[0] - self._min_cell[0]),
+            abs(center[0] - self._max_cell[0]),
+            abs(center[1] - self._min_cell[1]),
+            abs(center[1] - self._max_cell[1]),
+        )
+
+    def k_nearest(
+        self,
+        position: tuple[float, float],
+        k: int,
+        predicate: Callable[[T], bool] | None = None,
+    ) -> list[T]:
+        """Return up to `k` items closest to `position`, nearest first
+
+        If a predicate is given, only items for which it returns True count.
+        """
+        if k <= 0 or not self.positions:
+            return []
+
+        px, py = position
+        center = self.cell_of(position)
+        # Max-heap (by negated key) of the best k candidates found so far
+        best: list[tuple[float, int, int, T]] = []
+        counter = 0
+
+        for radius in range(self._max_radius(center) + 1):
+            for cell in self._ring(center, radius):
+                for item in self.cells.get(cell, ()):
+                    if predicate is not None and not predicate(item):
+                        continue
+                    ix, iy = self.positions[item]
+                    dist_sq = (ix - px) ** 2 + (iy - py) ** 2
+                    entry = (-dist_sq, -self._order[item], counter, item)
+                    counter += 1
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        heapq.heapreplace(best, entry)
+
+            # Cells in the next ring are at least `radius` cells away
+            if len(best) == k:
+                bound = radius * self.cell_size
+                if -best[0][0] < bound * bound:
+                    break
+
+        return [entry[3] for entry in sorted(best, reverse=True)]
+
+    def nearest(
+        self,
+        position: tuple[float, float],
+        predicate: Callable[[T], bool] | None = None,
+    ) -> T | None:
+        """Return the item closest to `position`, or None"""
+        found = self.k_nearest(position, 1, predicate)
+        return found[0] if found else None
+
+    def within_radius(self, position: tuple[float, float], radius: float) -> list[T]:
+        """Return all items within `radius` of `position`"""
+        px, py = position
+        radius_sq = radius * radius
+        x0, y0 = self.cell_of((px - radius, py - radius))
+        x1, y1 = self.cell_of((px + radius, py + radius))
+        found = []
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                for item in self.cells.get((x, y), ()):
+                    ix, iy = self.positions[item]
+                    if (ix - px) ** 2 + (iy - py) ** 2 <= radius_sq:
+                        found.append(item)
+        return found
+
+    def within_rect(self, rect: "pygame.Rect") -> list[T]:
+        """Return all items positioned inside `rect`"""
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        found = []
+        for cell in _cells_overlapping(rect, self.cell_size, self.cells):
+            for item in self.cells[cell]:
+                x, y = self.positions[item]
+                if left <= x < right and top <= y < bottom:
+                    found.append(item)
+        return found
+
+
+def _cells_overlapping(
+    rect: "pygame.Rect", cell_size: float, cells: dict[Cell, list]
+) -> list[Cell]:
+    """Occupied cells that overlap `rect`
+
+    Walks the cells covered by the rectangle, or the occupied cells when
+    there are fewer of those, so huge rectangles cost no more than a scan.
+    """
+    x0 = floor(rect.left / cell_size)
+    y0 = floor(rect.top / cell_size)
+    x1 = floor((rect.right - 1) / cell_size)
+    y1 = floor((rect.bottom - 1) / cell_size)
+    if (x1 - x0 + 1) * (y1 - y0 + 1) > len(cells):
+        return [(x, y) for x, y in cells if x0 <= x <= x1 and y0 <= y <= y1]
+    return [
+        (x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1) if (x, y) in cells
+    ]
+
+
+class BuildingIndex:
+    """Spatial index over a city's buildings
+
+    Building rectangles are registered in every grid cell they overlap, so a
+    point lookup only tests the few buildings sharing its cell. Entrances are
+    additionally partitioned by building type into point grids for
+    nearest-of-type queries. Both structures update incrementally.
+    """
+
+    def __init__(self, cell_size: float = 100.0):
+        self.cell_size = cell_size
+        self.cells: dict[Cell, list[Building]] = {}
+        self.entrances_by_type: dict[str, PointGrid[Building]] = {}
+
+    def _cells_covering(self, building: "Building") -> Iterator[Cell]:
+        rect = building.rect
+        x0 = floor(rect.left / self.cell_size)
+        y0 = floor(rect.top / self.cell_size)
+        # Rects are half-open, so the right/bottom edge itself is not covered
+        x1 = floor((rect.right - 1) / self.cell_size)
+        y1 = floor((rect.bottom - 1) / self.cell_size)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield (x, y)
+
+    def add(self, building: "Building"):
+        """Register a building in the index"""
+        for cell in self._cells_covering(building):
+            self.cells.setdefault(cell, []).append(building)
+
+        type_name = building.building_type.name
+        if type_name not in self.entrances_by_type:
+            self.entrances_by_type[type_name] = PointGrid(self.cell_size)
+        self.entrances_by_type[type_name].insert(building, building.entrance)
+
+    def remove(self, building: "Building"):
+        """Remove a building from the index"""
+        for cell in self._cells_covering(building):
+            bucket = self.cells.get(cell)
+            if bucket and building in bucket:
+                bucket.remove(building)
+                if not bucket:
+                    del self.cells[cell]
+
+        entrances = self.entrances_by_type.get(building.building_type.name)
+        if entrances is not None:
+            entrances.remove(building)
+
+    def within_rect(self, rect: "pygame.Rect") -> list["Building"]:
+        """Return all buildings overlapping `rect`"""
+        found: dict[Building, None] = {}
+        for cell in _cells_overlapping(rect, self.cell_size, self.cells):
+            for building in self.cells[cell]:
+                if building not in found and building.rect.colliderect(rect):
+                    found[building] = None
+        return list(found)
+
+    def building_at(self, position: tuple[float, float]) -> "Building | None":
+        """Return the building containing the given point, if any"""
+        cell = (
+            floor(position[0] / self.cell_size),
+            floor(position[1] / self.cell_size),
+        )
+        for building in self.cells.get(cell, ()):
+            if building.rect.collidepoint(position):
+                return building
+        return None
+
+    def k_nearest_of_type(
+        self, position: tuple[float, float], building_type: str, k: int
+    ) -> list["Building"]:
+        """Return up to `k` buildings of a type, ordered by entrance distance"""
+        entrances = self.entrances_by_type.get(building_type)
+        if entrances is None:
+            return []
+        return entrances.k_nearest(position, k)
+
+    def nearest_of_type(
+        self, position: tuple[float, float], building_type: str
+    ) -> "Building | None":
+        """Return the building of a type whose entrance is closest"""
+        found = self.k_nearest_of_type(position, building_type, 1)
+        return found[0] if found else None
@@ -0,0 +1,130 @@
+"""Memory footprint per agent and per building
+
+Run from the repository root:
+
+    python -m benchmarks.memory                       # 10k agents, 1k buildings
+    python -m benchmarks.memory --agents 100000 -o mem.json
+
+Memory is measured with tracemalloc as the growth in traced Python
+allocations while buildings, then agents, are added to an empty city. Agents
+are measured again after running some ticks, once their random streams and
+behavior state are in use.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+from datetime import UTC, datetime
+
+from agentcity.world.city import City
+
+from .scenarios import add_agents, build_city
+
+TICKS_PER_HOUR = 60
+
+
+def measure(
+    agents: int,
+    buildings: int,
+    ticks: int,
+    use_agent_store: bool = False,
+    lazy_needs: bool = False,
+    navigation: bool = False,
+) -> dict:
+    """Return bytes per building, per agent when added and per agent after `ticks`"""
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        city = build_city(
+            0,
+            buildings,
+            use_agent_store=use_agent_store,
+            lazy_needs=lazy_needs,
+            navigation=navigation,
+        )
+        after_buildings = tracemalloc.get_traced_memory()[0]
+
+        add_agents(city, agents)
+        after_agents = tracemalloc.get_traced_memory()[0]
+
+        run_ticks(city, ticks)
+        after_ticks = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "agents": agents,
+        "buildings": buildings,
+        "ticks": ticks,
+        "bytes_per_building": (after_buildings - start) / max(buildings, 1),
+        "bytes_per_agent": (after_agents - after_buildings) / max(agents, 1),
+        "bytes_per_agent_after_ticks": (after_ticks - after_buildings) / max(agents, 1),
+    }
+
+
+def run_ticks(city: City, ticks: int):
+    for _ in range(ticks):
+        city.update("morning", 8, TICKS_PER_HOUR)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=10_000)
+    parser.add_argument("--buildings", type=int, default=1_000)
+    parser.add_argument(
+        "--ticks",
+        type=int,
+        default=TICKS_PER_HOUR,
+        help="Ticks to run before measuring agents again",
+    )
+    parser.add_argument(
+        "--agent-store", action="store_true", help="Use the NumPy agent store"
+    )
+    parser.add_argument(
+        "--lazy-needs", action="store_true", help="Evaluate needs in closed form"
+    )
+    parser.add_argument(
+        "--navigation",
+        action="store_true",
+        help="Route agents around buildings instead of moving in straight lines",
+    )
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    result = measure(
+        args.agents,
+        args.buildings,
+        args.ticks,
+        args.agent_store,
+        args.lazy_needs,
+        args.navigation,
+    )
+    print(f"{result['bytes_per_building']:>10,.0f} bytes per building")
+    print(f"{result['bytes_per_agent']:>10,.0f} bytes per agent")
+    print(
+        f"{result['bytes_per_agent_after_ticks']:>10,.0f} bytes per agent "
+        f"after {args.ticks} ticks"
+    )
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": datetime.now(UTC).isoformat(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "agent_store": args.agent_store,
+                "lazy_needs": args.lazy_needs,
+                "navigation": args.navigation,
+            },
+            "result": result,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+from math import ceil, sqrt
+
+from agentcity.entities.agent import Agent
+from agentcity.entities.building import BUILDING_TYPES, Building
+from agentcity.world.city import City
+
+# Share of each building type in generated benchmark cities
+BUILDING_MIX = ["house", "house", "restaurant", "park"]
+LOT_SIZE = 200  # Each building sits on a square lot of this many pixels
+
+
+def build_city(
+    agents: int,
+    buildings: int,
+    seed: int = 0,
+    use_agent_store: bool = False,
+    lazy_needs: bool = False,
+    navigation: bool = False,
+) -> City:
+    """Build a city with the given number of agents and buildings on a square grid
+
+    Buildings get one lot each, so density stays the same as the city grows.
+    Agents are placed uniformly at random.
+    """
+    lots_per_side = max(1, ceil(sqrt(buildings)))
+    size = lots_per_side * LOT_SIZE
+    city = City(
+        size,
+        size,
+        use_agent_store=use_agent_store,
+        create_layout=False,
+        seed=seed,
+        lazy_needs=lazy_needs,
+        navigation=navigation,
+    )
+
+    for i in range(buildings):
+        row, col = divmod(i, lots_per_side)
+        building_type = BUILDING_TYPES[BUILDING_MIX[i % len(BUILDING_MIX)]]
+        city.add_building(
+            Building(
+                building_type,
+                position=(col * LOT_SIZE + 40, row * LOT_SIZE + 40),
+                size=(120, 100),
+                rng=city.layout_rng,
+            )
+        )
+
+    add_agents(city, agents)
+    return city
+
+
+def add_agents(city: City, agents: int):
+    """Add agents placed uniformly at random over the city"""
+    placement = city.rng.stream("benchmark-agents")
+    for i in range(agents):
+        position = (
+            placement.randint(0, city.width - 1),
+            placement.randint(0, city.height - 1),
+        )
+        city.add_agent(Agent(f"Agent {i}", position))
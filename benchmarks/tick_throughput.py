@@ -0,0 +1,262 @@
+"""Tick throughput benchmarks across agent and building counts
+
+Run from the repository root:
+
+    python -m benchmarks.tick_throughput                    # quick matrix
+    python -m benchmarks.tick_throughput --full -o out.json # full matrix
+    python -m benchmarks.tick_throughput --baseline benchmarks/baseline.json
+
+Each case reports operations per second; for tick-based cases that is
+ticks/sec, and agent-ticks/sec is also reported. Comparing against a baseline
+exits with status 1 if any case got slower than the allowed tolerance.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from agentcity.ai.behaviors.needs import EatBehavior
+from agentcity.world.city import City
+
+from .scenarios import build_city
+
+QUICK_MATRIX = [(4, 8), (100, 100), (1_000, 1_000)]
+FULL_MATRIX = [
+    (agents, buildings)
+    for agents in (4, 100, 1_000, 10_000, 100_000)
+    for buildings in (8, 100, 1_000, 10_000)
+]
+
+TICKS_PER_HOUR = 60
+
+
+def measure(run: Callable[[], int], min_time: float) -> tuple[float, int]:
+    """Call `run` until `min_time` seconds have passed; return (seconds, operations)"""
+    operations = 0
+    start = time.perf_counter()
+    while True:
+        operations += run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed, operations
+
+
+def bench_city_update(city: City) -> Callable[[], int]:
+    def run() -> int:
+        city.update("morning", 8, TICKS_PER_HOUR)
+        return 1
+
+    return run
+
+
+def bench_agent_update(city: City) -> Callable[[], int]:
+    building_types = city.available_building_types
+
+    def run() -> int:
+        for agent in city.agents:
+            agent.update("morning", building_types)
+        return 1
+
+    return run
+
+
+def bench_need_activation(city: City) -> Callable[[], int]:
+    agents = city.agents[:1000]
+    behavior = EatBehavior()
+
+    def run() -> int:
+        for agent in agents:
+            behavior.update(agent)
+            # Release the claim so every activation searches the same city
+            using_object = agent.behavior_state.using_object
+            if using_object:
+                using_object.release(agent.name)
+            behavior.deactivate(agent)
+            agent.state.destination = None
+        return len(agents)
+
+    return run
+
+
+def bench_building_at(city: City) -> Callable[[], int]:
+    rng = city.rng.stream("benchmark-lookups")
+    points = [
+        (rng.randint(0, city.width), rng.randint(0, city.height)) for _ in range(1000)
+    ]
+
+    def run() -> int:
+        for point in points:
+            city.get_building_at_position(point)
+        return len(points)
+
+    return run
+
+
+def bench_nearest_of_type(city: City) -> Callable[[], int]:
+    rng = city.rng.stream("benchmark-lookups")
+    points = [
+        (rng.randint(0, city.width), rng.randint(0, city.height)) for _ in range(1000)
+    ]
+
+    def run() -> int:
+        for point in points:
+            city.get_nearest_building_of_type(point, "Restaurant")
+        return len(points)
+
+    return run
+
+
+# Case name -> (benchmark factory, whether each operation is one tick)
+CASES: dict[str, tuple[Callable[[City], Callable[[], int]], bool]] = {
+    "city_update": (bench_city_update, True),
+    "agent_update": (bench_agent_update, True),
+    "need_activation": (bench_need_activation, False),
+    "building_at_position": (bench_building_at, False),
+    "nearest_building_of_type": (bench_nearest_of_type, False),
+}
+
+
+def run_benchmarks(
+    matrix: list[tuple[int, int]],
+    cases: list[str],
+    min_time: float,
+    use_agent_store: bool,
+    lazy_needs: bool = False,
+    navigation: bool = False,
+) -> list[dict]:
+    results = []
+    for agents, buildings in matrix:
+        for case in cases:
+            factory, per_tick = CASES[case]
+            # Fresh city per case, so earlier cases don't change later ones
+            city = build_city(
+                agents,
+                buildings,
+                use_agent_store=use_agent_store,
+                lazy_needs=lazy_needs,
+                navigation=navigation,
+            )
+            elapsed, operations = measure(factory(city), min_time)
+            rate = operations / elapsed
+            result = {
+                "case": case,
+                "agents": agents,
+                "buildings": buildings,
+                "ops_per_sec": rate,
+            }
+            if per_tick:
+                result["ticks_per_sec"] = rate
+                result["agent_ticks_per_sec"] = rate * agents
+            results.append(result)
+
+            extra = f" ({rate * agents:,.0f} agent-ticks/s)" if per_tick else ""
+            print(
+                f"{case:26s} agents={agents:<7d} buildings={buildings:<6d} "
+                f"{rate:>12,.1f} ops/s{extra}"
+            )
+    return results
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Return a description of every case slower than baseline by more than tolerance"""
+    baseline_rates = {
+        (r["case"], r["agents"], r["buildings"]): r["ops_per_sec"] for r in baseline
+    }
+    regressions = []
+    for result in results:
+        key = (result["case"], result["agents"], result["buildings"])
+        if key not in baseline_rates:
+            continue
+        old, new = baseline_rates[key], result["ops_per_sec"]
+        change = new / old - 1.0
+        if change < -tolerance:
+            regressions.append(
+                f"{key[0]} agents={key[1]} buildings={key[2]}: "
+                f"{old:,.1f} -> {new:,.1f} ops/s ({change:+.1%})"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--full", action="store_true", help="Run the full matrix")
+    parser.add_argument(
+        "--case",
+        action="append",
+        choices=sorted(CASES),
+        help="Only run the given case (may be repeated)",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.5,
+        help="Minimum seconds to run each case",
+    )
+    parser.add_argument(
+        "--agent-store", action="store_true", help="Use the NumPy agent store"
+    )
+    parser.add_argument(
+        "--lazy-needs", action="store_true", help="Evaluate needs in closed form"
+    )
+    parser.add_argument(
+        "--navigation",
+        action="store_true",
+        help="Route agents around buildings instead of moving in straight lines",
+    )
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against results in this JSON file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Allowed slowdown relative to the baseline (default: 0.1 = 10%%)",
+    )
+    args = parser.parse_args(argv)
+
+    matrix = FULL_MATRIX if args.full else QUICK_MATRIX
+    cases = args.case or list(CASES)
+    results = run_benchmarks(
+        matrix,
+        cases,
+        args.min_time,
+        args.agent_store,
+        args.lazy_needs,
+        args.navigation,
+    )
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": datetime.now(UTC).isoformat(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "agent_store": args.agent_store,
+                "lazy_needs": args.lazy_needs,
+                "navigation": args.navigation,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Wrote results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import pytest
+
+from agentcity.engine.headless import HeadlessSimulation
+from agentcity.entities.agent import Agent
+from agentcity.world.agent_store import np
+
+# Option sets that must each reproduce the same runs; the agent store needs numpy
+MODES = [
+    pytest.param({}, id="plain"),
+    pytest.param({"lazy_needs": True}, id="lazy"),
+    pytest.param(
+        {"use_agent_store": True},
+        id="store",
+        marks=pytest.mark.skipif(np is None, reason="numpy is not installed"),
+    ),
+    pytest.param({"navigation": True}, id="navigation"),
+]
+
+
+def make_simulation(seed: int = 3, agents: int = 60, **options) -> HeadlessSimulation:
+    simulation = HeadlessSimulation(seed=seed, **options)
+    for i in range(agents):
+        simulation.city.add_agent(Agent(f"A{i}", simulation.city.get_random_position()))
+    return simulation
+
+
+def walk(agent: Agent, ticks: int = 2000) -> list[tuple[float, float]]:
+    """Move an agent until it arrives, returning the positions it passed"""
+    positions = []
+    for _ in range(ticks):
+        if agent.state.destination is None:
+            break
+        agent.move()
+        positions.append(agent.state.position)
+    return positions
+
+
+def advance(simulation: HeadlessSimulation, ticks: int):
+    for _ in range(ticks):
+        simulation.step()
+
+
+def agent_states(city, digits: int | None = None) -> list[tuple]:
+    """Everything about the agents that a diverging run would show up in
+
+    Needs may be rounded to `digits`, past the rounding errors of needs
+    integrated in closed form or in a different order.
+    """
+    return [
+        (
+            agent.name,
+            tuple(map(float, agent.state.position)),
+            agent.state.current_action,
+            [
+                float(need.current) if digits is None else round(need.current, digits)
+                for need in agent.needs.needs.values()
+            ],
+        )
+        for agent in city.agents
+    ]
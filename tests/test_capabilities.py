@@ -0,0 +1,39 @@
+from agentcity.entities.building import BUILDING_TYPES, Building
+from agentcity.world.city import City
+
+ENERGY_DECAY = 5.0  # Benches rest no faster than energy decays
+
+
+def city_with_house_and_park() -> tuple[City, Building, Building]:
+    city = City(2000, 600, seed=1, create_layout=False)
+    house = Building(
+        BUILDING_TYPES["house"], (1700, 100), (60, 80), rng=city.layout_rng
+    )
+    park = Building(BUILDING_TYPES["park"], (50, 100), (150, 100), rng=city.layout_rng)
+    city.add_building(house)
+    city.add_building(park)
+    return city, house, park
+
+
+def test_nearest_object_fast_enough_is_found():
+    city, house, park = city_with_house_and_park()
+
+    found = city.find_free_object("resting_place", (100.0, 300.0))
+    assert found is not None and found[0] is park
+
+    found = city.find_free_object("resting_place", (100.0, 300.0), ENERGY_DECAY)
+    assert found is not None
+    building, obj = found
+    assert building is house and obj.name == "bed"
+
+
+def test_slow_objects_are_not_found_when_fast_ones_are_taken():
+    city, house, _ = city_with_house_and_park()
+    bed = next(obj for obj in house.objects if obj.name == "bed")
+    for i in range(bed.capacity["resting_place"]):
+        assert bed.reserve(f"A{i}", "resting_place")
+
+    found = city.find_free_object("resting_place", (100.0, 300.0), ENERGY_DECAY)
+    assert found is None
+    found = city.find_queue("resting_place", (100.0, 300.0), ENERGY_DECAY)
+    assert found is not None and found[0] is house
@@ -0,0 +1,59 @@
+from collections import Counter
+
+from agentcity.engine.headless import HeadlessSimulation
+from agentcity.entities.agent import Agent
+from agentcity.entities.building import BUILDING_TYPES, Building
+from agentcity.entities.objects import OBJECT_TYPES, WorldObject
+from agentcity.world.city import City
+from tests.helpers import advance
+
+
+def test_released_slot_goes_to_the_first_agent_in_line():
+    obj = WorldObject("bed", (0.0, 0.0), list(OBJECT_TYPES["bed"]))
+    granted = []
+    assert obj.reserve("A", "resting_place")
+    obj.enqueue("B", "resting_place", lambda: granted.append("B"))
+    obj.enqueue("C", "resting_place", lambda: granted.append("C"))
+    assert not obj.reserve("D", "resting_place")
+
+    obj.release("A")
+    assert granted == ["B"]
+    assert obj.occupants == {"B": "resting_place"}
+    assert obj.queue_length("resting_place") == 1
+
+
+def test_queued_agents_still_eat():
+    # One house: a single bed for four exhausted agents, and a free kitchen
+    city = City(400, 300, seed=1, create_layout=False)
+    city.add_building(
+        Building(BUILDING_TYPES["house"], (150, 100), (60, 80), rng=city.layout_rng)
+    )
+    for i in range(4):
+        agent = Agent(f"A{i}", (100.0 + 50 * i, 250.0))
+        agent.needs.needs["energy"].current = 0.0
+        agent.needs.needs["hunger"].current = 40.0
+        city.add_agent(agent)
+    simulation = HeadlessSimulation(city=city)
+
+    actions: dict[str, set[str]] = {agent.name: set() for agent in city.agents}
+    for _ in range(1500):
+        advance(simulation, 1)
+        for agent in city.agents:
+            actions[agent.name].add(agent.state.current_action)
+    waited = [name for name, seen in actions.items() if "queuing_energy" in seen]
+    assert waited
+    for name in waited:
+        assert "using_hunger" in actions[name]
+
+
+def test_objects_stay_within_capacity():
+    simulation = HeadlessSimulation(seed=5)
+    for i in range(80):
+        simulation.city.add_agent(Agent(f"A{i}", simulation.city.get_random_position()))
+    for _ in range(50):
+        advance(simulation, 20)
+        for building in simulation.city.buildings:
+            for obj in building.objects:
+                in_use = Counter(obj.occupants.values())
+                for capability, capacity in obj.capacity.items():
+                    assert in_use[capability] <= capacity
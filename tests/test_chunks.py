@@ -0,0 +1,55 @@
+import pygame
+
+from agentcity.world.chunks import EVICT_AFTER, STREAM_INTERVAL
+from agentcity.world.city import City
+
+
+def layout(city: City) -> set[tuple]:
+    return {
+        (
+            building.building_type.name,
+            tuple(building.rect),
+            tuple((obj.name, obj.position) for obj in building.objects),
+        )
+        for building in city.buildings
+    }
+
+
+def test_evicted_chunks_load_again_unchanged():
+    city = City(20000, 20000, seed=2, navigation=True, chunked=True)
+    streamer = city.chunks
+    assert streamer is not None
+    size = streamer.generator.chunk_size
+    home = pygame.Rect(size + 10, size + 10, 10, 10)
+    away = pygame.Rect(8 * size + 10, 8 * size + 10, 10, 10)
+    navigator = city.navigation
+    assert navigator is not None
+
+    streamer.focus = [home]
+    streamer.update(0)
+    loaded = set(streamer.loaded)
+    buildings = list(city.buildings)
+    before = layout(city)
+    blocked = set(navigator.grid.blocked)
+    assert (1, 1) in loaded and before
+
+    streamer.focus = [away]
+    streamer.update(STREAM_INTERVAL)
+    streamer.update(EVICT_AFTER + STREAM_INTERVAL)
+    assert loaded.isdisjoint(streamer.loaded)
+    assert not set(buildings) & set(city.buildings)
+    assert not any(
+        obj in city.capability_index.building_of
+        for building in buildings
+        for obj in building.objects
+    )
+
+    streamer.focus = [home]
+    streamer.update(2 * EVICT_AFTER)
+    assert loaded <= set(streamer.loaded)
+    assert before <= layout(city)
+
+    # Once the chunks around `away` are dropped as well
+    streamer.update(4 * EVICT_AFTER)
+    assert layout(city) == before
+    assert navigator.grid.blocked == blocked
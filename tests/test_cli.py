@@ -0,0 +1,14 @@
+import pytest
+
+from agentcity.main import parse_args
+
+
+def test_headless_options_need_headless(capsys):
+    with pytest.raises(SystemExit):
+        parse_args(["--ticks", "100", "--save", "run.snap"])
+    assert "--ticks, --save can only be used with --headless" in capsys.readouterr().err
+
+
+def test_headless_defaults():
+    args = parse_args(["--headless"])
+    assert (args.ticks, args.shards, args.barrier_ticks) == (24 * 60, 1, 1)
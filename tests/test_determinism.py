@@ -0,0 +1,31 @@
+import pytest
+
+from tests.helpers import MODES, advance, agent_states, make_simulation
+
+
+@pytest.mark.parametrize("options", MODES)
+def test_same_seed_gives_identical_runs(options):
+    first = make_simulation(seed=5, **options)
+    second = make_simulation(seed=5, **options)
+    advance(first, 600)
+    advance(second, 600)
+
+    assert agent_states(first.city) == agent_states(second.city)
+
+
+def test_different_seeds_give_different_runs():
+    first = make_simulation(seed=5)
+    second = make_simulation(seed=6)
+    advance(first, 100)
+    advance(second, 100)
+
+    assert agent_states(first.city) != agent_states(second.city)
+
+
+def test_same_seed_gives_identical_sharded_runs():
+    def run() -> list[tuple]:
+        simulation = make_simulation(seed=5, shards=2, ticks_per_barrier=5)
+        simulation.run(600)
+        return sorted(agent_states(simulation.city))
+
+    assert run() == run()
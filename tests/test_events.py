@@ -0,0 +1,123 @@
+import pytest
+
+from agentcity.engine.events import EventQueue, ScheduledEvent
+from agentcity.engine.time_system import TimeSystem
+
+
+def test_events_fire_in_tick_then_scheduling_order():
+    queue = EventQueue()
+    fired: list[str] = []
+    queue.schedule(2, lambda: fired.append("late"))
+    queue.schedule(1, lambda: fired.append("first"))
+    queue.schedule(1, lambda: fired.append("second"))
+
+    assert queue.run_due(1) == 2
+    assert fired == ["first", "second"]
+    assert queue.run_due(2) == 1
+    assert fired == ["first", "second", "late"]
+
+
+def test_cancelled_event_does_not_fire():
+    queue = EventQueue()
+    fired: list[str] = []
+    event = queue.schedule(5, lambda: fired.append("cancelled"))
+    queue.schedule(5, lambda: fired.append("kept"))
+    event.cancel()
+
+    assert queue.run_due(5) == 1
+    assert fired == ["kept"]
+
+
+def test_next_tick_skips_cancelled_events():
+    queue = EventQueue()
+    early = queue.schedule(3, lambda: None)
+    queue.schedule(7, lambda: None)
+    early.cancel()
+
+    assert queue.next_tick == 7
+
+
+def test_cancelled_recurring_event_stops_repeating():
+    queue = EventQueue()
+    fired: list[str] = []
+    event = queue.schedule(1, lambda: fired.append("fired"), interval=2)
+
+    for tick in range(1, 6):
+        queue.run_due(tick)
+    assert len(fired) == 3  # Ticks 1, 3 and 5
+
+    event.cancel()
+    for tick in range(6, 12):
+        queue.run_due(tick)
+    assert len(fired) == 3
+
+
+def test_event_cancelled_by_an_earlier_callback_does_not_fire():
+    queue = EventQueue()
+    fired: list[str] = []
+    events: list[ScheduledEvent] = []
+    queue.schedule(4, lambda: events[0].cancel())
+    events.append(queue.schedule(4, lambda: fired.append("cancelled")))
+
+    assert queue.run_due(4) == 1
+    assert fired == []
+
+
+def test_recurring_event_can_cancel_itself():
+    queue = EventQueue()
+    fired: list[str] = []
+
+    def callback():
+        fired.append("fired")
+        if len(fired) == 2:
+            event.cancel()
+
+    event = queue.schedule(0, callback, interval=1)
+    for tick in range(5):
+        queue.run_due(tick)
+    assert len(fired) == 2
+    assert queue.next_tick is None
+
+
+def test_non_positive_interval_is_rejected():
+    with pytest.raises(ValueError):
+        EventQueue().schedule(1, lambda: None, interval=0)
+
+
+def run_hours(time_system: TimeSystem, hours: int):
+    for _ in range(hours * time_system.ticks_per_hour):
+        time_system.advance_tick()
+
+
+def test_events_given_an_hour_fire_daily_at_that_hour():
+    time_system = TimeSystem()  # Starts at 6:00
+    fired: list[int] = []
+    event = time_system.schedule_event(
+        ScheduledEvent(hour=7, callback=lambda: fired.append(time_system.time.hour))
+    )
+    assert event.recurring
+
+    run_hours(time_system, 1)
+    assert fired == [7]
+    run_hours(time_system, 24)
+    assert fired == [7, 7]
+
+
+def test_events_given_an_hour_that_has_passed_wait_for_the_next_day():
+    time_system = TimeSystem()
+    fired: list[int] = []
+    time_system.schedule_event(
+        ScheduledEvent(
+            hour=5, callback=lambda: fired.append(time_system.time.day), recurring=False
+        )
+    )
+
+    run_hours(time_system, 48)
+    assert fired == [2]
+
+
+def test_events_given_an_hour_need_a_time_system():
+    with pytest.raises(ValueError):
+        EventQueue().push(ScheduledEvent(hour=7, callback=lambda: None))
+    with pytest.raises(TypeError):
+        ScheduledEvent(1, lambda: None, hour=7)
@@ -0,0 +1,68 @@
+from agentcity.entities.agent import Agent
+from agentcity.entities.building import BUILDING_TYPES, Building
+from agentcity.world.city import City
+from tests.helpers import walk
+
+
+def test_agent_walks_into_a_building_through_its_entrance():
+    city = City(800, 600, seed=1, navigation=True)
+    restaurant = next(
+        building
+        for building in city.buildings
+        if building.building_type is BUILDING_TYPES["restaurant"]
+    )
+    obj = restaurant.objects[0]
+    agent = Agent("A0", (700.0, 550.0))
+    city.add_agent(agent)
+
+    agent.set_destination(restaurant.entrance)
+    walk(agent)
+    assert agent.state.position == restaurant.entrance
+    agent.set_destination(obj.position)
+    walk(agent)
+    assert agent.state.position == obj.position
+
+
+def inside_any(city: City, position: tuple[float, float]) -> bool:
+    return any(building.rect.collidepoint(position) for building in city.buildings)
+
+
+def test_agent_walks_around_buildings():
+    city = City(800, 600, seed=1, navigation=True)
+    # Straight across the restaurants and between the parks
+    agent = Agent("A0", (120.0, 240.0))
+    city.add_agent(agent)
+
+    agent.set_destination((560.0, 250.0))
+    positions = walk(agent)
+    assert agent.state.position == (560.0, 250.0)
+    assert not any(inside_any(city, position) for position in positions)
+
+
+def test_new_buildings_only_replan_routes_near_them():
+    city = City(2000, 2000, seed=1, navigation=True, create_layout=False)
+    near = Agent("A0", (100.0, 300.0))
+    far = Agent("A1", (100.0, 1700.0))
+    for agent in (near, far):
+        city.add_agent(agent)
+    near.set_destination((1900.0, 300.0))
+    far.set_destination((1900.0, 1700.0))
+    for _ in range(5):
+        near.move()
+        far.move()
+    near_route, far_route = near.state.route, far.state.route
+    assert near_route is not None and far_route is not None
+    far_leg = far_route.path
+
+    city.add_building(
+        Building(BUILDING_TYPES["park"], (900, 200), (200, 200), rng=city.layout_rng)
+    )
+    near.move()
+    far.move()
+    assert near.state.route is not near_route
+    assert far.state.route is far_route
+    assert far_route.path is far_leg
+
+    positions = walk(near)
+    assert near.state.position == (1900.0, 300.0)
+    assert not any(inside_any(city, position) for position in positions)
@@ -0,0 +1,62 @@
+import pytest
+
+from agentcity.engine.headless import HeadlessSimulation
+from agentcity.entities.agent import Agent
+from agentcity.world.city import City
+from tests.helpers import MODES, advance, agent_states, make_simulation
+
+
+def record_actions(options: dict, ticks: int) -> list[tuple[str, list[float]]]:
+    """Action and needs of a single hungry agent on every tick"""
+    simulation = HeadlessSimulation(seed=5, **options)
+    agent = Agent("A0", (100.0, 500.0))
+    agent.needs.needs["hunger"].current = 50.0
+    simulation.city.add_agent(agent)
+    history = []
+    for _ in range(ticks):
+        advance(simulation, 1)
+        history.append(
+            (
+                agent.state.current_action,
+                [float(need.current) for need in agent.needs.needs.values()],
+            )
+        )
+    return history
+
+
+@pytest.mark.parametrize("options", MODES)
+def test_parked_agent_is_satisfied_on_the_same_tick(monkeypatch, options):
+    parked = record_actions(options, 400)
+    monkeypatch.setattr(City, "park_agent", lambda self, agent, ticks: None)
+    stepped = record_actions(options, 400)
+
+    assert "using_hunger" in {action for action, _ in stepped}
+    assert [action for action, _ in parked] == [action for action, _ in stepped]
+    for (_, parked_needs), (_, stepped_needs) in zip(parked, stepped):
+        assert parked_needs == pytest.approx(stepped_needs)
+
+
+def behavior_states(city) -> list[tuple]:
+    """Agent states, with needs rounded past closed-form integration's errors"""
+    city.wake_all()  # Credits parked agents with the ticks they skipped
+    return [
+        (
+            *state,
+            type(agent.active_behavior).__name__,
+            agent.behavior_state.ticks_active,
+            agent.state.destination,
+        )
+        for state, agent in zip(agent_states(city, digits=6), city.agents)
+    ]
+
+
+@pytest.mark.parametrize("options", MODES)
+def test_parking_does_not_change_the_run(monkeypatch, options):
+    parked = make_simulation(seed=5, **options)
+    advance(parked, 3000)
+    assert parked.city.parked
+    monkeypatch.setattr(City, "park_agent", lambda self, agent, ticks: None)
+    stepped = make_simulation(seed=5, **options)
+    advance(stepped, 3000)
+
+    assert behavior_states(parked.city) == behavior_states(stepped.city)
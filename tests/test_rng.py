@@ -0,0 +1,47 @@
+import pytest
+
+from agentcity.engine import rng as rng_module
+from agentcity.engine.rng import RandomStream, SimulationRNG
+
+GENERATORS = [
+    pytest.param(
+        True,
+        id="numpy",
+        marks=pytest.mark.skipif(rng_module.np is None, reason="numpy not installed"),
+    ),
+    pytest.param(False, id="random"),
+]
+
+
+@pytest.fixture(params=GENERATORS)
+def generator(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(rng_module, "np", None)
+
+
+def test_streams_are_reproducible(generator):
+    first = SimulationRNG(11).agent_stream("Ada")
+    second = SimulationRNG(11).agent_stream("Ada")
+    other = SimulationRNG(11).agent_stream("Bo")
+
+    values = [first.random() for _ in range(200)]
+    assert values == [second.random() for _ in range(200)]
+    assert values != [other.random() for _ in range(200)]
+    assert all(0.0 <= value < 1.0 for value in values)
+
+
+@pytest.mark.parametrize("position", [0, 1, 63, 64, 65, 300])
+def test_stream_resumes_from_its_position(generator, position):
+    stream = RandomStream(7)
+    values = stream.random_batch(400)
+
+    resumed = RandomStream(7, position=position)
+    assert resumed.position == position
+    assert resumed.random_batch(400 - position) == values[position:]
+
+
+def test_position_counts_draws(generator):
+    stream = RandomStream(7)
+    stream.random_batch(130)
+    stream.random()
+    assert stream.position == 131
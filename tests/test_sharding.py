@@ -0,0 +1,117 @@
+from collections import Counter
+
+from agentcity.engine.headless import HeadlessSimulation
+from agentcity.engine.sharding import export_agent, import_agent
+from agentcity.entities.agent import Agent
+from agentcity.entities.building import BUILDING_TYPES, Building
+from agentcity.world.city import City
+from tests.helpers import walk
+
+
+def one_bed_city() -> tuple[City, Building]:
+    """A city of one house on the border between two shards' regions"""
+    city = City(800, 600, seed=1, create_layout=False)
+    house = Building(BUILDING_TYPES["house"], (370, 260), (60, 80), rng=city.layout_rng)
+    city.add_building(house)
+    return city, house
+
+
+def add_exhausted_agent(city: City, name: str, position: tuple[float, float]):
+    agent = Agent(name, position)
+    agent.needs.needs["energy"].current = 0.0
+    city.add_agent(agent)
+
+
+def test_later_shard_loses_simultaneous_claims():
+    city, house = one_bed_city()
+    bed = next(obj for obj in house.objects if obj.name == "bed")
+    assert bed.capacity["resting_place"] == 1
+    # Both pick the bed on the same tick, each in its own shard
+    add_exhausted_agent(city, "A0", (300.0, 300.0))
+    add_exhausted_agent(city, "B0", (500.0, 300.0))
+
+    HeadlessSimulation(city=city, shards=2).run(2)
+    assert bed.occupants == {"A0": "resting_place"}
+    assert city.agents_by_name["B0"].state.current_action == "idle"
+
+
+def test_held_claims_are_never_evicted():
+    city, house = one_bed_city()
+    bed = next(obj for obj in house.objects if obj.name == "bed")
+    add_exhausted_agent(city, "B0", (500.0, 300.0))
+    simulation = HeadlessSimulation(city=city, shards=2)
+    simulation.run(2)
+    assert bed.occupants == {"B0": "resting_place"}
+
+    # A later claimant in the earlier shard has to wait its turn
+    add_exhausted_agent(city, "A0", (300.0, 300.0))
+    simulation.run(5)
+    assert bed.occupants == {"B0": "resting_place"}
+    assert city.agents_by_name["A0"].state.current_action == "queuing_energy"
+
+
+def test_sharded_run_keeps_objects_within_capacity():
+    city = City(800, 600, seed=2)
+    for i in range(80):
+        city.add_agent(Agent(f"A{i}", city.get_random_position()))
+
+    HeadlessSimulation(city=city, shards=2, ticks_per_barrier=5).run(500)
+
+    assert sorted(agent.name for agent in city.agents) == sorted(
+        f"A{i}" for i in range(80)
+    )
+    for building in city.buildings:
+        for obj in building.objects:
+            in_use = Counter(obj.occupants.values())
+            for capability, capacity in obj.capacity.items():
+                assert in_use[capability] <= capacity
+
+
+def test_stepping_starts_the_shards():
+    city = City(800, 600, seed=2)
+    for i in range(20):
+        city.add_agent(Agent(f"A{i}", city.get_random_position()))
+    simulation = HeadlessSimulation(city=city, shards=2)
+    before = {agent.name: agent.state.position for agent in city.agents}
+
+    for _ in range(50):
+        simulation.step()
+    assert simulation.sharded is not None
+    simulation.sharded.collect_agents()
+    simulation.sharded.close()
+
+    after = {agent.name: agent.state.position for agent in city.agents}
+    assert after.keys() == before.keys()
+    assert after != before
+
+
+def test_handed_off_agents_keep_their_route():
+    source = City(800, 600, seed=1, navigation=True)
+    target = City(800, 600, seed=1, navigation=True)
+    agent = Agent("A0", (120.0, 240.0))
+    source.add_agent(agent)
+    agent.set_destination((560.0, 250.0))
+    walk(agent, 10)
+    route = agent.state.route
+    assert route is not None and route.waypoints is not None
+
+    data = export_agent(agent, {}, {}, source.navigation)
+    moved = import_agent(data, [], target.behaviors, target.navigation)
+    assert moved.state.route is not None
+    assert moved.state.route.waypoints == route.waypoints
+    assert moved.state.route.path == route.path
+
+
+def test_removed_agents_give_up_their_slot():
+    city, house = one_bed_city()
+    bed = next(obj for obj in house.objects if obj.name == "bed")
+    agent = Agent("A0", (300.0, 300.0))
+    city.add_agent(agent)
+    bed.reserve(agent.name, "resting_place")
+    agent.behavior_state.using_object = bed
+    granted = []
+    bed.enqueue("B0", "resting_place", lambda: granted.append("B0"))
+
+    city.remove_agent(agent)
+    assert bed.occupants == {"B0": "resting_place"}
+    assert granted == ["B0"]
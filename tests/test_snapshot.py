@@ -0,0 +1,165 @@
+import pytest
+
+from agentcity.ai.behaviors import Behavior
+from agentcity.ai.needs import LazyNeed
+from agentcity.engine.headless import HeadlessSimulation
+from agentcity.engine.snapshot import SnapshotError, load_snapshot, save_snapshot
+from agentcity.world.agent_store import np
+from tests.helpers import MODES, advance, agent_states, make_simulation
+
+
+def occupancy(city) -> list[dict[str, str]]:
+    """Agent name -> capability in use, for every object in the city"""
+    return [
+        dict(sorted(obj.occupants.items()))
+        for building in city.buildings
+        for obj in building.objects
+    ]
+
+
+def load(path, options) -> HeadlessSimulation:
+    city, time_system = load_snapshot(
+        path,
+        use_agent_store=options.get("use_agent_store", False),
+        lazy_needs=options.get("lazy_needs", False),
+        navigation=options.get("navigation", False),
+    )
+    return HeadlessSimulation(city=city, time_system=time_system)
+
+
+@pytest.mark.parametrize("options", MODES)
+def test_round_trip_restores_state(tmp_path, options):
+    live = make_simulation(**options)
+    advance(live, 700)
+    path = tmp_path / "city.snap"
+    save_snapshot(path, live.city, live.time_system)
+    loaded = load(path, options)
+
+    assert agent_states(loaded.city) == agent_states(live.city)
+    assert occupancy(loaded.city) == occupancy(live.city)
+    assert loaded.city.tick == live.city.tick
+    assert loaded.time_system.time == live.time_system.time
+
+
+@pytest.mark.parametrize("options", MODES)
+def test_resumed_run_matches_uninterrupted_run(tmp_path, options):
+    live = make_simulation(**options)
+    advance(live, 700)
+    path = tmp_path / "city.snap"
+    save_snapshot(path, live.city, live.time_system)
+    resumed = load(path, options)
+
+    advance(live, 700)
+    advance(resumed, 700)
+    assert agent_states(resumed.city) == agent_states(live.city)
+    assert occupancy(resumed.city) == occupancy(live.city)
+
+
+def test_saving_does_not_change_the_run(tmp_path):
+    saved = make_simulation()
+    unsaved = make_simulation()
+    advance(saved, 700)
+    advance(unsaved, 700)
+    save_snapshot(tmp_path / "city.snap", saved.city, saved.time_system)
+
+    advance(saved, 700)
+    advance(unsaved, 700)
+    assert agent_states(saved.city) == agent_states(unsaved.city)
+
+
+STORE = pytest.mark.skipif(np is None, reason="numpy is not installed")
+
+
+@pytest.mark.parametrize(
+    "saved, loaded",
+    [
+        pytest.param({}, {"lazy_needs": True}, id="plain-lazy"),
+        pytest.param({"lazy_needs": True}, {}, id="lazy-plain"),
+        pytest.param({}, {"use_agent_store": True}, id="plain-store", marks=STORE),
+        pytest.param(
+            {"lazy_needs": True},
+            {"use_agent_store": True},
+            id="lazy-store",
+            marks=STORE,
+        ),
+        pytest.param({"use_agent_store": True}, {}, id="store-plain", marks=STORE),
+        pytest.param(
+            {"use_agent_store": True},
+            {"lazy_needs": True},
+            id="store-lazy",
+            marks=STORE,
+        ),
+    ],
+)
+def test_snapshot_loads_into_another_need_representation(tmp_path, saved, loaded):
+    live = make_simulation(**saved)
+    advance(live, 700)
+    assert live.city.dormant
+    path = tmp_path / "city.snap"
+    save_snapshot(path, live.city, live.time_system)
+    resumed = load(path, loaded)
+
+    assert agent_states(resumed.city) == agent_states(live.city)
+    lazy = [
+        isinstance(need, LazyNeed)
+        for agent in resumed.city.agents
+        if agent not in resumed.city.dormant
+        for need in agent.needs.needs.values()
+    ]
+    assert all(lazy) if loaded.get("lazy_needs") else not any(lazy)
+    # Needs go on from their saved values, including those of dormant agents
+    advance(resumed, 200)
+    for agent in resumed.city.agents:
+        for need in agent.needs.needs.values():
+            assert 0.0 <= need.current <= 100.0
+        if resumed.city.agent_store is not None:
+            assert not any(
+                isinstance(need, LazyNeed) for need in agent.needs.needs.values()
+            )
+
+
+@STORE
+@pytest.mark.parametrize(
+    "saved, loaded",
+    [
+        pytest.param({}, {"use_agent_store": True}, id="plain-store"),
+        pytest.param({"use_agent_store": True}, {}, id="store-plain"),
+    ],
+)
+def test_run_resumed_in_another_mode_matches(tmp_path, saved, loaded):
+    live = make_simulation(**saved)
+    advance(live, 700)
+    path = tmp_path / "city.snap"
+    save_snapshot(path, live.city, live.time_system)
+    resumed = load(path, loaded)
+
+    advance(live, 200)
+    advance(resumed, 200)
+    # The store adds up needs in another order, so they drift by rounding errors
+    assert agent_states(resumed.city, digits=6) == agent_states(live.city, digits=6)
+
+
+class Napping(Behavior):
+    """A custom behavior that never activates"""
+
+    def should_activate(self, agent) -> bool:
+        return False
+
+    def update(self, agent) -> None:
+        pass
+
+    def get_priority(self, agent) -> float:
+        return 0.0
+
+
+def test_custom_behaviors_must_be_passed_to_load(tmp_path):
+    live = make_simulation(agents=5)
+    live.city.register_behavior(Napping())
+    advance(live, 10)
+    path = tmp_path / "city.snap"
+    save_snapshot(path, live.city, live.time_system)
+
+    with pytest.raises(SnapshotError):
+        load_snapshot(path)
+    city, _ = load_snapshot(path, custom_behaviors=[Napping()])
+    assert isinstance(city.behaviors[-1], Napping)